@@ -1,3 +1,4 @@
+from typing import Dict
 from pydantic_settings import BaseSettings
 from pydantic import ConfigDict
 
@@ -10,9 +11,27 @@ class Settings(BaseSettings):
     
     # Cache settings
     cache_dir: str = "cache"
+    cache_backend: str = "file"  # "file" (one record file per entry) or "sqlite" (single WAL database)
+    cache_sqlite_file: str = "cache.db"  # Database file inside cache_dir for the sqlite backend
+    cache_compress_min_bytes: int = 16384  # zlib-compress cache records at least this large (0 disables)
+    cache_shared: bool = False  # Other processes write to cache_dir too (several workers): file cache misses check for their entries
     cache_expire_seconds: int = 3600  # 1 hour
+    movie_recommendation_cache_expire_seconds: int = 86400  # 24 hours for single-movie GPT output, reused by later requests
     book_cache_expire_seconds: int = 86400  # 24 hours (books don't change often)
+    book_alias_expire_seconds: int = 2592000  # 30 days for (title, author) spelling -> hardcover_id aliases
+    book_negative_cache_expire_seconds: int = 21600  # 6 hours for titles Hardcover has no match for (0 disables)
+    search_cache_expire_seconds: int = 1800  # 30 minutes for raw Hardcover search results by query (0 disables)
     taste_profile_cache_expire_seconds: int = 7200  # 2 hours (taste profiles are more dynamic)
+    # Stale-while-revalidate: entries past their TTL are served for this long while refreshed in the background (0 disables)
+    recommendation_stale_grace_seconds: int = 21600  # 6 hours
+    book_stale_grace_seconds: int = 259200  # 3 days
+    memory_cache_max_entries: int = 512  # In-process LRU tier in front of the disk cache (0 disables)
+    memory_cache_max_bytes: int = 32 * 1024 * 1024  # 32 MB
+    # Cache types kept in a memory pool of their own with this many entries (0 keeps them out of memory)
+    memory_cache_type_max_entries: Dict[str, int] = {"searches": 64}
+    enable_book_catalog: bool = True  # Local catalog of Hardcover results consulted before the network
+    book_catalog_file: str = "catalog.db"  # SQLite catalog file inside cache_dir
+    fallback_catalog_file: str = ""  # JSON catalog for recommendations without GPT; empty uses the bundled one
     
     # API rate limiting
     max_movies_per_request: int = 5
@@ -29,11 +48,54 @@ class Settings(BaseSettings):
     enable_hardcover_integration: bool = True
     hardcover_timeout_seconds: int = 10
     hardcover_retry_attempts: int = 3
+    hardcover_rate_limit_per_minute: int = 55  # Shared budget for all Hardcover calls (quota is 60/min)
+    hardcover_rate_limit_burst: int = 5  # Calls allowed back to back before pacing kicks in
+    hardcover_search_mode: str = "hedged"  # "sequential", "hedged" or "parallel" search strategies
+    hardcover_hedge_delay_ms: int = 300  # Start the next strategy if earlier ones haven't answered by then
+    hardcover_hedge_max_in_flight: int = 2  # Concurrent searches per book in hedged mode
+    hardcover_batch_size: int = 10  # Books looked up per batched GraphQL request (0 disables batching)
+    overlap_book_enrichment: bool = True  # Look unified books up as GPT streams each one, instead of batching afterwards
     
     # Performance settings
     enable_concurrent_processing: bool = True
     max_concurrent_book_requests: int = 10
-    request_timeout_seconds: int = 30
+    max_concurrent_movie_requests: int = 3  # Concurrent per-movie GPT calls in individual mode
+    
+    # Rank fusion: answer multi-movie unified requests from per-movie book lists without GPT
+    enable_rank_fusion: bool = True
+    rank_fusion_min_confidence: float = 0.5  # Serve the fused answer only at or above this agreement score
+    rank_fusion_list_size: int = 10  # Ranked books kept per movie
+    
+    # Semantic cache: serve a cached unified recommendation for a similar enough set of movies
+    enable_semantic_cache: bool = True
+    semantic_cache_min_similarity: float = 0.85  # Cosine similarity radius for an approximate hit
+    semantic_cache_max_entries: int = 5000  # Request vectors kept in memory, oldest evicted first
+    semantic_cache_search_mode: str = "vectorized"  # "vectorized" (one matrix product) or "brute_force"
+    semantic_cache_index_file: str = "semantic_index.npz"  # Request vectors saved inside cache_dir at shutdown and loaded at startup
+    
+    # Content-based recommendations from the local book catalog (recommendation_type=content)
+    enable_content_recommender: bool = True
+    content_index_dir: str = "content_index"  # Index directory inside cache_dir, built by `python -m app.services.content_recommender build`
+    content_min_score: float = 0.05  # Cosine similarity a book needs to be recommended
+    content_fallback: bool = True  # Serve content recommendations instead of the canned list when GPT is unavailable
+    content_overview_timeout_seconds: float = 2.0  # How long to wait for a movie's TMDB overview before using its title alone
+    request_timeout_seconds: int = 30  # /recommend deadline; later enrichment finishes in the background (0 disables)
+    
+    # Per-upstream circuit breakers (openai, hardcover, tmdb)
+    circuit_breaker_failure_rate: float = 0.5  # Open once this share of recent calls failed or were slow
+    circuit_breaker_window: int = 20  # Recent calls the failure rate is measured over
+    circuit_breaker_min_calls: int = 5  # Calls needed in the window before a breaker can open
+    circuit_breaker_open_seconds: float = 30.0  # Fail fast this long before letting a probe call through
+    openai_slow_call_seconds: float = 30.0  # Calls slower than these count as failures
+    hardcover_slow_call_seconds: float = 5.0
+    tmdb_slow_call_seconds: float = 5.0
+    
+    # Shared HTTP client pools (one per upstream)
+    http_max_connections: int = 20
+    http_max_keepalive_connections: int = 10
+    http_keepalive_expiry_seconds: float = 60.0
+    http2_enabled: bool = False  # Requires the h2 package (pip install httpx[http2])
+    http_prewarm_connections: bool = True
     
     # Development settings
     debug: bool = False
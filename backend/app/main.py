@@ -4,11 +4,13 @@ from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
 import os
 import asyncio
-import httpx
 from pathlib import Path
 
 from app.routers import recommendations
 from app.config import settings
+from app.services import http_clients
+from app.services.circuit_breaker import breaker_states, OPEN
+from app.utils.helpers import spawn_background
 
 async def keep_alive_task():
     """
@@ -24,12 +26,11 @@ async def keep_alive_task():
             base_url = os.getenv("RENDER_EXTERNAL_URL", "http://localhost:8000")
             health_url = f"{base_url}/health"
             
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(health_url)
-                if response.status_code == 200:
-                    print(f"🔄 Keep-alive ping successful: {response.status_code}")
-                else:
-                    print(f"⚠️ Keep-alive ping returned: {response.status_code}")
+            response = await http_clients.get_client("keep_alive").get(health_url)
+            if response.status_code == 200:
+                print(f"🔄 Keep-alive ping successful: {response.status_code}")
+            else:
+                print(f"⚠️ Keep-alive ping returned: {response.status_code}")
         
         except Exception as e:
             print(f"❌ Keep-alive ping failed: {e}")
@@ -50,9 +51,16 @@ async def lifespan(app: FastAPI):
     (cache_dir / "recommendations").mkdir(exist_ok=True)
     (cache_dir / "books").mkdir(exist_ok=True)
     
-    print(f"📁 Cache directory: {cache_dir.absolute()}")
+    print(f"📁 Cache directory: {cache_dir.absolute()} (backend: {settings.cache_backend})")
     print(f"🔑 OpenAI API key: {'✅ Set' if settings.openai_api_key else '❌ Missing'}")
     print(f"🔑 Hardcover API key: {'✅ Set' if settings.hardcover_api_key else '❌ Missing'}")
+    if recommendations.semantic_index is not None:
+        print(f"🧭 Semantic cache: {len(recommendations.semantic_index)} requests loaded")
+    
+    # Shared HTTP clients, warmed in the background so startup isn't blocked
+    await http_clients.start_clients()
+    if settings.http_prewarm_connections:
+        spawn_background(http_clients.prewarm_clients())
     
     # Start the keep-alive task only in production (when RENDER_EXTERNAL_URL is set)
     keep_alive_enabled = os.getenv("RENDER_EXTERNAL_URL") is not None
@@ -74,6 +82,18 @@ async def lifespan(app: FastAPI):
             await keep_alive_task_instance
         except asyncio.CancelledError:
             print("✅ Keep-alive task stopped")
+    
+    if recommendations.semantic_index is not None:
+        # Cached responses outlive the process, so keep the vectors that find them
+        try:
+            recommendations.semantic_index.save(Path(settings.cache_dir) / settings.semantic_cache_index_file)
+        except OSError as e:
+            print(f"⚠️ Semantic index not saved: {e}")
+    
+    await recommendations.cache_service.close()
+    if recommendations.book_catalog:
+        recommendations.book_catalog.close()
+    await http_clients.close_clients()
 
 app = FastAPI(
     title="CineReads API", 
@@ -131,9 +151,11 @@ async def health_check():
     from datetime import datetime
     
     cache_dir = Path(settings.cache_dir)
+    circuit_breakers = breaker_states()
+    degraded = any(state["state"] == OPEN for state in circuit_breakers.values())
     
     return {
-        "status": "healthy",
+        "status": "degraded" if degraded else "healthy",
         "timestamp": datetime.utcnow().isoformat(),
         "uptime_seconds": int(time.time()),
         "cache_dir_exists": cache_dir.exists(),
@@ -141,5 +163,6 @@ async def health_check():
         "hardcover_configured": bool(settings.hardcover_api_key),
         "debug_mode": settings.debug,
         "render_deployment": bool(os.getenv("RENDER_EXTERNAL_URL")),
+        "circuit_breakers": circuit_breakers,
         "message": "CineReads API is running and healthy! 🚀"
     }
\ No newline at end of file
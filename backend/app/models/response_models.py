@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr
 from typing import List, Optional, Dict, Any
 
 class BookRecommendation(BaseModel):
@@ -21,6 +21,8 @@ class BookRecommendation(BaseModel):
     hardcover_id: Optional[int] = None
     users_count: Optional[int] = None
     description: Optional[str] = None
+    # Metadata fields still being fetched when a partial response was returned
+    missing_fields: Optional[List[str]] = None
 
 class TasteProfile(BaseModel):
     """User's analyzed taste profile based on movie preferences"""
@@ -36,7 +38,10 @@ class RecommendationResponse(BaseModel):
     movie: str  # Now represents the unified taste summary
     books: List[BookRecommendation]
     taste_profile: Optional[TasteProfile] = None
-    recommendation_type: str = "unified"  # "unified" or "individual"
+    recommendation_type: str = "unified"  # "unified", "individual" or "content"
+    # Canned recommendations served when GPT is unavailable, or a completion cut off
+    # mid-stream; never cached
+    _fallback: bool = PrivateAttr(default=False)
     
 class RecommendationInsights(BaseModel):
     """Additional insights about the recommendations"""
@@ -51,4 +56,9 @@ class EnhancedRecommendationResponse(BaseModel):
     recommendations: List[RecommendationResponse]
     insights: RecommendationInsights
     processing_time: Optional[float] = None
-    cache_hit: bool = False
\ No newline at end of file
+    cache_hit: bool = False
+    # True when the request deadline hit before enrichment finished; the complete
+    # response is cached once the remaining lookups are done
+    partial: bool = False
+    # True when served from the cached response to a similar but not identical request
+    approximate: bool = False
\ No newline at end of file
@@ -1,20 +1,52 @@
 from fastapi import APIRouter, HTTPException, BackgroundTasks, Query
-from typing import List, Optional
-from app.models.request_models import RecommendationRequest
+from fastapi.responses import StreamingResponse
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+from app.models.request_models import RecommendationRequest, UserPreferences
 from app.models.response_models import (
+    BookRecommendation,
     RecommendationResponse, 
     EnhancedRecommendationResponse,
     RecommendationInsights,
     TasteProfile
 )
-from app.services.gpt_service import GPTService
-from app.services.hardcover_service import HardcoverService
+from app.services.gpt_service import FALLBACK_TASTE_PROFILE, GPTService
+from app.services.hardcover_service import (
+    HardcoverService,
+    LOOKUP_FOUND,
+    LOOKUP_INCONCLUSIVE,
+    LOOKUP_NOT_FOUND,
+    hardcover_rate_limiter
+)
 from app.services.tmdb_service import TMDBService
-from app.services.cache_service import CacheService, create_recommendation_cache_key, create_book_cache_key
+from app.services.cache_service import (
+    CacheService,
+    create_recommendation_cache_key,
+    create_movie_recommendation_cache_key,
+    create_movie_books_cache_key,
+    create_movie_overview_cache_key,
+    create_taste_profile_cache_key,
+    create_book_cache_key,
+    create_book_id_cache_key,
+    create_book_alias_key
+)
+from app.services.book_catalog import BookCatalog
+from app.services.rank_fusion import (
+    DEFAULT_MATCH_SCORE,
+    book_key,
+    fuse_ranked_lists,
+    fusion_confidence,
+    merge_taste_profiles
+)
+from app.services.semantic_cache import SemanticIndex, featurize, partition_key
+from app.services.content_recommender import ContentIndex, ContentMatch
 from app.config import settings
+from app.utils.helpers import Deadline, KeyedLock, SingleFlight, spawn_background
 import asyncio
+import json
 import time
 import logging
+from collections import Counter
+from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
@@ -22,9 +54,81 @@ router = APIRouter()
 
 # Initialize services
 gpt_service = GPTService()
-hardcover_service = HardcoverService()
 tmdb_service = TMDBService()
-cache_service = CacheService(cache_dir=settings.cache_dir)
+cache_service = CacheService(
+    cache_dir=settings.cache_dir,
+    memory_max_entries=settings.memory_cache_max_entries,
+    memory_max_bytes=settings.memory_cache_max_bytes,
+    backend=settings.cache_backend,
+    sqlite_file=settings.cache_sqlite_file,
+    compress_min_bytes=settings.cache_compress_min_bytes,
+    memory_type_max_entries=settings.memory_cache_type_max_entries,
+    shared=settings.cache_shared
+)
+hardcover_service = HardcoverService(search_cache=cache_service)
+book_catalog = (
+    BookCatalog(Path(settings.cache_dir) / settings.book_catalog_file)
+    if settings.enable_book_catalog else None
+)
+semantic_index = (
+    SemanticIndex.load(
+        Path(settings.cache_dir) / settings.semantic_cache_index_file,
+        settings.semantic_cache_max_entries,
+        settings.semantic_cache_search_mode
+    )
+    if settings.enable_semantic_cache else None
+)
+content_index = (
+    ContentIndex.load(Path(settings.cache_dir) / settings.content_index_dir)
+    if settings.enable_content_recommender else None
+)
+
+# In-flight registries for /recommend cache misses and background refreshes, plus request counters
+recommendation_flights = SingleFlight()
+book_refresh_flights = SingleFlight()
+movie_book_locks = KeyedLock()
+recommend_stats = {'cache_hits': 0, 'stale_hits': 0, 'partial': 0}
+movie_stats = {'cache_hits': 0, 'cache_misses': 0}
+fusion_stats = {'served': 0, 'low_confidence': 0, 'not_covered': 0}
+semantic_stats = {'hits': 0, 'misses': 0, 'expired': 0}
+content_stats = {'served': 0, 'gpt_fallbacks': 0, 'no_match': 0}
+taste_profile_stats = {'cache_hits': 0, 'cache_misses': 0, 'stored_from_recommend': 0}
+book_stats = {
+    'negative_hits': 0,
+    'negative_stored': 0,
+    'batch_requests': 0,
+    'batch_found': 0,
+    'batch_fallbacks': 0,
+    'alias_hits': 0,
+    'hydrated': 0
+}
+
+# Cached in place of metadata for books Hardcover definitively doesn't have
+NEGATIVE_BOOK_ENTRY = {'not_found': True}
+
+# BookRecommendation fields GPT writes, kept in each movie's ranked list for rank fusion
+RANKED_BOOK_FIELDS = {'title', 'author', 'reason', 'taste_match_score', 'primary_appeal'}
+
+# BookRecommendation fields filled from Hardcover metadata, and the metadata key for each
+BOOK_METADATA_FIELDS = {
+    'cover_url': 'cover_url',
+    'rating': 'rating',
+    'hardcover_url': 'url',
+    'genre_tags': 'genres',
+    'isbn': 'isbn',
+    'publication_year': 'publication_year',
+    'page_count': 'page_count',
+    'publisher': 'publisher',
+    'hardcover_id': 'hardcover_id',
+    'users_count': 'users_count',
+    'description': 'description'
+}
+
+# Metadata fields no Hardcover lookup fills in (isbn, publisher), so never reported missing
+EXPECTED_BOOK_FIELDS = [
+    field for field, metadata_field in BOOK_METADATA_FIELDS.items()
+    if metadata_field not in {'isbn', 'publisher'}
+]
 
 @router.get("/search-movies")
 async def search_movies(query: str = Query(..., description="Movie search query")):
@@ -40,31 +144,44 @@ async def search_movies(query: str = Query(..., description="Movie search query"
         movies = tmdb_service._get_fallback_movies()
         return {"results": movies}
 
+def _validate_recommendation_request(request: RecommendationRequest):
+    if not request.movies:
+        raise HTTPException(status_code=400, detail="At least one movie is required")
+    
+    if len(request.movies) > settings.max_movies_per_request:
+        raise HTTPException(
+            status_code=400, 
+            detail=f"Maximum {settings.max_movies_per_request} movies allowed per request"
+        )
+
+def _validate_recommendation_type(recommendation_type: str):
+    if recommendation_type == "content" and content_index is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Content recommendations need an index: python -m app.services.content_recommender build"
+        )
+
 @router.post("/recommend", response_model=EnhancedRecommendationResponse)
 async def get_recommendations(
     request: RecommendationRequest, 
     background_tasks: BackgroundTasks,
     include_insights: bool = Query(True, description="Include recommendation insights"),
-    recommendation_type: str = Query("unified", description="Type of recommendation: 'unified' or 'individual'")
+    recommendation_type: str = Query("unified", description="Type of recommendation: 'unified', 'individual' or 'content'")
 ):
     """
     Get book recommendations based on movie preferences.
     
     - **unified**: Analyze overall taste profile and provide unified recommendations (default)
     - **individual**: Provide separate recommendations for each movie (legacy behavior)
+    - **content**: Rank the local book catalog against the movies' plot overviews, without GPT
     """
     start_time = time.time()
+    deadline = Deadline(settings.request_timeout_seconds) if settings.request_timeout_seconds > 0 else None
     
     try:
         # Validate input
-        if not request.movies:
-            raise HTTPException(status_code=400, detail="At least one movie is required")
-        
-        if len(request.movies) > settings.max_movies_per_request:
-            raise HTTPException(
-                status_code=400, 
-                detail=f"Maximum {settings.max_movies_per_request} movies allowed per request"
-            )
+        _validate_recommendation_request(request)
+        _validate_recommendation_type(recommendation_type)
         
         # Create cache key (includes recommendation type)
         cache_key = create_recommendation_cache_key(
@@ -73,9 +190,13 @@ async def get_recommendations(
             recommendation_type
         )
         
-        # Check cache first
-        cached_result = await cache_service.get(cache_key, "recommendations")
+        # Check cache first; stale entries are served while refreshed in the background
+        cached_result, is_stale = await cache_service.get_with_staleness(cache_key, "recommendations")
         if cached_result:
+            recommend_stats['cache_hits'] += 1
+            if is_stale:
+                recommend_stats['stale_hits'] += 1
+                _schedule_recommendation_refresh(request, cache_key, recommendation_type, include_insights)
             processing_time = time.time() - start_time
             if isinstance(cached_result, list):
                 # Legacy format - wrap in new format
@@ -87,36 +208,23 @@ async def get_recommendations(
                 )
             return cached_result
         
-        # Generate recommendations based on type
+        # A cached unified request close enough to this one is served as an approximate answer
         if recommendation_type == "unified":
-            recommendations = await _generate_unified_recommendations(request)
-        else:
-            recommendations = await _generate_individual_recommendations(request)
-        
-        # Enhance with book metadata from Hardcover
-        enhanced_recommendations = await _enhance_with_metadata(recommendations)
-        
-        # Generate insights
-        insights = await _generate_insights(request.movies, enhanced_recommendations) if include_insights else None
+            approximate_result = await _approximate_cached_response(request, start_time)
+            if approximate_result:
+                return approximate_result
         
-        # Create response
-        response = EnhancedRecommendationResponse(
-            recommendations=enhanced_recommendations,
-            insights=insights,
-            processing_time=time.time() - start_time,
-            cache_hit=False
-        )
-        
-        # Cache the result
-        await cache_service.set(
-            cache_key, 
-            response, 
-            expire=settings.cache_expire_seconds, 
-            cache_type="recommendations"
+        # Identical concurrent requests share one GPT call and one enrichment pass
+        response, coalesced = await recommendation_flights.do(
+            f"{cache_key}:{include_insights}",
+            lambda: _build_recommendation_response(
+                request, cache_key, recommendation_type, include_insights, start_time, deadline
+            )
         )
         
-        # Schedule cache cleanup in background
-        background_tasks.add_task(cleanup_old_cache)
+        if not coalesced:
+            # Schedule cache cleanup in background
+            background_tasks.add_task(cleanup_old_cache)
         
         return response
         
@@ -128,106 +236,876 @@ async def get_recommendations(
         else:
             raise HTTPException(status_code=500, detail="An error occurred while generating recommendations")
 
-async def _generate_unified_recommendations(request: RecommendationRequest) -> List[RecommendationResponse]:
-    """Generate unified recommendations based on overall taste profile"""
-    return await gpt_service.generate_recommendations(
-        movies=request.movies,
-        preferences=request.preferences
+@router.post("/recommend/stream")
+async def stream_recommendations(
+    request: RecommendationRequest,
+    include_insights: bool = Query(True, description="Include recommendation insights")
+):
+    """
+    Unified recommendations as Server-Sent Events, so the client can render
+    while the pipeline runs. Events, in order:
+    
+    - **taste_profile**: the analyzed taste profile
+    - **book**: one per recommended book (`index`, `book`) as soon as GPT has written it
+    - **metadata**: Hardcover fields for a book (`index`, `fields`) as each lookup finishes
+    - **insights**: recommendation insights, if requested
+    - **done**: the taste summary, processing time and whether it was a cache hit
+    - **error**: sent instead of the remaining events if the pipeline fails (`detail`)
+    
+    Cache hits replay the same events from the cached response.
+    """
+    _validate_recommendation_request(request)
+    
+    cache_key = create_recommendation_cache_key(
+        request.movies, 
+        request.preferences.model_dump() if request.preferences else None,
+        "unified"
+    )
+    
+    return StreamingResponse(
+        _recommendation_events(request, cache_key, include_insights, time.time()),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
 
-async def _generate_individual_recommendations(request: RecommendationRequest) -> List[RecommendationResponse]:
-    """Generate individual recommendations for each movie (legacy behavior)"""
-    # This would use the old logic - generate recommendations for each movie separately
-    # For now, we'll use the unified approach but split by movie
-    all_recommendations = []
+def _sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def _book_metadata_fields(book: BookRecommendation) -> dict:
+    return {field: getattr(book, field) for field in BOOK_METADATA_FIELDS if getattr(book, field) is not None}
+
+async def _recommendation_events(
+    request: RecommendationRequest,
+    cache_key: str,
+    include_insights: bool,
+    start_time: float
+) -> AsyncIterator[str]:
+    """Server-Sent Events for /recommend/stream"""
+    cached_result = await cache_service.get(cache_key, "recommendations")
+    if isinstance(cached_result, dict):
+        recommend_stats['cache_hits'] += 1
+        cached_response = EnhancedRecommendationResponse.model_validate(cached_result)
+        for rec in cached_response.recommendations:
+            yield _sse_event("taste_profile", {"taste_profile": rec.taste_profile.model_dump() if rec.taste_profile else None})
+            for index, book in enumerate(rec.books):
+                yield _sse_event("book", {"index": index, "book": book.model_dump(exclude_none=True)})
+        if include_insights and cached_response.insights:
+            yield _sse_event("insights", cached_response.insights.model_dump())
+        yield _sse_event("done", {
+            "movie": cached_response.recommendations[0].movie if cached_response.recommendations else None,
+            "processing_time": time.time() - start_time,
+            "cache_hit": True
+        })
+        return
     
-    for movie in request.movies:
-        movie_recommendations = await gpt_service.generate_recommendations(
-            movies=[movie],
-            preferences=request.preferences
-        )
-        all_recommendations.extend(movie_recommendations)
+    events, pipeline = _start_recommendation_pipeline(request)
+    book_index: Dict[int, int] = {}
+    try:
+        while (event := await events.get()) is not None:
+            kind, item = event
+            if kind == "taste_profile":
+                yield _sse_event("taste_profile", {"taste_profile": item.model_dump()})
+            elif kind == "book":
+                book_index[id(item)] = len(book_index)
+                yield _sse_event("book", {"index": book_index[id(item)], "book": item.model_dump(exclude_none=True)})
+            elif kind == "metadata":
+                yield _sse_event("metadata", {"index": book_index[id(item)], "fields": _book_metadata_fields(item)})
+        recommendations = await pipeline
+        response = await _complete_response(request, recommendations, include_insights, start_time)
+        await _cache_recommendation_response(cache_key, response, request, "unified")
+    except Exception as e:
+        logger.error(f"Error streaming recommendations: {e}")
+        yield _sse_event("error", {"detail": "An error occurred while generating recommendations"})
+        return
+    finally:
+        if not pipeline.done():
+            # Client went away mid-stream: finish the lookups and cache the result anyway
+            spawn_background(_cache_completed_response(
+                pipeline, request, cache_key, "unified", include_insights, start_time
+            ))
     
-    return all_recommendations
+    if response.insights:
+        yield _sse_event("insights", response.insights.model_dump())
+    yield _sse_event("done", {
+        "movie": recommendations[0].movie if recommendations else None,
+        "processing_time": time.time() - start_time,
+        "cache_hit": False
+    })
 
-async def _enhance_with_metadata(recommendations: List[RecommendationResponse]) -> List[RecommendationResponse]:
-    """Enhance recommendations with metadata from Hardcover"""
-    enhanced_recommendations = []
+def _start_recommendation_pipeline(
+    request: RecommendationRequest,
+    use_cache: bool = True
+) -> Tuple[asyncio.Queue, asyncio.Task]:
+    """
+    Generate unified recommendations from a streamed GPT completion and enrich
+    them with Hardcover metadata, in a task of its own.
     
+    Progress is queued as it happens: ("taste_profile", profile), ("book", book)
+    as GPT writes each one, ("generated", recommendations) once GPT is done and
+    ("metadata", book) as each lookup finishes, then None. The task returns the
+    enriched recommendations. With OVERLAP_BOOK_ENRICHMENT each book's lookup
+    starts as soon as its title and author are decoded, while GPT is still
+    writing its reason; otherwise books are batched after generation.
+    use_cache=False always streams from GPT, skipping the per-movie cache and
+    rank fusion.
+    """
+    events: asyncio.Queue = asyncio.Queue()
+    # Lookups started from a book's heading, before the book itself is complete
+    early_lookups: Dict[Tuple[str, str], asyncio.Task] = {}
+    # Each book as GPT wrote it, copied before its lookup can fill in metadata
+    generated_books: Dict[int, BookRecommendation] = {}
+    
+    def _book_done(book: BookRecommendation):
+        events.put_nowait(("metadata", book))
+    
+    async def _lookup_heading(title: str, author: str) -> BookRecommendation:
+        placeholder = BookRecommendation(title=title, author=author, reason="")
+        return await enhance_book_with_metadata(placeholder)
+    
+    async def _enhance(book: BookRecommendation):
+        try:
+            early_lookup = early_lookups.pop((book.title, book.author), None)
+            if early_lookup:
+                placeholder = await early_lookup
+                for field in BOOK_METADATA_FIELDS:
+                    if getattr(placeholder, field) is not None:
+                        setattr(book, field, getattr(placeholder, field))
+            else:
+                await enhance_book_with_metadata(book)
+        finally:
+            _book_done(book)
+    
+    async def _run() -> List[RecommendationResponse]:
+        try:
+            recommendations: List[RecommendationResponse] = []
+            lookups = []
+            single_movie = request.movies[0] if len(request.movies) == 1 else None
+            if not use_cache:
+                replay = None
+            elif single_movie:
+                replay = await _cached_movie_recommendations(single_movie, request.preferences)
+            else:
+                replay = await _fused_recommendations(request)
+            if replay is not None:
+                generation = _replay_recommendations(replay)
+            else:
+                generation = gpt_service.stream_recommendations(request.movies, request.preferences)
+            
+            async for kind, item in generation:
+                if kind == "book_heading":
+                    if settings.overlap_book_enrichment and item not in early_lookups:
+                        early_lookups[item] = asyncio.ensure_future(_lookup_heading(*item))
+                    continue
+                if kind == "complete":
+                    recommendations = item
+                    events.put_nowait(("generated", item))
+                    if any(rec._fallback for rec in item):
+                        # Canned, or GPT broke off mid-stream: served, never cached
+                        continue
+                    # Lookups may already have filled in some books, so the per-movie
+                    # caches get the copies taken as each book arrived; fused answers
+                    # aren't GPT output
+                    generated = [
+                        rec.model_copy(update={'books': [generated_books.get(id(book), book) for book in rec.books]})
+                        for rec in item
+                    ]
+                    if single_movie or replay is None:
+                        await _store_recommendation_taste_profile(request, generated)
+                    if replay is None and single_movie:
+                        await _store_movie_recommendations(single_movie, request.preferences, generated)
+                    elif replay is None:
+                        await _record_movie_books(request.movies, request.preferences, generated)
+                    continue
+                events.put_nowait((kind, item))
+                if kind == "book":
+                    generated_books[id(item)] = item.model_copy()
+                    if settings.overlap_book_enrichment:
+                        lookups.append(asyncio.ensure_future(_enhance(item)))
+            
+            if settings.overlap_book_enrichment:
+                await asyncio.gather(*lookups)
+            else:
+                await _enhance_with_metadata(recommendations, on_book_done=_book_done)
+            return recommendations
+        finally:
+            events.put_nowait(None)
+    
+    return events, asyncio.ensure_future(_run())
+
+async def _store_taste_profile(cache_key: str, taste_profile: dict):
+    await cache_service.set(
+        cache_key,
+        taste_profile,
+        expire=settings.taste_profile_cache_expire_seconds,
+        cache_type="taste_profiles"
+    )
+
+async def _store_recommendation_taste_profile(
+    request: RecommendationRequest,
+    recommendations: List[RecommendationResponse]
+):
+    """Keep the taste profile from a unified GPT run so /taste-profile can serve it without a call"""
+    if len(recommendations) != 1 or recommendations[0]._fallback or not recommendations[0].taste_profile:
+        return
+    cache_key = create_taste_profile_cache_key(
+        request.movies, request.preferences.model_dump() if request.preferences else None
+    )
+    await _store_taste_profile(cache_key, recommendations[0].taste_profile.model_dump())
+    taste_profile_stats['stored_from_recommend'] += 1
+
+async def _replay_recommendations(recommendations: List[RecommendationResponse]) -> AsyncIterator[Tuple[str, Any]]:
+    """Cached recommendations as the events GPTService.stream_recommendations would yield"""
     for rec in recommendations:
-        enhanced_books = []
-        
-        # Process books concurrently for better performance
-        book_tasks = []
+        if rec.taste_profile:
+            yield "taste_profile", rec.taste_profile
         for book in rec.books:
-            book_tasks.append(enhance_book_with_metadata(book))
+            yield "book", book
+    yield "complete", recommendations
+
+async def _build_recommendation_response(
+    request: RecommendationRequest,
+    cache_key: str,
+    recommendation_type: str,
+    include_insights: bool,
+    start_time: float,
+    deadline: Optional[Deadline] = None,
+    use_cache: bool = True
+) -> EnhancedRecommendationResponse:
+    """
+    Generate, enrich and cache a recommendation response for a cache miss.
+    
+    If the deadline runs out first, returns a partial response with whatever
+    metadata has resolved so far; generation and enrichment carry on in the
+    background and cache the complete response. use_cache=False skips the
+    per-movie recommendations and rank fusion and always asks GPT.
+    """
+    generated: List[List[RecommendationResponse]] = []
+    
+    async def _generate_and_enhance() -> List[RecommendationResponse]:
+        if recommendation_type == "content":
+            # Ranked from catalog metadata, so there is nothing left to enrich
+            recommendations = await _generate_content_recommendations(request)
+            generated.append(recommendations)
+            return recommendations
+        
+        if recommendation_type == "unified" and settings.overlap_book_enrichment:
+            # Books are looked up while GPT is still writing the rest
+            events, pipeline = _start_recommendation_pipeline(request, use_cache)
+            while (event := await events.get()) is not None:
+                if event[0] == "generated":
+                    generated.append(event[1])
+            recommendations = await pipeline
+            return await _content_fallback(request, recommendations) or recommendations
+        
+        # Generate recommendations based on type
+        if recommendation_type == "unified":
+            recommendations = await _generate_unified_recommendations(request, use_cache)
+            content = await _content_fallback(request, recommendations)
+            if content:
+                generated.append(content)
+                return content
+        else:
+            recommendations = await _generate_individual_recommendations(request, use_cache)
+        generated.append(recommendations)
         
-        enhanced_books = await asyncio.gather(*book_tasks)
-        rec.books = enhanced_books
-        enhanced_recommendations.append(rec)
+        # Enhance with book metadata from Hardcover
+        return await _enhance_with_metadata(recommendations)
+    
+    work = asyncio.ensure_future(_generate_and_enhance())
+    if deadline and not await deadline.wait(work):
+        recommend_stats['partial'] += 1
+        spawn_background(_cache_completed_response(
+            work, request, cache_key, recommendation_type, include_insights, start_time
+        ))
+        if generated:
+            # Snapshot now; the originals keep filling in as lookups finish
+            recommendations = [rec.model_copy(deep=True) for rec in generated[0]]
+        else:
+            logger.warning("Request deadline hit before GPT answered; serving fallback recommendations")
+            recommendations = gpt_service._create_fallback_response(request.movies)
+        return await _partial_response(request, recommendations, include_insights, start_time)
+    
+    response = await _complete_response(request, await work, include_insights, start_time)
     
-    return enhanced_recommendations
+    # Cache the result, finishing the write in the background if we're out of time
+    write = asyncio.ensure_future(_cache_recommendation_response(cache_key, response, request, recommendation_type))
+    if deadline:
+        await deadline.wait(write)
+    else:
+        await write
+    
+    return response
 
-async def enhance_book_with_metadata(book):
-    """Enhance a book recommendation with metadata from Hardcover"""
+async def _complete_response(
+    request: RecommendationRequest,
+    recommendations: List[RecommendationResponse],
+    include_insights: bool,
+    start_time: float
+) -> EnhancedRecommendationResponse:
+    # Generate insights
+    insights = await _generate_insights(request.movies, recommendations) if include_insights else None
+    
+    # Create response
+    return EnhancedRecommendationResponse(
+        recommendations=recommendations,
+        insights=insights,
+        processing_time=time.time() - start_time,
+        cache_hit=False
+    )
+
+async def _partial_response(
+    request: RecommendationRequest,
+    recommendations: List[RecommendationResponse],
+    include_insights: bool,
+    start_time: float
+) -> EnhancedRecommendationResponse:
+    """A response for books whose enrichment hasn't finished, marking the fields still missing"""
+    for rec in recommendations:
+        for book in rec.books:
+            if book.hardcover_id is None:
+                book.missing_fields = [
+                    field for field in EXPECTED_BOOK_FIELDS if getattr(book, field) is None
+                ] or None
+    
+    response = await _complete_response(request, recommendations, include_insights, start_time)
+    response.partial = True
+    return response
+
+async def _cache_completed_response(
+    work: asyncio.Future,
+    request: RecommendationRequest,
+    cache_key: str,
+    recommendation_type: str,
+    include_insights: bool,
+    start_time: float
+):
+    """Wait out enrichment that overran the request deadline, then cache the complete response"""
+    recommendations = await work
+    response = await _complete_response(request, recommendations, include_insights, start_time)
+    await _cache_recommendation_response(cache_key, response, request, recommendation_type)
+
+async def _cache_recommendation_response(
+    cache_key: str,
+    response: EnhancedRecommendationResponse,
+    request: RecommendationRequest,
+    recommendation_type: str
+):
+    if any(rec._fallback for rec in response.recommendations):
+        # Stand-ins for GPT, canned or content-based: stored, they would replace a
+        # stale real answer and keep the next requests from trying GPT again
+        return
+    
+    await cache_service.set(
+        cache_key, 
+        response, 
+        expire=settings.cache_expire_seconds, 
+        cache_type="recommendations",
+        stale_grace=settings.recommendation_stale_grace_seconds
+    )
+    
+    # Only unified answers stand in for other requests; individual ones are per movie
+    if semantic_index is not None and recommendation_type == "unified":
+        vector, partition = await _request_vector(request)
+        semantic_index.add(cache_key, vector, partition)
+
+async def _request_vector(request: RecommendationRequest):
+    """Semantic cache vector and partition for a request, with themes from each movie's stored taste profile"""
+    preferences = request.preferences.model_dump() if request.preferences else None
+    entries = await asyncio.gather(*[
+        cache_service.get(create_movie_books_cache_key(movie, preferences), "recommendations")
+        for movie in request.movies
+    ])
+    themes = [
+        theme
+        for entry in entries if entry and entry['taste_profile']
+        for theme in entry['taste_profile'].get('themes') or []
+    ]
+    return featurize(request.movies, preferences, themes), partition_key(preferences)
+
+async def _approximate_cached_response(request: RecommendationRequest, start_time: float) -> Optional[dict]:
+    """
+    The cached response of the most similar indexed request within
+    SEMANTIC_CACHE_MIN_SIMILARITY, marked approximate, or None
+    """
+    if semantic_index is None or not len(semantic_index):
+        return None
+    
+    vector, partition = await _request_vector(request)
+    for similarity, key in semantic_index.nearest(vector, partition, k=3):
+        if similarity < settings.semantic_cache_min_similarity:
+            break
+        cached = await cache_service.get(key, "recommendations")
+        if not isinstance(cached, dict):
+            # Expired or cleared since it was indexed
+            semantic_stats['expired'] += 1
+            semantic_index.remove(key)
+            continue
+        semantic_stats['hits'] += 1
+        logger.info(f"Serving approximate recommendation (similarity {similarity:.2f})")
+        # Copied: the memory tier hands back the cached object itself
+        return {**cached, 'cache_hit': True, 'approximate': True, 'processing_time': time.time() - start_time}
+    
+    semantic_stats['misses'] += 1
+    return None
+
+def _schedule_recommendation_refresh(
+    request: RecommendationRequest,
+    cache_key: str,
+    recommendation_type: str,
+    include_insights: bool
+):
+    """
+    Regenerate a stale recommendation in the background, once per key. The
+    per-movie caches it may have been built from outlive it, so they are
+    skipped: otherwise the refresh would only copy them back under a new TTL.
+    """
+    flight_key = f"{cache_key}:{include_insights}"
+    if recommendation_flights.is_in_flight(flight_key):
+        return
+    
+    spawn_background(recommendation_flights.do(
+        flight_key,
+        lambda: _build_recommendation_response(
+            request, cache_key, recommendation_type, include_insights, time.time(), use_cache=False
+        )
+    ))
+
+async def _generate_unified_recommendations(
+    request: RecommendationRequest,
+    use_cache: bool = True
+) -> List[RecommendationResponse]:
+    """Generate unified recommendations based on overall taste profile"""
+    if len(request.movies) == 1:
+        # A single movie's taste profile is the same GPT call individual mode makes
+        recommendations = await _generate_movie_recommendations(request.movies[0], request.preferences, use_cache)
+    else:
+        fused = await _fused_recommendations(request) if use_cache else None
+        if fused is not None:
+            return fused
+        recommendations = await gpt_service.generate_recommendations(
+            movies=request.movies,
+            preferences=request.preferences
+        )
+        await _record_movie_books(request.movies, request.preferences, recommendations)
+    
+    await _store_recommendation_taste_profile(request, recommendations)
+    return recommendations
+
+async def _generate_individual_recommendations(
+    request: RecommendationRequest,
+    use_cache: bool = True
+) -> List[RecommendationResponse]:
+    """Generate individual recommendations for each movie, a bounded number at a time"""
+    limit = settings.max_concurrent_movie_requests if settings.enable_concurrent_processing else 1
+    semaphore = asyncio.Semaphore(max(1, limit))
+    
+    async def _for_movie(movie: str) -> List[RecommendationResponse]:
+        async with semaphore:
+            return await _generate_movie_recommendations(movie, request.preferences, use_cache)
+    
+    per_movie = await asyncio.gather(*[_for_movie(movie) for movie in request.movies])
+    return [rec for recommendations in per_movie for rec in recommendations]
+
+async def _cached_movie_recommendations(movie: str, preferences) -> Optional[List[RecommendationResponse]]:
+    cache_key = create_movie_recommendation_cache_key(movie, preferences.model_dump() if preferences else None)
+    cached = await cache_service.get(cache_key, "recommendations")
+    if cached is None:
+        movie_stats['cache_misses'] += 1
+        return None
+    movie_stats['cache_hits'] += 1
+    return [RecommendationResponse.model_validate(rec) for rec in cached]
+
+async def _store_movie_recommendations(movie: str, preferences, recommendations: List[RecommendationResponse]):
+    """Cache one movie's GPT recommendations (unenriched), unless they're the canned fallback"""
+    if any(rec._fallback for rec in recommendations):
+        return
+    cache_key = create_movie_recommendation_cache_key(movie, preferences.model_dump() if preferences else None)
+    await cache_service.set(
+        cache_key,
+        [rec.model_dump() for rec in recommendations],
+        expire=settings.movie_recommendation_cache_expire_seconds,
+        cache_type="recommendations"
+    )
+    await _record_movie_books([movie], preferences, recommendations)
+
+async def _generate_movie_recommendations(movie: str, preferences, use_cache: bool = True) -> List[RecommendationResponse]:
+    """GPT recommendations for one movie, from the per-movie cache when possible"""
+    cached = await _cached_movie_recommendations(movie, preferences) if use_cache else None
+    if cached is not None:
+        return cached
+    
+    recommendations = await gpt_service.generate_recommendations(movies=[movie], preferences=preferences)
+    await _store_movie_recommendations(movie, preferences, recommendations)
+    return recommendations
+
+async def _record_movie_books(movies: List[str], preferences, recommendations: List[RecommendationResponse]):
+    """
+    Fold the books of a GPT run into each movie's ranked list for rank fusion.
+    A single-movie run's books rank ahead of what the movie had; books from a
+    multi-movie run are credited to every movie in it, after its own books.
+    """
+    if any(rec._fallback for rec in recommendations):
+        return
+    
+    books = sorted(
+        [book for rec in recommendations for book in rec.books],
+        key=lambda book: book.taste_match_score if book.taste_match_score is not None else DEFAULT_MATCH_SCORE,
+        reverse=True
+    )
+    ranked = [book.model_dump(include=RANKED_BOOK_FIELDS) for book in books]
+    taste_profile = recommendations[0].taste_profile.model_dump() if len(movies) == 1 and recommendations[0].taste_profile else None
+    
+    for movie in movies:
+        cache_key = create_movie_books_cache_key(movie, preferences.model_dump() if preferences else None)
+        # Runs overlapping on a movie would otherwise each drop the other's books
+        async with movie_book_locks.hold(cache_key):
+            # The memory tier hands out the cached dict itself, so build a new one
+            entry = await cache_service.get(cache_key, "recommendations") or {'books': [], 'taste_profile': None}
+            if len(movies) == 1:
+                merged = ranked + entry['books']
+                entry_taste_profile = taste_profile
+            else:
+                merged = entry['books'] + ranked
+                entry_taste_profile = entry['taste_profile']
+            
+            seen = set()
+            kept = []
+            for book in merged:
+                key = book_key(book)
+                if key not in seen:
+                    seen.add(key)
+                    kept.append(book)
+            
+            await cache_service.set(
+                cache_key,
+                {'books': kept[:settings.rank_fusion_list_size], 'taste_profile': entry_taste_profile},
+                expire=settings.movie_recommendation_cache_expire_seconds,
+                cache_type="recommendations"
+            )
+
+async def _fused_recommendations(request: RecommendationRequest) -> Optional[List[RecommendationResponse]]:
+    """
+    Answer a multi-movie unified request without GPT by fusing each movie's ranked
+    book list. None unless every movie has a list and the fused top books clear
+    RANK_FUSION_MIN_CONFIDENCE.
+    """
+    if not settings.enable_rank_fusion or len(request.movies) < 2:
+        return None
+    
+    preferences = request.preferences.model_dump() if request.preferences else None
+    entries = await asyncio.gather(*[
+        cache_service.get(create_movie_books_cache_key(movie, preferences), "recommendations")
+        for movie in request.movies
+    ])
+    if not all(entry and entry['books'] for entry in entries):
+        fusion_stats['not_covered'] += 1
+        return None
+    
+    fused = fuse_ranked_lists([entry['books'] for entry in entries])[:settings.books_per_recommendation]
+    confidence = fusion_confidence(fused, len(entries))
+    if confidence < settings.rank_fusion_min_confidence:
+        fusion_stats['low_confidence'] += 1
+        logger.info(f"Fused recommendations too weak ({confidence:.2f}); asking GPT")
+        return None
+    
+    fusion_stats['served'] += 1
+    taste_profile = merge_taste_profiles([entry['taste_profile'] for entry in entries])
+    if taste_profile:
+        taste_profile['confidence_score'] = round(confidence, 2)
+    return [RecommendationResponse(
+        movie=gpt_service._create_movie_summary(request.movies, {}),
+        books=[BookRecommendation(**book) for _, book in fused],
+        taste_profile=TasteProfile(**taste_profile) if taste_profile else None
+    )]
+
+async def _generate_content_recommendations(request: RecommendationRequest) -> List[RecommendationResponse]:
+    """Content-based recommendations, or the canned fallback if nothing in the catalog is close enough"""
+    recommendations = await _content_recommendations(request)
+    if recommendations is None:
+        return await _enhance_with_metadata(gpt_service._create_fallback_response(request.movies))
+    content_stats['served'] += 1
+    return recommendations
+
+async def _content_fallback(
+    request: RecommendationRequest,
+    recommendations: List[RecommendationResponse]
+) -> Optional[List[RecommendationResponse]]:
+    """Content-based recommendations to serve in place of GPT's canned fallback, if it fell back"""
+    if not settings.content_fallback or content_index is None:
+        return None
+    if not recommendations or not all(rec._fallback for rec in recommendations):
+        return None
+    
+    content = await _content_recommendations(request)
+    if content is None:
+        return None
+    content_stats['gpt_fallbacks'] += 1
+    logger.info("GPT unavailable; serving content-based recommendations")
+    for rec in content:
+        # Stand-ins for GPT output, so kept out of the per-movie and semantic caches
+        rec._fallback = True
+    return content
+
+async def _content_recommendations(request: RecommendationRequest) -> Optional[List[RecommendationResponse]]:
+    """
+    Rank the content index against each movie's TMDB overview plus the stated
+    preferences. None if no book reaches CONTENT_MIN_SCORE.
+    """
+    overviews = await asyncio.gather(*[_movie_overview(movie) for movie in request.movies])
+    preferences = request.preferences
+    preference_text = " ".join(
+        [preferences.mood or "", preferences.pace or "", *(preferences.genre_preferences or [])]
+    ) if preferences else ""
+    movie_texts = {
+        movie: f"{movie} {overview or ''} {preference_text}"
+        for movie, overview in zip(request.movies, overviews)
+    }
+    
+    matches = await asyncio.to_thread(
+        content_index.recommend,
+        movie_texts,
+        settings.books_per_recommendation,
+        preferences.genre_blocklist or () if preferences else (),
+        settings.content_min_score
+    )
+    if not matches:
+        content_stats['no_match'] += 1
+        return None
+    
+    books = []
+    for match in matches:
+        book = BookRecommendation(
+            title=match.book['title'],
+            author=match.book['author'],
+            reason=_content_reason(match),
+            taste_match_score=round(match.score, 2),
+            primary_appeal=", ".join(str(genre) for genre in (match.book.get('genres') or [])[:2]) or None
+        )
+        _apply_book_metadata(book, match.book)
+        books.append(book)
+    
+    genres = Counter(genre for book in books for genre in book.genre_tags or [])
+    taste_profile = TasteProfile(**{
+        **FALLBACK_TASTE_PROFILE,
+        'themes': list(dict.fromkeys(term for match in matches for term in match.terms))[:5],
+        'genre_fusion': ", ".join(genre for genre, _ in genres.most_common(3)) or FALLBACK_TASTE_PROFILE['genre_fusion'],
+        'confidence_score': round(sum(match.score for match in matches) / len(matches), 2)
+    })
+    return [RecommendationResponse(
+        movie=gpt_service._create_movie_summary(request.movies, {}),
+        books=books,
+        taste_profile=taste_profile,
+        recommendation_type="content"
+    )]
+
+def _content_reason(match: ContentMatch) -> str:
+    if not match.terms:
+        return f"The closest match in our catalog to {match.movie}."
+    return f"Its description shares the key words of {match.movie}: {', '.join(match.terms)}."
+
+async def _movie_overview(movie: str) -> Optional[str]:
+    """A movie's TMDB plot overview, cached; None if TMDB has none or doesn't answer in time"""
+    cache_key = create_movie_overview_cache_key(movie)
+    cached = await cache_service.get(cache_key, "searches")
+    if cached is not None:
+        return cached['overview']
+    
     try:
-        # Create cache key for book metadata
+        overview = await asyncio.wait_for(
+            tmdb_service.get_movie_overview(movie),
+            timeout=settings.content_overview_timeout_seconds
+        )
+    except asyncio.TimeoutError:
+        logger.info(f"TMDB overview for {movie} timed out; matching on the title")
+        return None
+    
+    if overview:
+        await cache_service.set(
+            cache_key,
+            {'overview': overview},
+            expire=settings.book_cache_expire_seconds,
+            cache_type="searches"
+        )
+    return overview
+
+async def _enhance_with_metadata(
+    recommendations: List[RecommendationResponse],
+    on_book_done: Optional[Callable[[BookRecommendation], None]] = None
+) -> List[RecommendationResponse]:
+    """
+    Enhance recommendations with metadata from Hardcover. on_book_done, if given,
+    is called for each book as soon as its lookup has finished, found or not.
+    """
+    books = [book for rec in recommendations for book in rec.books]
+    notify = on_book_done or (lambda book: None)
+    
+    if settings.hardcover_batch_size <= 0:
+        # Batching disabled: look every book up on its own, concurrently
+        async def _enhance_one(book: BookRecommendation):
+            await enhance_book_with_metadata(book)
+            notify(book)
+        
+        await asyncio.gather(*[_enhance_one(book) for book in books])
+        return recommendations
+    
+    # Apply whatever the cache already knows; group the rest by cache key so
+    # the same title appearing twice is only looked up once
+    pending: Dict[str, List[BookRecommendation]] = {}
+    to_hydrate: Dict[int, List[str]] = {}
+    for book in books:
         book_cache_key = create_book_cache_key(book.title, book.author)
+        if book_cache_key in pending:
+            pending[book_cache_key].append(book)
+            continue
+        try:
+            book_metadata, hardcover_id = await _cached_book_metadata(book, book_cache_key)
+        except Exception as e:
+            logger.error(f"Error reading cached metadata for '{book.title}': {e}")
+            notify(book)
+            continue
         
-        # Check cache first
-        cached_metadata = await cache_service.get(book_cache_key, "books")
-        
-        if cached_metadata:
-            # Apply cached metadata
-            if cached_metadata.get('cover_url'):
-                book.cover_url = cached_metadata['cover_url']
-            if cached_metadata.get('rating'):
-                book.rating = cached_metadata['rating']
-            if cached_metadata.get('hardcover_url'):
-                book.hardcover_url = cached_metadata['hardcover_url']
-            if cached_metadata.get('genre_tags'):
-                book.genre_tags = cached_metadata.get('genres', [])
-            if cached_metadata.get('isbn'):
-                book.isbn = cached_metadata['isbn']
-            if cached_metadata.get('publication_year'):
-                book.publication_year = cached_metadata['publication_year']
-            if cached_metadata.get('page_count'):
-                book.page_count = cached_metadata['page_count']
-            if cached_metadata.get('publisher'):
-                book.publisher = cached_metadata['publisher']
-            if cached_metadata.get('hardcover_id'):
-                book.hardcover_id = cached_metadata['hardcover_id']
-            if cached_metadata.get('users_count'):
-                book.users_count = cached_metadata['users_count']
-            if cached_metadata.get('description'):
-                book.description = cached_metadata['description']
+        if book_metadata:
+            _apply_book_metadata(book, book_metadata)
+            notify(book)
         else:
-            # Fetch from Hardcover API
-            book_metadata = await hardcover_service.get_book_metadata(book.title, book.author)
+            pending[book_cache_key] = [book]
+            if hardcover_id:
+                to_hydrate.setdefault(hardcover_id, []).append(book_cache_key)
+    
+    if to_hydrate:
+        # Known aliases whose metadata expired: one `_in` query for all of them
+        hydrated = await _hydrate_books(list(to_hydrate))
+        for hardcover_id, book_metadata in hydrated.items():
+            for book_cache_key in to_hydrate.get(hardcover_id, []):
+                for same_book in pending.pop(book_cache_key):
+                    _apply_book_metadata(same_book, book_metadata)
+                    notify(same_book)
+    
+    if pending:
+        await _enhance_uncached_books(pending, notify)
+    
+    return recommendations
+
+async def _enhance_uncached_books(
+    pending: Dict[str, List[BookRecommendation]],
+    notify: Callable[[BookRecommendation], None]
+):
+    """
+    Look up uncached books in batched GraphQL requests, then fall back to the
+    per-book search strategies only for the titles the batch didn't match
+    """
+    keys = list(pending)
+    batch_size = settings.hardcover_batch_size
+    chunks = [keys[i:i + batch_size] for i in range(0, len(keys), batch_size)]
+    
+    async def _lookup_chunk(chunk: List[str]):
+        book_stats['batch_requests'] += 1
+        return await hardcover_service.lookup_books_batch(
+            [(pending[key][0].title, pending[key][0].author) for key in chunk]
+        )
+    
+    chunk_outcomes = await asyncio.gather(*[_lookup_chunk(chunk) for chunk in chunks])
+    outcomes = [outcome for chunk in chunk_outcomes for outcome in chunk]
+    
+    async def _resolve(book_cache_key: str, book_metadata: Optional[dict], status: str):
+        book = pending[book_cache_key][0]
+        try:
+            if status == LOOKUP_FOUND:
+                book_stats['batch_found'] += 1
+                await _store_book_lookup(book.title, book.author, book_cache_key, book_metadata, status)
+            elif status == LOOKUP_NOT_FOUND:
+                # The first strategy's results already ruled the book out
+                await _store_book_lookup(book.title, book.author, book_cache_key, None, status)
+            else:
+                # The batch already ran the first strategy for inconclusive misses
+                book_stats['batch_fallbacks'] += 1
+                book_metadata = await _fetch_book_metadata(
+                    book.title,
+                    book.author,
+                    book_cache_key,
+                    skip_strategies=1 if status == LOOKUP_INCONCLUSIVE else 0
+                )
             
             if book_metadata:
-                # Apply metadata
-                book.cover_url = book_metadata.get('cover_url')
-                book.rating = book_metadata.get('rating')
-                book.hardcover_url = book_metadata.get('url')
-                book.genre_tags = book_metadata.get('genres', [])
-                book.isbn = book_metadata.get('isbn')
-                book.publication_year = book_metadata.get('publication_year')
-                book.page_count = book_metadata.get('page_count')
-                book.publisher = book_metadata.get('publisher')
-                book.hardcover_id = book_metadata.get('hardcover_id')
-                book.users_count = book_metadata.get('users_count')
-                book.description = book_metadata.get('description')
-                
-                # Cache the metadata
-                await cache_service.set(
-                    book_cache_key, 
-                    book_metadata, 
-                    expire=settings.book_cache_expire_seconds, 
-                    cache_type="books"
-                )
+                for same_book in pending[book_cache_key]:
+                    _apply_book_metadata(same_book, book_metadata)
             else:
                 logger.warning(f"No metadata found for book: {book.title} by {book.author}")
+        except Exception as e:
+            # Log error but don't fail the request
+            logger.error(f"Error enhancing book metadata for '{book.title}': {e}")
+        finally:
+            for same_book in pending[book_cache_key]:
+                notify(same_book)
+    
+    await asyncio.gather(*[
+        _resolve(key, book_metadata, status)
+        for key, (book_metadata, status) in zip(keys, outcomes)
+    ])
+
+def _apply_book_metadata(book: BookRecommendation, metadata: dict):
+    """Copy Hardcover metadata onto a book, keeping existing values for missing fields"""
+    for book_field, metadata_field in BOOK_METADATA_FIELDS.items():
+        if metadata.get(metadata_field):
+            setattr(book, book_field, metadata[metadata_field])
+
+async def _cached_book_metadata(book: BookRecommendation, book_cache_key: str) -> Tuple[Optional[dict], Optional[int]]:
+    """
+    Find metadata for a book without searching Hardcover: through the alias index
+    and id-keyed cache, then the title/author cache, then the local catalog.
+    
+    Returns (metadata, None) when found, with NEGATIVE_BOOK_ENTRY for known misses;
+    (None, hardcover_id) for a known alias whose metadata has expired and needs
+    hydrating by id; (None, None) when nothing is known. Stale metadata is
+    returned and refreshed in the background.
+    """
+    alias = await cache_service.get(create_book_alias_key(book.title, book.author), "book_aliases")
+    if alias:
+        book_stats['alias_hits'] += 1
+        hardcover_id = alias['hardcover_id']
+        cached_metadata, is_stale = await cache_service.get_with_staleness(
+            create_book_id_cache_key(hardcover_id), "books"
+        )
+        if not cached_metadata:
+            return None, hardcover_id
+        if is_stale:
+            _schedule_book_refresh(book.title, book.author, book_cache_key, hardcover_id)
+        return cached_metadata, None
+    
+    cached_metadata, is_stale = await cache_service.get_with_staleness(book_cache_key, "books")
+    
+    if not cached_metadata:
+        # Books we've resolved before, under any cache key, are in the local catalog
+        catalog_metadata = await book_catalog.lookup(book.title, book.author) if book_catalog else None
+        return catalog_metadata, None
+    
+    if cached_metadata.get('not_found'):
+        # Known-unfindable title: skip the search strategies entirely
+        book_stats['negative_hits'] += 1
+        return cached_metadata, None
+    
+    if is_stale:
+        _schedule_book_refresh(book.title, book.author, book_cache_key)
+    
+    return cached_metadata, None
+
+async def enhance_book_with_metadata(book):
+    """Enhance a book recommendation with metadata from Hardcover"""
+    try:
+        # Create cache key for book metadata
+        book_cache_key = create_book_cache_key(book.title, book.author)
+        
+        book_metadata, hardcover_id = await _cached_book_metadata(book, book_cache_key)
+        if not book_metadata and hardcover_id:
+            book_metadata = (await _hydrate_books([hardcover_id])).get(hardcover_id)
+        if not book_metadata:
+            # Fetch from Hardcover API
+            book_metadata = await _fetch_book_metadata(book.title, book.author, book_cache_key)
+        
+        if book_metadata:
+            _apply_book_metadata(book, book_metadata)
+        else:
+            logger.warning(f"No metadata found for book: {book.title} by {book.author}")
         
         return book
         
@@ -236,6 +1114,93 @@ async def enhance_book_with_metadata(book):
         logger.error(f"Error enhancing book metadata for '{book.title}': {e}")
         return book
 
+async def _fetch_book_metadata(title: str, author: str, book_cache_key: str, skip_strategies: int = 0):
+    """Fetch book metadata from Hardcover and cache it, including definitive misses"""
+    book_metadata, status = await hardcover_service.lookup_book_metadata(
+        title, author, skip_strategies=skip_strategies
+    )
+    await _store_book_lookup(title, author, book_cache_key, book_metadata, status)
+    return book_metadata
+
+async def _hydrate_books(hardcover_ids: List[int]) -> Dict[int, dict]:
+    """Fetch metadata for known Hardcover ids in one request and cache it by id"""
+    hydrated = await hardcover_service.get_books_by_ids(hardcover_ids)
+    for book_metadata in hydrated.values():
+        await _cache_book_by_id(book_metadata)
+    book_stats['hydrated'] += len(hydrated)
+    return hydrated
+
+async def _cache_book_by_id(book_metadata: dict):
+    """Cache metadata under its canonical Hardcover id and add it to the catalog"""
+    await cache_service.set(
+        create_book_id_cache_key(book_metadata['hardcover_id']),
+        book_metadata,
+        expire=settings.book_cache_expire_seconds,
+        cache_type="books",
+        stale_grace=settings.book_stale_grace_seconds
+    )
+    if book_catalog:
+        await book_catalog.add(book_metadata)
+
+async def _record_book_alias(title: str, author: str, hardcover_id: int):
+    """Point one (title, author) spelling at its canonical Hardcover id"""
+    await cache_service.set(
+        create_book_alias_key(title, author),
+        {'hardcover_id': hardcover_id},
+        expire=settings.book_alias_expire_seconds,
+        cache_type="book_aliases"
+    )
+
+async def _store_book_lookup(
+    title: str,
+    author: str,
+    book_cache_key: str,
+    book_metadata: Optional[dict],
+    status: str
+):
+    """
+    Cache a lookup result. Metadata with a Hardcover id is cached by id, with both
+    the requested and the canonical spelling recorded as aliases; definitive misses
+    are cached as negative entries under the title/author key.
+    """
+    if book_metadata and book_metadata.get('hardcover_id'):
+        hardcover_id = book_metadata['hardcover_id']
+        await _cache_book_by_id(book_metadata)
+        await _record_book_alias(title, author, hardcover_id)
+        if book_metadata.get('title'):
+            await _record_book_alias(book_metadata['title'], book_metadata.get('author') or "", hardcover_id)
+    elif book_metadata:
+        # Cache the metadata
+        await cache_service.set(
+            book_cache_key, 
+            book_metadata, 
+            expire=settings.book_cache_expire_seconds, 
+            cache_type="books",
+            stale_grace=settings.book_stale_grace_seconds
+        )
+        if book_catalog:
+            await book_catalog.add(book_metadata)
+    elif status == LOOKUP_NOT_FOUND and settings.book_negative_cache_expire_seconds > 0:
+        # Remember the miss for a shorter period; failed lookups are never cached
+        await cache_service.set(
+            book_cache_key,
+            NEGATIVE_BOOK_ENTRY,
+            expire=settings.book_negative_cache_expire_seconds,
+            cache_type="books"
+        )
+        book_stats['negative_stored'] += 1
+
+def _schedule_book_refresh(title: str, author: str, book_cache_key: str, hardcover_id: Optional[int] = None):
+    """Refresh stale book metadata in the background, once per key; by id when it's known"""
+    if book_refresh_flights.is_in_flight(book_cache_key):
+        return
+    
+    if hardcover_id:
+        refresh = lambda: _hydrate_books([hardcover_id])
+    else:
+        refresh = lambda: _fetch_book_metadata(title, author, book_cache_key)
+    spawn_background(book_refresh_flights.do(book_cache_key, refresh))
+
 async def _generate_insights(movies: List[str], recommendations: List[RecommendationResponse]) -> RecommendationInsights:
     """Generate insights about the recommendations"""
     try:
@@ -310,16 +1275,29 @@ async def analyze_taste_profile(
         # Parse preferences if provided
         user_preferences = None
         if preferences:
-            import json
-            user_preferences = json.loads(preferences)
+            user_preferences = UserPreferences.model_validate(json.loads(preferences))
         
-        # Analyze taste profile
-        taste_profile = await gpt_service.analyze_taste_profile(movies, user_preferences)
+        # Same key /recommend stores its unified taste profile under
+        cache_key = create_taste_profile_cache_key(
+            movies, user_preferences.model_dump() if user_preferences else None
+        )
+        taste_profile = await cache_service.get(cache_key, "taste_profiles")
+        cache_hit = taste_profile is not None
+        
+        if cache_hit:
+            taste_profile_stats['cache_hits'] += 1
+        else:
+            taste_profile_stats['cache_misses'] += 1
+            # Analyze taste profile
+            taste_profile = await gpt_service.analyze_taste_profile(movies, user_preferences)
+            if taste_profile != FALLBACK_TASTE_PROFILE:
+                await _store_taste_profile(cache_key, taste_profile)
         
         return {
             "movies": movies,
             "taste_profile": taste_profile,
-            "analysis_timestamp": time.time()
+            "analysis_timestamp": time.time(),
+            "cache_hit": cache_hit
         }
         
     except HTTPException:
@@ -339,6 +1317,32 @@ async def get_cache_stats():
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error getting cache stats: {str(e)}")
 
+@router.get("/metrics")
+async def get_metrics():
+    """Request-level counters for monitoring"""
+    if not settings.enable_metrics:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    
+    return {
+        "recommend": {
+            "cache_hits": recommend_stats['cache_hits'],
+            "stale_hits": recommend_stats['stale_hits'],
+            "partial": recommend_stats['partial'],
+            "cache_misses": recommendation_flights.executions,
+            "coalesced": recommendation_flights.coalesced,
+            "in_flight": recommendation_flights.in_flight
+        },
+        "movie_recommendations": movie_stats,
+        "taste_profiles": taste_profile_stats,
+        "rank_fusion": fusion_stats,
+        "semantic_cache": {**semantic_stats, **semantic_index.stats()} if semantic_index else None,
+        "content_recommender": {**content_stats, "index": content_index.stats()} if content_index else None,
+        "books": book_stats,
+        "hardcover_searches": hardcover_service.search_stats(),
+        "hardcover_rate_limiter": hardcover_rate_limiter.stats(),
+        "book_catalog": await book_catalog.stats() if book_catalog else None
+    }
+
 @router.delete("/cache/clear")
 async def clear_cache(cache_type: str = Query(None)):
     """Clear cache entries (useful for development)"""
@@ -351,19 +1355,13 @@ async def clear_cache(cache_type: str = Query(None)):
 @router.post("/regenerate", response_model=EnhancedRecommendationResponse)
 async def regenerate_recommendations(
     request: RecommendationRequest,
-    recommendation_type: str = Query("unified", description="Type of recommendation: 'unified' or 'individual'")
+    recommendation_type: str = Query("unified", description="Type of recommendation: 'unified', 'individual' or 'content'")
 ):
     """Generate new recommendations without using cache"""
     try:
         # Validate input
-        if not request.movies:
-            raise HTTPException(status_code=400, detail="At least one movie is required")
-        
-        if len(request.movies) > settings.max_movies_per_request:
-            raise HTTPException(
-                status_code=400, 
-                detail=f"Maximum {settings.max_movies_per_request} movies allowed per request"
-            )
+        _validate_recommendation_request(request)
+        _validate_recommendation_type(recommendation_type)
         
         # Clear existing cache for this request
         cache_key = create_recommendation_cache_key(
@@ -376,13 +1374,20 @@ async def regenerate_recommendations(
         # Generate fresh recommendations
         start_time = time.time()
         
-        if recommendation_type == "unified":
-            recommendations = await _generate_unified_recommendations(request)
+        if recommendation_type == "content":
+            # Ranked from catalog metadata, already complete
+            enhanced_recommendations = await _generate_content_recommendations(request)
         else:
-            recommendations = await _generate_individual_recommendations(request)
-        
-        # Enhance with metadata
-        enhanced_recommendations = await _enhance_with_metadata(recommendations)
+            if recommendation_type == "unified":
+                recommendations = await _generate_unified_recommendations(request, use_cache=False)
+            else:
+                recommendations = await _generate_individual_recommendations(request, use_cache=False)
+            
+            # As in /recommend, GPT's canned fallback gives way to content-based picks
+            content = await _content_fallback(request, recommendations) if recommendation_type == "unified" else None
+            
+            # Enhance with metadata
+            enhanced_recommendations = content or await _enhance_with_metadata(recommendations)
         
         # Generate insights
         insights = await _generate_insights(request.movies, enhanced_recommendations)
@@ -396,12 +1401,7 @@ async def regenerate_recommendations(
         )
         
         # Cache the new result
-        await cache_service.set(
-            cache_key, 
-            response, 
-            expire=settings.cache_expire_seconds, 
-            cache_type="recommendations"
-        )
+        await _cache_recommendation_response(cache_key, response, request, recommendation_type)
         
         return response
         
@@ -0,0 +1,233 @@
+import argparse
+import asyncio
+import json
+import sqlite3
+import time
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, List, Optional
+from app.services.book_matching import STOP_WORDS, normalize_text
+import logging
+
+logger = logging.getLogger(__name__)
+
+def _content_tokens(normalized: str) -> List[str]:
+    tokens = normalized.split()
+    return [t for t in tokens if t not in STOP_WORDS] or tokens
+
+class BookCatalog:
+    """
+    Local on-disk catalog of Hardcover book metadata.
+
+    Rows are keyed by normalized (title, author) and hold the metadata dict
+    produced by HardcoverService._extract_metadata_from_search_result. An FTS5
+    index over the same keys resolves spelling variants such as a missing
+    leading article or a different form of the author's name. The catalog
+    fills up from our own Hardcover traffic and can be imported or exported
+    as JSON lines:
+
+        python -m app.services.book_catalog import books.jsonl
+        python -m app.services.book_catalog export books.jsonl
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        self._lock = Lock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS books (
+                title_key TEXT NOT NULL,
+                author_key TEXT NOT NULL,
+                hardcover_id INTEGER,
+                metadata TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (title_key, author_key)
+            )
+        """)
+        self.fts_enabled = self._create_fts_index()
+        self.hits = 0
+        self.misses = 0
+
+    def _create_fts_index(self) -> bool:
+        """Create the FTS5 index and its sync triggers; exact-key lookups still work without it"""
+        try:
+            self._conn.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS books_fts
+                USING fts5(title_key, author_key, content='books', content_rowid='rowid')
+            """)
+        except sqlite3.OperationalError as e:
+            logger.warning(f"SQLite FTS5 unavailable, book catalog limited to exact matches: {e}")
+            return False
+
+        self._conn.executescript("""
+            CREATE TRIGGER IF NOT EXISTS books_fts_insert AFTER INSERT ON books BEGIN
+                INSERT INTO books_fts (rowid, title_key, author_key)
+                VALUES (new.rowid, new.title_key, new.author_key);
+            END;
+            CREATE TRIGGER IF NOT EXISTS books_fts_delete AFTER DELETE ON books BEGIN
+                INSERT INTO books_fts (books_fts, rowid, title_key, author_key)
+                VALUES ('delete', old.rowid, old.title_key, old.author_key);
+            END;
+            CREATE TRIGGER IF NOT EXISTS books_fts_update AFTER UPDATE ON books BEGIN
+                INSERT INTO books_fts (books_fts, rowid, title_key, author_key)
+                VALUES ('delete', old.rowid, old.title_key, old.author_key);
+                INSERT INTO books_fts (rowid, title_key, author_key)
+                VALUES (new.rowid, new.title_key, new.author_key);
+            END;
+        """)
+        return True
+
+    def _execute(self, sql: str, params: tuple = ()) -> list:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _lookup(self, title: str, author: str) -> Optional[Dict[str, Any]]:
+        title_key = normalize_text(title)
+        author_key = normalize_text(author)
+        if not title_key:
+            return None
+
+        rows = self._execute(
+            "SELECT metadata FROM books WHERE title_key = ? AND author_key = ?",
+            (title_key, author_key)
+        )
+        if rows:
+            return json.loads(rows[0][0])
+
+        if not self.fts_enabled:
+            return None
+
+        # Candidates must contain every title word and, if given, share a word of the author's name
+        title_tokens = _content_tokens(title_key)
+        match = " AND ".join(f'title_key : "{token}"' for token in title_tokens)
+        if author_key:
+            match += " AND (" + " OR ".join(f'author_key : "{token}"' for token in author_key.split()) + ")"
+
+        rows = self._execute(
+            "SELECT b.title_key, b.metadata FROM books_fts JOIN books b ON b.rowid = books_fts.rowid "
+            "WHERE books_fts MATCH ? ORDER BY bm25(books_fts) LIMIT 10",
+            (match,)
+        )
+        # Only accept the same title up to stop words, not a longer title that contains it
+        wanted = set(title_tokens)
+        for candidate_title, metadata in rows:
+            if set(_content_tokens(candidate_title)) == wanted:
+                return json.loads(metadata)
+        return None
+
+    def _add(self, metadata: Dict[str, Any]) -> bool:
+        title_key = normalize_text(metadata.get("title"))
+        if not title_key:
+            return False
+
+        self._execute(
+            "INSERT INTO books (title_key, author_key, hardcover_id, metadata, updated_at) "
+            "VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (title_key, author_key) DO UPDATE SET "
+            "hardcover_id = excluded.hardcover_id, metadata = excluded.metadata, updated_at = excluded.updated_at",
+            (
+                title_key,
+                normalize_text(metadata.get("author")),
+                metadata.get("hardcover_id"),
+                json.dumps(metadata),
+                time.time()
+            )
+        )
+        return True
+
+    async def lookup(self, title: str, author: str = "") -> Optional[Dict[str, Any]]:
+        """Find catalog metadata for a book, counting the hit or miss"""
+        metadata = await asyncio.to_thread(self._lookup, title, author)
+        if metadata is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return metadata
+
+    async def add(self, metadata: Dict[str, Any]) -> bool:
+        """Insert or refresh a book from a Hardcover result"""
+        return await asyncio.to_thread(self._add, metadata)
+
+    async def stats(self) -> Dict[str, Any]:
+        rows = await asyncio.to_thread(self._execute, "SELECT COUNT(*) FROM books")
+        lookups = self.hits + self.misses
+        return {
+            'entries': rows[0][0],
+            'fts_enabled': self.fts_enabled,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+    def import_file(self, path: Path) -> int:
+        """
+        Import a JSON lines file of catalog metadata (as written by export_file) or
+        of raw Hardcover search documents. Returns the number of books imported.
+        """
+        from app.services.hardcover_service import HardcoverService
+
+        hardcover_service = HardcoverService()
+        imported = 0
+        self._execute("BEGIN")
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    record = json.loads(line)
+                    if "author_names" in record:
+                        # Raw search document; normalize it like a live lookup would
+                        record = hardcover_service._extract_metadata_from_search_result(record)
+                    if self._add(record):
+                        imported += 1
+        except BaseException:
+            self._execute("ROLLBACK")
+            raise
+        self._execute("COMMIT")
+        return imported
+
+    def all_books(self) -> List[Dict[str, Any]]:
+        """Every book's metadata, for offline jobs such as building the content index"""
+        rows = self._execute("SELECT metadata FROM books ORDER BY title_key, author_key")
+        return [json.loads(metadata) for (metadata,) in rows]
+
+    def export_file(self, path: Path) -> int:
+        """Write every book as one JSON object per line. Returns the number written."""
+        rows = self._execute("SELECT metadata FROM books ORDER BY title_key, author_key")
+        with open(path, "w", encoding="utf-8") as f:
+            for (metadata,) in rows:
+                f.write(metadata + "\n")
+        return len(rows)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+def main():
+    from app.config import settings
+
+    parser = argparse.ArgumentParser(description="Manage the local book catalog")
+    parser.add_argument("--db", default=str(Path(settings.cache_dir) / settings.book_catalog_file))
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("import", help="Import books from a JSON lines file").add_argument("path")
+    commands.add_parser("export", help="Export books to a JSON lines file").add_argument("path")
+    commands.add_parser("stats", help="Show the number of books in the catalog")
+    args = parser.parse_args()
+
+    Path(args.db).parent.mkdir(parents=True, exist_ok=True)
+    catalog = BookCatalog(Path(args.db))
+    try:
+        if args.command == "import":
+            print(f"Imported {catalog.import_file(Path(args.path))} books into {args.db}")
+        elif args.command == "export":
+            print(f"Exported {catalog.export_file(Path(args.path))} books to {args.path}")
+        else:
+            print(json.dumps(asyncio.run(catalog.stats()), indent=2))
+    finally:
+        catalog.close()
+
+if __name__ == "__main__":
+    main()
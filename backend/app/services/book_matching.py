@@ -0,0 +1,205 @@
+import math
+import re
+import unicodedata
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+# Ignored when comparing titles, so "The Name of the Wind" matches "Name of the Wind"
+STOP_WORDS = frozenset({"the", "a", "an", "of", "in", "on", "at", "to", "for", "with", "and", "by"})
+
+# Candidates scoring below this are not considered a match
+MATCH_THRESHOLD = 0.5
+
+# When even the best candidate scores below this, nothing in the results resembles
+# the book, and other search strategies won't turn it up either
+ABSENT_FLOOR = 0.35
+
+# "(Dune Chronicles #1)", "[Book 2]", "(The Expanse, Vol. 3)"
+_BRACKETED_SERIES = re.compile(
+    r"\s*[\(\[][^\)\]]*(?:#\s*\d|\bbook\s+\d|\bvol(?:ume)?\.?\s*\d|\bseries\b|\bsaga\b|\btrilogy\b|\bchronicles\b)[^\)\]]*[\)\]]",
+    re.IGNORECASE
+)
+# "..., Book 3", "... #4", "... Volume 2" at the end of a title
+_TRAILING_SERIES = re.compile(r"(?:\s*[,:\-]\s*|\s+)(?:(?:book|volume|vol\.?|part)\s+\d+|#\s*\d+)\s*$", re.IGNORECASE)
+# "Sapiens: A Brief History", "Blood Meridian, or the Evening Redness in the West"
+_SUBTITLE_SEPARATOR = re.compile(r"\s*(?::|\s-\s|\s–\s|\s—\s|,\s+or\s+)\s*", re.IGNORECASE)
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+_DIGIT = re.compile(r"\d")
+
+def normalize_text(value: Optional[str]) -> str:
+    """Lowercase, strip accents and punctuation, and collapse whitespace"""
+    if not value:
+        return ""
+    if not value.isascii():
+        value = unicodedata.normalize("NFKD", value)
+        value = "".join(ch for ch in value if not unicodedata.combining(ch))
+    return " ".join(_NON_ALNUM.sub(" ", value.lower()).split())
+
+def strip_series_markers(title: str) -> str:
+    """Drop series annotations such as "(Dune Chronicles #1)" or ", Book 2" from a title"""
+    # Both patterns need a bracket or a digit, which most titles don't have
+    if "(" in title or "[" in title:
+        title = _BRACKETED_SERIES.sub("", title)
+    if _DIGIT.search(title):
+        title = _TRAILING_SERIES.sub("", title)
+    return title.strip()
+
+def _content_tokens(normalized: str) -> FrozenSet[str]:
+    tokens = frozenset(normalized.split())
+    return tokens - STOP_WORDS or tokens
+
+def _trigrams(normalized: str) -> FrozenSet[str]:
+    padded = f" {normalized} "
+    return frozenset({padded[i:i + 3] for i in range(len(padded) - 2)})
+
+def _jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+@dataclass(frozen=True)
+class TitleSignature:
+    """A title normalized once: full form, main title before any subtitle, and its content tokens"""
+    full: str
+    main: str
+    tokens: FrozenSet[str]
+
+    @cached_property
+    def grams(self) -> FrozenSet[str]:
+        # Only needed when the cheaper comparisons disagree, so built on demand and kept
+        return _trigrams(self.main)
+
+    @classmethod
+    def build(cls, title: Optional[str]) -> "TitleSignature":
+        return _title_signature(title or "")
+
+@lru_cache(maxsize=4096)
+def _title_signature(title: str) -> TitleSignature:
+    # Cached because the same documents come back for every strategy and many requests
+    cleaned = strip_series_markers(title)
+    main = normalize_text(_SUBTITLE_SEPARATOR.split(cleaned, maxsplit=1)[0])
+    full = normalize_text(cleaned)
+    return TitleSignature(full=full, main=main, tokens=_content_tokens(main))
+
+@dataclass(frozen=True)
+class AuthorSignature:
+    """Name tokens without initials, plus each author's surname"""
+    tokens: FrozenSet[str]
+    surnames: FrozenSet[str]
+
+    @classmethod
+    def build(cls, names: List[str]) -> "AuthorSignature":
+        return _author_signature(tuple(names))
+
+@lru_cache(maxsize=4096)
+def _author_signature(names: Tuple[str, ...]) -> AuthorSignature:
+    tokens = set()
+    surnames = set()
+    for name in names:
+        if not name:
+            continue
+        if name.count(",") == 1:
+            # "Le Guin, Ursula K." -> "Ursula K. Le Guin"
+            last, first = name.split(",")
+            name = f"{first} {last}"
+        words = [w for w in normalize_text(name).split() if len(w) > 1]
+        if words:
+            tokens.update(words)
+            surnames.add(words[-1])
+    return AuthorSignature(tokens=frozenset(tokens), surnames=frozenset(surnames))
+
+def clear_signature_cache():
+    """Drop cached title and author signatures and book queries"""
+    _title_signature.cache_clear()
+    _author_signature.cache_clear()
+    _book_query.cache_clear()
+
+class BookQuery:
+    """
+    The book we're looking for, normalized once and then scored against any
+    number of search documents in a single pass.
+
+    Scores run from 0 to about 1: title similarity (exact, subtitle-insensitive,
+    then the better of token and trigram Jaccard) weighted by author agreement,
+    plus a tie-break of at most 0.01 for popular editions.
+    """
+
+    def __init__(self, title: str, author: str = ""):
+        self.title = TitleSignature.build(title)
+        self.author = AuthorSignature.build([author]) if author else None
+
+    @classmethod
+    def build(cls, title: str, author: str = "") -> "BookQuery":
+        return _book_query(title or "", author or "")
+
+    def title_score(self, candidate: TitleSignature) -> float:
+        if not candidate.main:
+            return 0.0
+        if candidate.full == self.title.full or candidate.main == self.title.main:
+            return 1.0
+        if candidate.main == self.title.full or candidate.full == self.title.main:
+            # One side carries a subtitle the other doesn't
+            return 0.95
+        if candidate.tokens == self.title.tokens:
+            # Same words, differing only in articles and other stop words
+            return 0.95
+        return 0.9 * max(_jaccard(candidate.tokens, self.title.tokens), _jaccard(candidate.grams, self.title.grams))
+
+    def author_score(self, candidate: AuthorSignature) -> Optional[float]:
+        """1 for a shared surname, 0.5 for any shared name, 0 for none; None without a wanted author"""
+        if self.author is None or not self.author.tokens:
+            return None
+        if not candidate.tokens:
+            return 0.5  # Unknown authorship neither confirms nor contradicts
+        if self.author.surnames & candidate.surnames:
+            return 1.0
+        if self.author.tokens & candidate.tokens:
+            return 0.5
+        return 0.0
+
+    def score(self, document: Dict[str, Any]) -> float:
+        title_score = self.title_score(TitleSignature.build(document.get("title")))
+        if title_score == 0.0:
+            return 0.0
+
+        author_score = self.author_score(AuthorSignature.build(document.get("author_names") or []))
+        score = title_score if author_score is None else title_score * (0.6 + 0.4 * author_score)
+
+        users_count = document.get("users_count") or 0
+        return score + min(0.01, math.log10(users_count + 1) / 600)
+
+@lru_cache(maxsize=1024)
+def _book_query(title: str, author: str) -> BookQuery:
+    # Every search strategy and every repeat request for a book scores against the same query
+    return BookQuery(title, author)
+
+def rank_matches(title: str, author: str, documents: List[Dict[str, Any]]) -> List[Tuple[float, Dict[str, Any]]]:
+    """Score every document against the wanted title/author, best first"""
+    query = BookQuery.build(title, author)
+    scored = [(query.score(doc), doc) for doc in documents if doc and doc.get("title")]
+    scored.sort(key=lambda item: item[0], reverse=True)
+    return scored
+
+def top_match(title: str, author: str, documents: List[Dict[str, Any]]) -> Tuple[Optional[Dict[str, Any]], float]:
+    """The highest-scoring document and its score, whether or not it is good enough; (None, 0.0) without candidates"""
+    query = BookQuery.build(title, author)
+    best, best_score = None, 0.0
+    for doc in documents:
+        if doc and doc.get("title"):
+            score = query.score(doc)
+            if best is None or score > best_score:
+                best, best_score = doc, score
+    return best, best_score
+
+def best_match(
+    title: str,
+    author: str,
+    documents: List[Dict[str, Any]],
+    threshold: float = MATCH_THRESHOLD
+) -> Optional[Tuple[Dict[str, Any], float]]:
+    """The best-scoring document and its score, or None if nothing reaches the threshold"""
+    document, score = top_match(title, author, documents)
+    if document is not None and score >= threshold:
+        return document, score
+    return None
@@ -0,0 +1,662 @@
+import json
+import hashlib
+import heapq
+import logging
+import os
+import secrets
+import sqlite3
+import struct
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import time
+import aiofiles
+from threading import Lock
+
+logger = logging.getLogger(__name__)
+
+CACHE_TYPES = ("recommendations", "books", "book_aliases", "searches", "taste_profiles")
+
+# Cache format v3: fixed binary header followed by compact JSON, zlib-compressed
+# when large. Header = magic, flags, created_at and expired_at as epoch integers,
+# then an optional stale_at integer when the stale flag is set.
+CACHE_FORMAT_VERSION = "3.0"
+LEGACY_FORMAT_VERSION = "2.0"
+_V3_MAGIC = b"CRC3"
+_V3_HEADER = struct.Struct(">4sBqq")
+_V3_STALE_AT = struct.Struct(">q")
+_V3_FLAG_ZLIB = 0x01
+_V3_FLAG_STALE_AT = 0x02
+
+def encode_entry(
+    value: Any,
+    created_at: float,
+    expired_at: float,
+    compress_min_bytes: int = 16384,
+    stale_at: Optional[float] = None
+) -> bytes:
+    """Encode a JSON-compatible value as a v3 cache record"""
+    payload = json.dumps(value, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    flags = 0
+
+    if compress_min_bytes and len(payload) >= compress_min_bytes:
+        compressed = zlib.compress(payload, 1)
+        # Keep the raw payload when compression doesn't pay off
+        if len(compressed) < len(payload):
+            payload = compressed
+            flags |= _V3_FLAG_ZLIB
+
+    extension = b""
+    if stale_at is not None:
+        flags |= _V3_FLAG_STALE_AT
+        extension = _V3_STALE_AT.pack(int(stale_at))
+
+    return _V3_HEADER.pack(_V3_MAGIC, flags, int(created_at), int(expired_at)) + extension + payload
+
+def decode_entry_header(blob: bytes) -> Tuple[int, int, int]:
+    """Return (flags, created_at, expired_at) from a v3 record"""
+    if len(blob) < _V3_HEADER.size:
+        raise ValueError("Truncated cache record")
+    magic, flags, created_at, expired_at = _V3_HEADER.unpack_from(blob)
+    if magic != _V3_MAGIC:
+        raise ValueError("Not a v3 cache record")
+    return flags, created_at, expired_at
+
+def decode_entry(blob: bytes) -> Tuple[Any, int, int, Optional[int]]:
+    """Return (value, created_at, expired_at, stale_at) from a v3 record"""
+    flags, created_at, expired_at = decode_entry_header(blob)
+    offset = _V3_HEADER.size
+
+    stale_at = None
+    if flags & _V3_FLAG_STALE_AT:
+        stale_at, = _V3_STALE_AT.unpack_from(blob, offset)
+        offset += _V3_STALE_AT.size
+
+    payload = blob[offset:]
+    if flags & _V3_FLAG_ZLIB:
+        payload = zlib.decompress(payload)
+    return json.loads(payload), created_at, expired_at, stale_at
+
+@dataclass
+class CacheEntry:
+    """A single cache entry as read back from a storage backend"""
+    value: Any
+    created_at: float  # epoch seconds
+    expired_at: float  # epoch seconds
+    size: int
+    version: str = "2.0"
+    stale_at: Optional[float] = None  # soft TTL; served while refreshing until expired_at
+
+    @property
+    def is_expired(self) -> bool:
+        return time.time() > self.expired_at
+
+    @property
+    def is_stale(self) -> bool:
+        return self.stale_at is not None and time.time() > self.stale_at
+
+@dataclass
+class KeydirEntry:
+    """In-memory directory record for one cache file"""
+    size: int
+    created_at: float
+    expired_at: float
+    version: str
+    mtime_ns: int = 0
+
+class FileCacheBackend:
+    """
+    One record per entry under <cache_dir>/<cache_type>/<md5>.bin (format v3).
+
+    Legacy v2 <md5>.json documents are still read and are rewritten as v3 the
+    first time they are served.
+
+    A Bitcask-style key directory maps every file to its size and timestamps.
+    It is built once at startup, from the keydir.json sidecar manifest where it
+    is still valid and by parsing the remaining files otherwise. Misses are then
+    answered from memory and expiry sweeps walk a min-heap of deadlines instead
+    of re-reading every file. With shared=True (several processes on one
+    cache_dir) a miss also stats the cache type's directory, at most once per
+    shared_check_seconds, and rescans it when another process has changed it.
+    """
+
+    name = "file"
+    manifest_name = "keydir.json"
+
+    # Rewrites leave superseded deadlines in the heap; rebuild it past this many per live entry
+    heap_compaction_ratio = 2
+    heap_compaction_min = 1024
+
+    # Temp files older than this were left by a crashed write and are removed at startup
+    orphan_temp_seconds = 3600
+
+    # Misses within this long of the last directory check are answered from memory
+    shared_check_seconds = 1.0
+
+    def __init__(self, cache_dir: Path, compress_min_bytes: int = 16384, shared: bool = False):
+        self.cache_dir = cache_dir
+        self.compress_min_bytes = compress_min_bytes
+        self.shared = shared
+        self.manifest_path = self.cache_dir / self.manifest_name
+        self._keydir: Dict[Tuple[str, str], KeydirEntry] = {}
+        self._expiry_heap: List[Tuple[float, str, str]] = []
+        self._manifest_dirty = False
+        # Each cache type directory's mtime as of its last scan, and when it was last checked
+        self._dir_mtimes: Dict[str, int] = {}
+        self._dir_checked_at: Dict[str, float] = {}
+
+        # Create subdirectories for organization
+        for cache_type in CACHE_TYPES:
+            (self.cache_dir / cache_type).mkdir(exist_ok=True)
+
+        self._build_keydir()
+
+    def _temp_path(self, target: Path) -> Path:
+        """A temp file to write target through; unique so concurrent writers never share one"""
+        return target.with_name(f"{target.stem}.{os.getpid()}.{secrets.token_hex(4)}.tmp")
+
+    def _generate_cache_key(self, key: str) -> str:
+        """Generate a safe filename from cache key"""
+        return hashlib.md5(key.encode()).hexdigest()
+
+    def _entry_path(self, cache_type: str, safe_key: str, version: str = CACHE_FORMAT_VERSION) -> Path:
+        """Get the full path for a cache file in the given format"""
+        suffix = ".bin" if version == CACHE_FORMAT_VERSION else ".json"
+        return self.cache_dir / cache_type / f"{safe_key}{suffix}"
+
+    def _load_manifest(self) -> Dict[str, list]:
+        try:
+            with open(self.manifest_path, 'r') as f:
+                manifest = json.load(f)
+            if manifest.get('version') == 1:
+                return manifest.get('entries', {})
+        except (OSError, json.JSONDecodeError, AttributeError):
+            pass
+        return {}
+
+    def _save_manifest(self):
+        """Persist the keydir so the next startup can skip parsing unchanged files"""
+        entries = {
+            f"{cache_type}/{safe_key}": [e.size, e.created_at, e.expired_at, e.version, e.mtime_ns]
+            for (cache_type, safe_key), e in self._keydir.items()
+        }
+        temp_file = self._temp_path(self.manifest_path)
+        try:
+            with open(temp_file, 'w') as f:
+                json.dump({'version': 1, 'entries': entries}, f, separators=(',', ':'))
+            temp_file.rename(self.manifest_path)
+            self._manifest_dirty = False
+        except OSError as e:
+            print(f"Cache keydir manifest write error: {e}")
+
+    def _build_keydir(self):
+        """Scan the cache directories once, trusting the manifest for unchanged files"""
+        manifest = self._load_manifest()
+
+        # Only our own directories: cache_dir also holds the book catalog and content index
+        parsed = sum(self._scan_directory(cache_type, manifest) for cache_type in CACHE_TYPES)
+
+        if parsed or len(manifest) != len(self._keydir):
+            self._save_manifest()
+
+    def _scan_directory(self, cache_type: str, manifest: Optional[Dict[str, list]] = None) -> int:
+        """
+        Bring one cache type's keydir records in line with its files, parsing only
+        files the keydir or manifest doesn't already know. Returns how many were parsed.
+        """
+        cache_type_dir = self.cache_dir / cache_type
+        # Taken before scanning, so a write landing mid-scan shows up at the next check
+        self._dir_mtimes[cache_type] = cache_type_dir.stat().st_mtime_ns
+        manifest = manifest or {}
+        parsed = 0
+        seen = set()
+
+        # v3 files first so a leftover v2 copy of the same key is detected
+        dir_entries = sorted(os.scandir(cache_type_dir), key=lambda e: not e.name.endswith('.bin'))
+        for dir_entry in dir_entries:
+            safe_key, suffix = os.path.splitext(dir_entry.name)
+            try:
+                stat = dir_entry.stat()
+            except OSError:
+                continue  # Renamed or removed by another process since the listing
+            if suffix == '.tmp' and stat.st_mtime < time.time() - self.orphan_temp_seconds:
+                self._unlink_quietly(Path(dir_entry.path))
+                continue
+            if suffix not in ('.bin', '.json'):
+                continue
+
+            if suffix == '.json' and safe_key in seen:
+                # Already migrated to v3, the v2 document is dead weight
+                self._unlink_quietly(Path(dir_entry.path))
+                continue
+            seen.add(safe_key)
+
+            version = CACHE_FORMAT_VERSION if suffix == '.bin' else LEGACY_FORMAT_VERSION
+            tracked = self._keydir.get((cache_type, safe_key))
+            if tracked and tracked.size == stat.st_size and tracked.version == version and tracked.mtime_ns == stat.st_mtime_ns:
+                continue
+
+            known = manifest.get(f"{cache_type}/{safe_key}")
+            if known and known[0] == stat.st_size and known[3] == version and known[4] == stat.st_mtime_ns:
+                entry = KeydirEntry(*known)
+            else:
+                entry = self._parse_entry_header(Path(dir_entry.path), stat, version)
+                parsed += 1
+                if entry is None:
+                    continue
+
+            self._track(cache_type, safe_key, entry)
+
+        # Entries whose files another process removed
+        for entry_type, safe_key in [key for key in self._keydir if key[0] == cache_type and key[1] not in seen]:
+            self._untrack(entry_type, safe_key)
+        return parsed
+
+    def _sync_if_changed(self, cache_type: str) -> bool:
+        """
+        In shared mode, rescan a cache type's directory if it changed since the
+        last scan; one stat at most every shared_check_seconds. Returns whether it rescanned.
+        """
+        if not self.shared:
+            return False
+        now = time.monotonic()
+        if now - self._dir_checked_at.get(cache_type, float('-inf')) < self.shared_check_seconds:
+            return False
+        self._dir_checked_at[cache_type] = now
+
+        try:
+            mtime_ns = (self.cache_dir / cache_type).stat().st_mtime_ns
+        except OSError:
+            return False
+        if mtime_ns == self._dir_mtimes.get(cache_type):
+            return False
+        self._scan_directory(cache_type)
+        return True
+
+    def _lookup(self, cache_type: str, safe_key: str) -> Optional[KeydirEntry]:
+        """An entry's keydir record, first syncing with other processes' writes if it looks missing or expired"""
+        known = self._keydir.get((cache_type, safe_key))
+        if (known is None or time.time() > known.expired_at) and self._sync_if_changed(cache_type):
+            known = self._keydir.get((cache_type, safe_key))
+        return known
+
+    def _parse_entry_header(self, cache_file: Path, stat: os.stat_result, version: str) -> Optional[KeydirEntry]:
+        """Read a cache file to recover its keydir record, removing it if corrupted"""
+        try:
+            if version == CACHE_FORMAT_VERSION:
+                # Only the fixed-size header is needed
+                with open(cache_file, 'rb') as f:
+                    _, created_at, expired_at = decode_entry_header(f.read(_V3_HEADER.size))
+            else:
+                with open(cache_file, 'r') as f:
+                    cache_data = json.load(f)
+                created_at = datetime.fromisoformat(cache_data['created_at']).timestamp()
+                expired_at = datetime.fromisoformat(cache_data['expired_at']).timestamp()
+
+            return KeydirEntry(
+                size=stat.st_size,
+                created_at=created_at,
+                expired_at=expired_at,
+                version=version,
+                mtime_ns=stat.st_mtime_ns
+            )
+        except (json.JSONDecodeError, KeyError, ValueError, OSError, struct.error):
+            self._unlink_quietly(cache_file)
+            return None
+
+    def _track(self, cache_type: str, safe_key: str, entry: KeydirEntry):
+        previous = self._keydir.get((cache_type, safe_key))
+        self._keydir[(cache_type, safe_key)] = entry
+        self._manifest_dirty = True
+        if previous is not None and previous.expired_at == entry.expired_at:
+            return
+
+        heapq.heappush(self._expiry_heap, (entry.expired_at, cache_type, safe_key))
+        if len(self._expiry_heap) > max(self.heap_compaction_min, self.heap_compaction_ratio * len(self._keydir)):
+            self._compact_expiry_heap()
+
+    def _compact_expiry_heap(self):
+        """Drop heap records superseded by a rewrite or deletion"""
+        self._expiry_heap = [(entry.expired_at, cache_type, safe_key) for (cache_type, safe_key), entry in self._keydir.items()]
+        heapq.heapify(self._expiry_heap)
+
+    def _untrack(self, cache_type: str, safe_key: str):
+        # Heap entries are dropped lazily when they surface in a sweep
+        if self._keydir.pop((cache_type, safe_key), None) is not None:
+            self._manifest_dirty = True
+
+    async def read(self, key: str, cache_type: str) -> Optional[CacheEntry]:
+        """Read an entry, removing it if it has expired or is corrupted"""
+        safe_key = self._generate_cache_key(key)
+        known = self._lookup(cache_type, safe_key)
+        if known is None:
+            return None
+        if time.time() > known.expired_at:
+            await self._remove_entry(cache_type, safe_key)
+            return None
+
+        cache_file = self._entry_path(cache_type, safe_key, known.version)
+
+        try:
+            if known.version == CACHE_FORMAT_VERSION:
+                async with aiofiles.open(cache_file, 'rb') as f:
+                    blob = await f.read()
+                value, created_at, expired_at, stale_at = decode_entry(blob)
+                return CacheEntry(
+                    value=value,
+                    created_at=created_at,
+                    expired_at=expired_at,
+                    size=len(blob),
+                    version=CACHE_FORMAT_VERSION,
+                    stale_at=stale_at
+                )
+
+            async with aiofiles.open(cache_file, 'r') as f:
+                content = await f.read()
+                cache_data = json.loads(content)
+
+            entry = CacheEntry(
+                value=cache_data['value'],
+                created_at=datetime.fromisoformat(cache_data['created_at']).timestamp(),
+                expired_at=datetime.fromisoformat(cache_data['expired_at']).timestamp(),
+                size=len(content),
+                version=cache_data.get('version', '1.0')
+            )
+
+        except (json.JSONDecodeError, KeyError, ValueError, OSError, struct.error, zlib.error):
+            # If cache file is corrupted or gone, remove it
+            await self._remove_entry(cache_type, safe_key)
+            return None
+
+        # Migrate the v2 document to v3 now that we have it parsed. The v2 file is
+        # still valid, so a failed rewrite (disk full, permissions) keeps it for next time
+        try:
+            await self.write(key, entry.value, entry.created_at, entry.expired_at, cache_type)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Could not migrate cache entry {cache_type}/{safe_key} to v3: {e}")
+        return entry
+
+    async def write(
+        self,
+        key: str,
+        value: Any,
+        created_at: float,
+        expired_at: float,
+        cache_type: str,
+        stale_at: Optional[float] = None
+    ):
+        """Write an entry atomically in format v3"""
+        safe_key = self._generate_cache_key(key)
+        cache_file = self._entry_path(cache_type, safe_key)
+        blob = encode_entry(value, created_at, expired_at, self.compress_min_bytes, stale_at)
+
+        # Write to cache file atomically
+        temp_file = self._temp_path(cache_file)
+        try:
+            async with aiofiles.open(temp_file, 'wb') as f:
+                await f.write(blob)
+
+            # Atomic rename
+            temp_file.rename(cache_file)
+        except OSError:
+            self._unlink_quietly(temp_file)
+            raise
+
+        previous = self._keydir.get((cache_type, safe_key))
+        if previous is not None and previous.version != CACHE_FORMAT_VERSION:
+            self._unlink_quietly(self._entry_path(cache_type, safe_key, previous.version))
+
+        self._track(cache_type, safe_key, KeydirEntry(
+            size=len(blob),
+            created_at=int(created_at),
+            expired_at=int(expired_at),
+            version=CACHE_FORMAT_VERSION,
+            mtime_ns=cache_file.stat().st_mtime_ns
+        ))
+
+    async def delete(self, key: str, cache_type: str):
+        await self._remove_entry(cache_type, self._generate_cache_key(key))
+
+    async def clear(self, cache_type: Optional[str] = None):
+        for entry_type, safe_key in list(self._keydir):
+            if cache_type is None or entry_type == cache_type:
+                await self._remove_entry(entry_type, safe_key)
+
+        if cache_type is None:
+            self._expiry_heap.clear()
+        self._save_manifest()
+
+    async def _remove_entry(self, cache_type: str, safe_key: str):
+        """Remove an entry's file and keydir record"""
+        known = self._lookup(cache_type, safe_key)
+        if known is None:
+            return
+        self._unlink_quietly(self._entry_path(cache_type, safe_key, known.version))
+        self._untrack(cache_type, safe_key)
+
+    def _unlink_quietly(self, cache_file: Path):
+        """Safely remove a cache file"""
+        try:
+            cache_file.unlink()
+        except OSError:
+            pass  # File might have been removed by another process
+
+    async def cleanup_expired(self):
+        """Pop expired deadlines off the heap; only the files that are due are touched"""
+        now = time.time()
+
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            expired_at, cache_type, safe_key = heapq.heappop(self._expiry_heap)
+            known = self._keydir.get((cache_type, safe_key))
+
+            # Skip stale heap records for entries that were rewritten or deleted
+            if known is None or known.expired_at != expired_at:
+                continue
+
+            await self._remove_entry(cache_type, safe_key)
+
+        if self._manifest_dirty:
+            self._save_manifest()
+
+    async def stats(self) -> Dict[str, Any]:
+        stats = {
+            'backend': self.name,
+            'total_files': 0,
+            'total_size_bytes': 0,
+            'by_type': {},
+            'version_info': {}
+        }
+
+        for (cache_type, _), entry in self._keydir.items():
+            stats['total_files'] += 1
+            stats['total_size_bytes'] += entry.size
+
+            type_stats = stats['by_type'].setdefault(cache_type, {'files': 0, 'size_bytes': 0})
+            type_stats['files'] += 1
+            type_stats['size_bytes'] += entry.size
+            stats['version_info'][entry.version] = stats['version_info'].get(entry.version, 0) + 1
+
+        return stats
+
+    async def metadata(self, key: str, cache_type: str) -> Optional[dict]:
+        safe_key = self._generate_cache_key(key)
+        known = self._lookup(cache_type, safe_key)
+        if known is None:
+            return None
+
+        return {
+            'key': key,
+            'created_at': datetime.fromtimestamp(known.created_at).isoformat(),
+            'expired_at': datetime.fromtimestamp(known.expired_at).isoformat(),
+            'cache_type': cache_type,
+            'version': known.version,
+            'file_size': known.size,
+            'is_expired': time.time() > known.expired_at
+        }
+
+    async def close(self):
+        if self._manifest_dirty:
+            self._save_manifest()
+
+class SQLiteCacheBackend:
+    """
+    All entries in a single SQLite database running in WAL mode.
+
+    Rows are keyed by (cache_type, key) and carry an indexed expired_at column,
+    so expiry is one range DELETE and stats are one aggregate query. Values are
+    stored as v3 records; legacy v2 JSON rows are rewritten the first time they
+    are served.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, db_path: Path, compress_min_bytes: int = 16384):
+        self.db_path = db_path
+        self.compress_min_bytes = compress_min_bytes
+        self._lock = Lock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS cache_entries (
+                cache_type TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value BLOB NOT NULL,
+                created_at REAL NOT NULL,
+                expired_at REAL NOT NULL,
+                size INTEGER NOT NULL,
+                version TEXT NOT NULL,
+                stale_at REAL,
+                PRIMARY KEY (cache_type, key)
+            ) WITHOUT ROWID
+        """)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(cache_entries)")}
+        if "stale_at" not in columns:
+            self._conn.execute("ALTER TABLE cache_entries ADD COLUMN stale_at REAL")
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_cache_entries_expired_at ON cache_entries (expired_at)"
+        )
+
+    def _execute(self, sql: str, params: tuple = ()) -> list:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    async def _run(self, sql: str, params: tuple = ()) -> list:
+        return await asyncio.to_thread(self._execute, sql, params)
+
+    async def read(self, key: str, cache_type: str) -> Optional[CacheEntry]:
+        rows = await self._run(
+            "SELECT value, created_at, expired_at, size, version, stale_at FROM cache_entries "
+            "WHERE cache_type = ? AND key = ?",
+            (cache_type, key)
+        )
+        if not rows:
+            return None
+
+        content, created_at, expired_at, size, version, stale_at = rows[0]
+        if time.time() > expired_at:
+            await self.delete(key, cache_type)
+            return None
+
+        try:
+            if version == CACHE_FORMAT_VERSION:
+                value, _, _, _ = decode_entry(content)
+            else:
+                value = json.loads(content)
+                # Migrate the legacy row to v3 now that we have it parsed
+                await self.write(key, value, created_at, expired_at, cache_type)
+        except (json.JSONDecodeError, TypeError, ValueError, struct.error, zlib.error):
+            # Corrupted row, drop it
+            await self.delete(key, cache_type)
+            return None
+
+        return CacheEntry(
+            value=value,
+            created_at=created_at,
+            expired_at=expired_at,
+            size=size,
+            version=version,
+            stale_at=stale_at
+        )
+
+    async def write(
+        self,
+        key: str,
+        value: Any,
+        created_at: float,
+        expired_at: float,
+        cache_type: str,
+        stale_at: Optional[float] = None
+    ):
+        blob = encode_entry(value, created_at, expired_at, self.compress_min_bytes, stale_at)
+        await self._run(
+            "INSERT OR REPLACE INTO cache_entries "
+            "(cache_type, key, value, created_at, expired_at, size, version, stale_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                cache_type, key, blob, int(created_at), int(expired_at), len(blob), CACHE_FORMAT_VERSION,
+                int(stale_at) if stale_at is not None else None
+            )
+        )
+
+    async def delete(self, key: str, cache_type: str):
+        await self._run("DELETE FROM cache_entries WHERE cache_type = ? AND key = ?", (cache_type, key))
+
+    async def clear(self, cache_type: Optional[str] = None):
+        if cache_type:
+            await self._run("DELETE FROM cache_entries WHERE cache_type = ?", (cache_type,))
+        else:
+            await self._run("DELETE FROM cache_entries")
+
+    async def cleanup_expired(self):
+        """Expiry is a single range delete on the expired_at index"""
+        await self._run("DELETE FROM cache_entries WHERE expired_at < ?", (time.time(),))
+
+    async def stats(self) -> Dict[str, Any]:
+        rows = await self._run(
+            "SELECT cache_type, version, COUNT(*), COALESCE(SUM(size), 0) "
+            "FROM cache_entries GROUP BY cache_type, version"
+        )
+        stats = {
+            'backend': self.name,
+            'total_files': 0,
+            'total_size_bytes': 0,
+            'by_type': {},
+            'version_info': {}
+        }
+        for cache_type, version, count, size in rows:
+            stats['total_files'] += count
+            stats['total_size_bytes'] += size
+            type_stats = stats['by_type'].setdefault(cache_type, {'files': 0, 'size_bytes': 0})
+            type_stats['files'] += count
+            type_stats['size_bytes'] += size
+            stats['version_info'][version] = stats['version_info'].get(version, 0) + count
+        return stats
+
+    async def metadata(self, key: str, cache_type: str) -> Optional[dict]:
+        rows = await self._run(
+            "SELECT created_at, expired_at, size, version FROM cache_entries "
+            "WHERE cache_type = ? AND key = ?",
+            (cache_type, key)
+        )
+        if not rows:
+            return None
+
+        created_at, expired_at, size, version = rows[0]
+        return {
+            'key': key,
+            'created_at': datetime.fromtimestamp(created_at).isoformat(),
+            'expired_at': datetime.fromtimestamp(expired_at).isoformat(),
+            'cache_type': cache_type,
+            'version': version,
+            'file_size': size,
+            'is_expired': time.time() > expired_at
+        }
+
+    async def close(self):
+        with self._lock:
+            self._conn.close()
@@ -1,27 +1,158 @@
 import json
 import hashlib
-import os
+import sqlite3
+import time
+from collections import OrderedDict
 from pathlib import Path
-from datetime import datetime, timedelta
-from typing import Any, Optional
+from typing import Any, Dict, Optional, Tuple
 import asyncio
-import aiofiles
 from threading import Lock
+from app.services.cache_backends import FileCacheBackend, SQLiteCacheBackend
+from app.services.book_matching import AuthorSignature, TitleSignature, normalize_text
+
+_MISSING = object()
+
+class MemoryCacheTier:
+    """
+    Bounded in-process LRU tier that sits in front of the on-disk cache.
+
+    Entries keep the same soft and hard expiry as their disk counterpart and are evicted
+    least-recently-used first once either the entry or the byte budget is exceeded.
+    Values are shared between callers, so treat them as read-only.
+    """
+
+    def __init__(self, max_entries: int = 512, max_bytes: int = 32 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        # (cache_type, key) -> (value, expires_at, size, stale_at)
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[Any, float, int, Optional[float]]]" = OrderedDict()
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.max_bytes > 0
+
+    def get(self, key: str, cache_type: str) -> Any:
+        """Return (value, stale_at) or the _MISSING sentinel"""
+        entry = self._entries.get((cache_type, key))
+        if entry is None:
+            self.misses += 1
+            return _MISSING
+
+        value, expires_at, _, stale_at = entry
+        if time.time() > expires_at:
+            self.delete(key, cache_type)
+            self.misses += 1
+            return _MISSING
+
+        self._entries.move_to_end((cache_type, key))
+        self.hits += 1
+        return value, stale_at
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        expires_at: float,
+        size: int,
+        cache_type: str,
+        stale_at: Optional[float] = None
+    ):
+        """Insert or replace an entry, evicting LRU entries to stay within budget"""
+        if not self.enabled:
+            return
+
+        self.delete(key, cache_type)
+        if size > self.max_bytes:
+            # Too large to be worth keeping in memory; the disk copy still serves it
+            return
+
+        self._entries[(cache_type, key)] = (value, expires_at, size, stale_at)
+        self._total_bytes += size
+
+        while self._entries and (
+            len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes
+        ):
+            _, evicted = self._entries.popitem(last=False)
+            self._total_bytes -= evicted[2]
+            self.evictions += 1
+
+    def delete(self, key: str, cache_type: str):
+        entry = self._entries.pop((cache_type, key), None)
+        if entry is not None:
+            self._total_bytes -= entry[2]
+
+    def clear(self, cache_type: Optional[str] = None):
+        if cache_type is None:
+            self._entries.clear()
+            self._total_bytes = 0
+            return
+
+        for entry_key in [k for k in self._entries if k[0] == cache_type]:
+            self._total_bytes -= self._entries.pop(entry_key)[2]
+
+    def purge_expired(self):
+        """Drop every expired entry"""
+        now = time.time()
+        for entry_key in [k for k, v in self._entries.items() if now > v[1]]:
+            self._total_bytes -= self._entries.pop(entry_key)[2]
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'size_bytes': self._total_bytes,
+            'max_entries': self.max_entries,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions
+        }
 
 class CacheService:
-    def __init__(self, cache_dir: str = "cache"):
+    def __init__(
+        self,
+        cache_dir: str = "cache",
+        memory_max_entries: int = 512,
+        memory_max_bytes: int = 32 * 1024 * 1024,
+        backend: str = "file",
+        sqlite_file: str = "cache.db",
+        compress_min_bytes: int = 16384,
+        memory_type_max_entries: Optional[Dict[str, int]] = None,
+        shared: bool = False
+    ):
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(exist_ok=True)
         self._lock = Lock()
         self._cleanup_started = False
+        self.memory = MemoryCacheTier(memory_max_entries, memory_max_bytes)
+        # Capped types get a pool of their own, so a burst of them can't evict the
+        # others; its byte budget is the same share of the total as its entries
+        self.type_memory = {
+            cache_type: MemoryCacheTier(
+                max_entries,
+                memory_max_bytes * max_entries // memory_max_entries if memory_max_entries > 0 else 0
+            )
+            for cache_type, max_entries in (memory_type_max_entries or {}).items()
+        }
         
-        # Create subdirectories for organization
-        (self.cache_dir / "recommendations").mkdir(exist_ok=True)
-        (self.cache_dir / "books").mkdir(exist_ok=True)
-        (self.cache_dir / "taste_profiles").mkdir(exist_ok=True)
+        # Storage backend selected by config; both expose the same async interface
+        if backend == "sqlite":
+            self.backend = SQLiteCacheBackend(self.cache_dir / sqlite_file, compress_min_bytes)
+        elif backend == "file":
+            self.backend = FileCacheBackend(self.cache_dir, compress_min_bytes, shared)
+        else:
+            raise ValueError(f"Unknown cache backend: {backend}")
         
         # Note: Cleanup will be started on first cache operation
     
+    def _memory_for(self, cache_type: str) -> MemoryCacheTier:
+        return self.type_memory.get(cache_type, self.memory)
+
     def _json_serializer(self, obj):
         """Custom JSON serializer for Pydantic models and other objects"""
         if hasattr(obj, 'model_dump'):
@@ -37,15 +168,6 @@ class CacheService:
             # Fallback to string representation
             return str(obj)
     
-    def _generate_cache_key(self, key: str) -> str:
-        """Generate a safe filename from cache key"""
-        return hashlib.md5(key.encode()).hexdigest()
-    
-    def _get_cache_file_path(self, key: str, cache_type: str = "recommendations") -> Path:
-        """Get the full path for a cache file"""
-        safe_key = self._generate_cache_key(key)
-        return self.cache_dir / cache_type / f"{safe_key}.json"
-    
     async def _ensure_cleanup_started(self):
         """Start cleanup task if not already started"""
         if not self._cleanup_started:
@@ -57,142 +179,94 @@ class CacheService:
                 pass
 
     async def get(self, key: str, cache_type: str = "recommendations") -> Optional[Any]:
-        """Get cached value if it exists and hasn't expired"""
+        """Get cached value if it exists and hasn't passed its (soft) expiry"""
+        value, is_stale = await self.get_with_staleness(key, cache_type)
+        return None if is_stale else value
+
+    async def get_with_staleness(self, key: str, cache_type: str = "recommendations") -> Tuple[Optional[Any], bool]:
+        """
+        Get a cached value together with whether it is past its soft TTL.
+        Stale values are still valid until the hard expiry and should be
+        served while the caller refreshes them in the background.
+        """
         await self._ensure_cleanup_started()
-        cache_file = self._get_cache_file_path(key, cache_type)
+
+        # Hot keys are answered from memory without touching the backend
+        cached = self._memory_for(cache_type).get(key, cache_type)
+        if cached is not _MISSING:
+            value, stale_at = cached
+            return value, stale_at is not None and time.time() > stale_at
+
+        entry = await self.backend.read(key, cache_type)
+        if entry is None:
+            return None, False
         
-        try:
-            if not cache_file.exists():
-                return None
-            
-            async with aiofiles.open(cache_file, 'r') as f:
-                content = await f.read()
-                cache_data = json.loads(content)
-            
-            # Check if cache has expired
-            expired_at = datetime.fromisoformat(cache_data['expired_at'])
-            if datetime.now() > expired_at:
-                # Remove expired cache file
-                await self._remove_cache_file(cache_file)
-                return None
-            
-            return cache_data['value']
-            
-        except (json.JSONDecodeError, KeyError, ValueError, OSError):
-            # If cache file is corrupted, remove it
-            await self._remove_cache_file(cache_file)
-            return None
+        # Promote to the memory tier with the same expiry as the stored entry
+        self._memory_for(cache_type).set(key, entry.value, entry.expired_at, entry.size, cache_type, entry.stale_at)
+        return entry.value, entry.is_stale
     
-    async def set(self, key: str, value: Any, expire: int = 3600, cache_type: str = "recommendations"):
-        """Set cached value with expiration"""
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        expire: int = 3600,
+        cache_type: str = "recommendations",
+        stale_grace: int = 0
+    ):
+        """
+        Set cached value with expiration. With a stale_grace the entry goes stale
+        after `expire` seconds but stays servable for `stale_grace` more seconds.
+        """
         await self._ensure_cleanup_started()
-        cache_file = self._get_cache_file_path(key, cache_type)
         
         try:
             # Calculate expiration time
-            expired_at = datetime.now() + timedelta(seconds=expire)
+            created_at = time.time()
+            stale_at = created_at + expire if stale_grace > 0 else None
+            expired_at = created_at + expire + max(stale_grace, 0)
             
-            cache_data = {
-                'value': value,
-                'created_at': datetime.now().isoformat(),
-                'expired_at': expired_at.isoformat(),
-                'key': key,  # Store original key for debugging
-                'cache_type': cache_type,
-                'version': '2.0'  # Version for cache format
-            }
+            # Serialize once: the JSON form is what the memory tier hands back,
+            # so hits from memory and from the backend look identical to callers
+            serialized_value = json.dumps(value, default=self._json_serializer)
+            plain_value = json.loads(serialized_value)
             
-            # Write to cache file atomically
-            temp_file = cache_file.with_suffix('.tmp')
-            async with aiofiles.open(temp_file, 'w') as f:
-                await f.write(json.dumps(cache_data, default=self._json_serializer, indent=2))
+            await self.backend.write(key, plain_value, created_at, expired_at, cache_type, stale_at)
             
-            # Atomic rename
-            temp_file.rename(cache_file)
+            # Write through to the memory tier once the stored copy is in place
+            self._memory_for(cache_type).set(key, plain_value, expired_at, len(serialized_value), cache_type, stale_at)
             
-        except (OSError, TypeError, ValueError) as e:
+        except (OSError, TypeError, ValueError, sqlite3.Error) as e:
             # Log error but don't fail the request
             print(f"Cache write error for key '{key}': {e}")
     
     async def delete(self, key: str, cache_type: str = "recommendations"):
         """Delete a specific cache entry"""
-        cache_file = self._get_cache_file_path(key, cache_type)
-        await self._remove_cache_file(cache_file)
+        self._memory_for(cache_type).delete(key, cache_type)
+        await self.backend.delete(key, cache_type)
     
     async def clear_all(self, cache_type: Optional[str] = None):
         """Clear all cache entries, optionally filtered by type"""
-        if cache_type:
-            cache_dir = self.cache_dir / cache_type
-            if cache_dir.exists():
-                for cache_file in cache_dir.glob("*.json"):
-                    await self._remove_cache_file(cache_file)
-        else:
-            # Clear all cache types
-            for cache_file in self.cache_dir.rglob("*.json"):
-                await self._remove_cache_file(cache_file)
-    
-    async def _remove_cache_file(self, cache_file: Path):
-        """Safely remove a cache file"""
-        try:
-            if cache_file.exists():
-                cache_file.unlink()
-        except OSError:
-            pass  # File might have been removed by another process
+        self.memory.clear(cache_type)
+        for tier in self.type_memory.values():
+            tier.clear(cache_type)
+        await self.backend.clear(cache_type)
     
     async def _cleanup_expired_cache(self):
-        """Background task to clean up expired cache files"""
+        """Background task to clean up expired cache entries"""
+        self.memory.purge_expired()
+        for tier in self.type_memory.values():
+            tier.purge_expired()
         try:
-            current_time = datetime.now()
-            
-            for cache_file in self.cache_dir.rglob("*.json"):
-                try:
-                    async with aiofiles.open(cache_file, 'r') as f:
-                        content = await f.read()
-                        cache_data = json.loads(content)
-                    
-                    expired_at = datetime.fromisoformat(cache_data['expired_at'])
-                    if current_time > expired_at:
-                        await self._remove_cache_file(cache_file)
-                        
-                except (json.JSONDecodeError, KeyError, ValueError, OSError):
-                    # Remove corrupted cache files
-                    await self._remove_cache_file(cache_file)
-                    
+            await self.backend.cleanup_expired()
         except Exception as e:
             print(f"Cache cleanup error: {e}")
     
     async def get_cache_stats(self) -> dict:
         """Get cache statistics for monitoring"""
         try:
-            stats = {
-                'total_files': 0,
-                'total_size_bytes': 0,
-                'by_type': {},
-                'version_info': {}
-            }
-            
-            for cache_file in self.cache_dir.rglob("*.json"):
-                stats['total_files'] += 1
-                file_size = cache_file.stat().st_size
-                stats['total_size_bytes'] += file_size
-                
-                # Categorize by parent directory
-                cache_type = cache_file.parent.name
-                if cache_type not in stats['by_type']:
-                    stats['by_type'][cache_type] = {'files': 0, 'size_bytes': 0}
-                
-                stats['by_type'][cache_type]['files'] += 1
-                stats['by_type'][cache_type]['size_bytes'] += file_size
-                
-                # Check cache version
-                try:
-                    async with aiofiles.open(cache_file, 'r') as f:
-                        content = await f.read()
-                        cache_data = json.loads(content)
-                        version = cache_data.get('version', '1.0')
-                        stats['version_info'][version] = stats['version_info'].get(version, 0) + 1
-                except:
-                    stats['version_info']['unknown'] = stats['version_info'].get('unknown', 0) + 1
-            
+            stats = await self.backend.stats()
+            stats['memory'] = self.memory.stats()
+            stats['memory_by_type'] = {cache_type: tier.stats() for cache_type, tier in self.type_memory.items()}
             return stats
             
         except Exception as e:
@@ -200,29 +274,15 @@ class CacheService:
 
     async def get_cache_metadata(self, key: str, cache_type: str = "recommendations") -> Optional[dict]:
         """Get metadata about a cached item without loading the full value"""
-        cache_file = self._get_cache_file_path(key, cache_type)
-        
         try:
-            if not cache_file.exists():
-                return None
-            
-            async with aiofiles.open(cache_file, 'r') as f:
-                content = await f.read()
-                cache_data = json.loads(content)
-            
-            return {
-                'key': cache_data.get('key'),
-                'created_at': cache_data.get('created_at'),
-                'expired_at': cache_data.get('expired_at'),
-                'cache_type': cache_data.get('cache_type'),
-                'version': cache_data.get('version', '1.0'),
-                'file_size': cache_file.stat().st_size,
-                'is_expired': datetime.now() > datetime.fromisoformat(cache_data['expired_at'])
-            }
-            
-        except (json.JSONDecodeError, KeyError, ValueError, OSError):
+            return await self.backend.metadata(key, cache_type)
+        except sqlite3.Error:
             return None
 
+    async def close(self):
+        """Release backend resources"""
+        await self.backend.close()
+
 # Helper function to create cache key for recommendations
 def create_recommendation_cache_key(movies: list, preferences: dict = None, recommendation_type: str = "unified") -> str:
     """Create a consistent cache key for movie recommendations"""
@@ -241,12 +301,64 @@ def create_recommendation_cache_key(movies: list, preferences: dict = None, reco
     cache_string = json.dumps(cache_data, sort_keys=True)
     return f"movies_v2:{hashlib.md5(cache_string.encode()).hexdigest()}"
 
+# Helper function to create cache key for one movie's recommendations
+def create_movie_recommendation_cache_key(movie: str, preferences: dict = None) -> str:
+    """Cache key for GPT recommendations generated from a single movie, before enrichment"""
+    cache_data = {
+        'movie': movie.lower().strip(),
+        'preferences': preferences or {},
+        'version': '1.0'
+    }
+    
+    cache_string = json.dumps(cache_data, sort_keys=True)
+    return f"movie_v1:{hashlib.md5(cache_string.encode()).hexdigest()}"
+
+# Helper function to create cache key for one movie's ranked books, used for rank fusion
+def create_movie_books_cache_key(movie: str, preferences: dict = None) -> str:
+    """Cache key for the ranked books past GPT runs recommended for a movie"""
+    cache_data = {
+        'movie': movie.lower().strip(),
+        'preferences': preferences or {},
+        'type': 'ranked_books',
+        'version': '1.0'
+    }
+    
+    cache_string = json.dumps(cache_data, sort_keys=True)
+    return f"movie_books_v1:{hashlib.md5(cache_string.encode()).hexdigest()}"
+
+# Helper function to create cache key for a movie's TMDB overview
+def create_movie_overview_cache_key(movie: str) -> str:
+    """Cache key for the plot overview the content recommender scores books against"""
+    return f"movie_overview_v1:{hashlib.md5(normalize_text(movie).encode()).hexdigest()}"
+
 # Helper function to create cache key for book metadata
 def create_book_cache_key(title: str, author: str = "") -> str:
     """Create a consistent cache key for book metadata"""
     book_key = f"{title.lower().strip()}:{author.lower().strip()}"
     return f"book_v2:{hashlib.md5(book_key.encode()).hexdigest()}"
 
+# Helper function to create cache key for book metadata by Hardcover id
+def create_book_id_cache_key(hardcover_id: int) -> str:
+    """Cache key for book metadata once the book's canonical Hardcover id is known"""
+    return f"book_id_v1:{int(hardcover_id)}"
+
+# Helper function to create the alias key a (title, author) spelling resolves through
+def create_book_alias_key(title: str, author: str = "") -> str:
+    """
+    Alias key for one spelling of a book. Series markers, subtitle separators,
+    punctuation, accents and initials are normalized away, so close variants
+    ("Dune (Dune Chronicles #1)", "Ursula Le Guin") share an alias.
+    """
+    title_signature = TitleSignature.build(title)
+    author_signature = AuthorSignature.build([author])
+    alias = f"{title_signature.full}|{' '.join(sorted(author_signature.tokens))}"
+    return f"book_alias_v1:{hashlib.md5(alias.encode()).hexdigest()}"
+
+# Helper function to create cache key for raw Hardcover search results
+def create_search_cache_key(query: str) -> str:
+    """Cache key for a search query's documents; case and punctuation don't matter"""
+    return f"search_v1:{hashlib.md5(normalize_text(query).encode()).hexdigest()}"
+
 # Helper function to create cache key for taste profiles
 def create_taste_profile_cache_key(movies: list, preferences: dict = None) -> str:
     """Create a consistent cache key for taste profiles"""
@@ -0,0 +1,184 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, Dict
+from app.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose breaker is open"""
+
+    def __init__(self, name: str):
+        super().__init__(f"{name} circuit breaker is open")
+        self.name = name
+
+class BreakerCall:
+    """Handle for one guarded call; set failed for errors that don't raise, like a 5xx response"""
+    __slots__ = ("failed",)
+
+    def __init__(self):
+        self.failed = False
+
+class CircuitBreaker:
+    """
+    Per-upstream circuit breaker driven by the failure rate over the last
+    `window` calls, where calls slower than slow_call_seconds count as failures.
+
+    Once open, calls are rejected without touching the network until
+    open_seconds have passed; then a single probe call is let through
+    (half-open) and its outcome closes or re-opens the breaker.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        slow_call_seconds: float,
+        failure_rate: float = 0.5,
+        window: int = 20,
+        min_calls: int = 5,
+        open_seconds: float = 30.0
+    ):
+        self.name = name
+        self.slow_call_seconds = slow_call_seconds
+        self.failure_rate_threshold = failure_rate
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self.state = CLOSED
+        self._outcomes: deque = deque(maxlen=window)  # True for a failed or slow call
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self.rejected = 0
+        self.times_opened = 0
+
+    @property
+    def is_open(self) -> bool:
+        """True while calls would be rejected; doesn't claim the half-open probe"""
+        return self.state == OPEN and time.monotonic() - self._opened_at < self.open_seconds
+
+    def allow_request(self) -> bool:
+        if self.state == OPEN:
+            if time.monotonic() - self._opened_at < self.open_seconds:
+                self.rejected += 1
+                return False
+            self.state = HALF_OPEN
+            self._probe_in_flight = False
+            logger.info(f"{self.name} circuit breaker half-open; sending a probe call")
+
+        if self.state == HALF_OPEN:
+            if self._probe_in_flight:
+                self.rejected += 1
+                return False
+            self._probe_in_flight = True
+
+        return True
+
+    def record_success(self, latency: float):
+        if latency > self.slow_call_seconds:
+            self.record_failure()
+            return
+
+        if self.state == HALF_OPEN:
+            self._close()
+            return
+        self._outcomes.append(False)
+
+    def record_failure(self):
+        if self.state == HALF_OPEN:
+            self._open()
+            return
+
+        self._outcomes.append(True)
+        if len(self._outcomes) >= self.min_calls and self.failure_rate >= self.failure_rate_threshold:
+            self._open()
+
+    def release(self):
+        """Give back a half-open probe that ended without a verdict (e.g. cancelled)"""
+        if self.state == HALF_OPEN:
+            self._probe_in_flight = False
+
+    @property
+    def failure_rate(self) -> float:
+        return sum(self._outcomes) / len(self._outcomes) if self._outcomes else 0.0
+
+    def _open(self):
+        self.state = OPEN
+        self._opened_at = time.monotonic()
+        self._outcomes.clear()
+        self.times_opened += 1
+        logger.warning(f"{self.name} circuit breaker opened; failing fast for {self.open_seconds:.0f}s")
+
+    def _close(self):
+        self.state = CLOSED
+        self._outcomes.clear()
+        self._probe_in_flight = False
+        logger.info(f"{self.name} circuit breaker closed")
+
+    @asynccontextmanager
+    async def guard(self):
+        """
+        Run a call through the breaker: raises CircuitOpenError when it is open,
+        and records exceptions and slow calls as failures. Cancellation (or a
+        consumer closing a stream mid-call) counts as neither, so an abandoned
+        hedge doesn't skew the failure rate.
+        """
+        if not self.allow_request():
+            raise CircuitOpenError(self.name)
+
+        call = BreakerCall()
+        start = time.monotonic()
+        try:
+            yield call
+        except (asyncio.CancelledError, GeneratorExit):
+            self.release()
+            raise
+        except Exception:
+            self.record_failure()
+            raise
+
+        if call.failed:
+            self.record_failure()
+        else:
+            self.record_success(time.monotonic() - start)
+
+    def stats(self) -> Dict[str, Any]:
+        # Report an open breaker whose cool-down has passed as the half-open it will become
+        state = HALF_OPEN if self.state == OPEN and not self.is_open else self.state
+        return {
+            'state': state,
+            'failure_rate': round(self.failure_rate, 3),
+            'window_calls': len(self._outcomes),
+            'rejected': self.rejected,
+            'times_opened': self.times_opened,
+            'retry_in_seconds': round(max(0.0, self.open_seconds - (time.monotonic() - self._opened_at)), 1) if state == OPEN else 0.0
+        }
+
+def _build_breaker(name: str, slow_call_seconds: float) -> CircuitBreaker:
+    return CircuitBreaker(
+        name,
+        slow_call_seconds=slow_call_seconds,
+        failure_rate=settings.circuit_breaker_failure_rate,
+        window=settings.circuit_breaker_window,
+        min_calls=settings.circuit_breaker_min_calls,
+        open_seconds=settings.circuit_breaker_open_seconds
+    )
+
+# One breaker per upstream, shared by every request in the process
+breakers: Dict[str, CircuitBreaker] = {
+    "openai": _build_breaker("openai", settings.openai_slow_call_seconds),
+    "hardcover": _build_breaker("hardcover", settings.hardcover_slow_call_seconds),
+    "tmdb": _build_breaker("tmdb", settings.tmdb_slow_call_seconds)
+}
+
+def get_breaker(name: str) -> CircuitBreaker:
+    return breakers[name]
+
+def breaker_states() -> Dict[str, Dict[str, Any]]:
+    """Snapshot of every breaker for /health"""
+    return {name: breaker.stats() for name, breaker in breakers.items()}
@@ -0,0 +1,339 @@
+import argparse
+import asyncio
+import json
+import math
+import shutil
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+import numpy as np
+
+from app.services.book_matching import STOP_WORDS, normalize_text
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Bumped whenever the on-disk layout changes; older indexes are ignored until rebuilt
+INDEX_VERSION = 1
+
+# Terms in fewer books than this are typos and proper names, in more than this
+# share of books they carry no signal
+MIN_DOCUMENT_FREQUENCY = 2
+MAX_DOCUMENT_SHARE = 0.5
+MAX_TERMS = 50000
+
+# A genre tag counts as this many occurrences of its words in the description
+GENRE_WEIGHT = 2
+
+# Common English words beyond the title stop words; descriptions are prose
+ENGLISH_STOP_WORDS = STOP_WORDS | frozenset("""
+    about after again against all also am are as be because been before being between both but can
+    could did do does doing down during each few from further had has have having he her here hers
+    herself him himself his how if into is it its itself just more most my myself no nor not now
+    off once only or other our ours out over own same she should so some such than that their theirs
+    them themselves then there these they this those through too under until up very was we were
+    what when where which while who whom why will would you your yours yourself one two new first
+    story novel book author series life world
+""".split())
+
+# Used by `harvest` when no queries are given
+DEFAULT_HARVEST_QUERIES = (
+    "science fiction", "fantasy", "mystery", "thriller", "crime", "horror", "romance",
+    "historical fiction", "literary fiction", "dystopian", "adventure", "war", "biography",
+    "comedy", "coming of age", "psychological thriller", "space opera", "magical realism"
+)
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lowercase content words of a text, without stop words, numbers or very short words"""
+    return [
+        token for token in normalize_text(text).split()
+        if len(token) > 2 and token not in ENGLISH_STOP_WORDS and not token.isdigit()
+    ]
+
+def _genre_names(metadata: Dict[str, Any]) -> List[str]:
+    return [genre if isinstance(genre, str) else str(genre.get("name", "")) for genre in metadata.get("genres") or []]
+
+def _document_terms(metadata: Dict[str, Any]) -> Counter:
+    terms = Counter(tokenize(metadata.get("description")))
+    terms.update(tokenize(metadata.get("subtitle")))
+    for genre in _genre_names(metadata):
+        for token in tokenize(genre):
+            terms[token] += GENRE_WEIGHT
+    return terms
+
+class ContentMatch(NamedTuple):
+    score: float
+    book: Dict[str, Any]
+    movie: str
+    terms: List[str]
+
+def build_index(books: Iterable[Dict[str, Any]], index_dir: Path) -> Dict[str, Any]:
+    """
+    Write a TF-IDF index of the books' descriptions and genres to index_dir.
+
+    The matrix is stored term-major (the postings of each term are contiguous)
+    as three .npy arrays, so a query only reads the rows of its own terms and
+    the files can be memory-mapped. Book rows are unit length, so summing
+    query-weighted postings gives cosine similarity.
+    """
+    documents = []
+    for metadata in books:
+        if metadata.get("title") and metadata.get("author"):
+            terms = _document_terms(metadata)
+            if terms:
+                documents.append((metadata, terms))
+    if not documents:
+        raise ValueError("No books with a description or genres to index")
+
+    document_frequency = Counter(term for _, terms in documents for term in terms)
+    max_frequency = max(MIN_DOCUMENT_FREQUENCY, int(len(documents) * MAX_DOCUMENT_SHARE))
+    vocabulary = sorted(
+        (term for term, count in document_frequency.items() if MIN_DOCUMENT_FREQUENCY <= count <= max_frequency),
+        key=lambda term: (-document_frequency[term], term)
+    )[:MAX_TERMS]
+    vocabulary.sort()
+    columns = {term: column for column, term in enumerate(vocabulary)}
+    idf = np.array(
+        [math.log((1 + len(documents)) / (1 + document_frequency[term])) + 1 for term in vocabulary],
+        dtype=np.float32
+    )
+
+    postings: List[List[tuple]] = [[] for _ in vocabulary]
+    indexed_books = []
+    genre_rows: Dict[str, List[int]] = {}
+    for metadata, terms in documents:
+        weights = {
+            columns[term]: (1 + math.log(count)) * idf[columns[term]]
+            for term, count in terms.items() if term in columns
+        }
+        norm = math.sqrt(sum(weight * weight for weight in weights.values()))
+        if not norm:
+            continue
+        row = len(indexed_books)
+        indexed_books.append(metadata)
+        for column, weight in weights.items():
+            postings[column].append((row, weight / norm))
+        for genre in {normalize_text(genre) for genre in _genre_names(metadata)}:
+            genre_rows.setdefault(genre, []).append(row)
+
+    indptr = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum([len(entries) for entries in postings])
+    rows = np.fromiter((row for entries in postings for row, _ in entries), dtype=np.int32, count=int(indptr[-1]))
+    weights = np.fromiter((weight for entries in postings for _, weight in entries), dtype=np.float32, count=int(indptr[-1]))
+
+    # Written beside the live index and swapped in, so a running server never sees half an index
+    staging = index_dir.with_name(index_dir.name + ".building")
+    shutil.rmtree(staging, ignore_errors=True)
+    staging.mkdir(parents=True)
+    np.save(staging / "indptr.npy", indptr)
+    np.save(staging / "rows.npy", rows)
+    np.save(staging / "weights.npy", weights)
+    np.save(staging / "idf.npy", idf)
+    with open(staging / "terms.json", "w", encoding="utf-8") as f:
+        json.dump(vocabulary, f)
+    # One JSON record per line plus their byte offsets, so a server decodes only the books it returns
+    book_offsets = np.zeros(len(indexed_books) + 1, dtype=np.int64)
+    with open(staging / "books.jsonl", "wb") as f:
+        for row, metadata in enumerate(indexed_books):
+            f.write(json.dumps(metadata).encode("utf-8") + b"\n")
+            book_offsets[row + 1] = f.tell()
+    np.save(staging / "book_offsets.npy", book_offsets)
+    genres = sorted(genre_rows)
+    np.save(staging / "genre_indptr.npy", np.cumsum([0] + [len(genre_rows[genre]) for genre in genres], dtype=np.int64))
+    np.save(staging / "genre_rows.npy", np.fromiter((row for genre in genres for row in genre_rows[genre]), dtype=np.int32))
+    with open(staging / "genres.json", "w", encoding="utf-8") as f:
+        json.dump(genres, f)
+    manifest = {
+        "version": INDEX_VERSION,
+        "books": len(indexed_books),
+        "terms": len(vocabulary),
+        "postings": int(indptr[-1]),
+        "built_at": time.time()
+    }
+    with open(staging / "manifest.json", "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+
+    previous = index_dir.with_name(index_dir.name + ".previous")
+    shutil.rmtree(previous, ignore_errors=True)
+    if index_dir.exists():
+        index_dir.rename(previous)
+    staging.rename(index_dir)
+    shutil.rmtree(previous, ignore_errors=True)
+    return manifest
+
+class ContentIndex:
+    """
+    Content-based book recommender over a prebuilt TF-IDF index. The matrix
+    arrays and book records are memory-mapped, so startup costs the vocabulary
+    only; a query scores every book with one vectorized pass per query term
+    and decodes just the books it returns.
+    """
+
+    def __init__(self, index_dir: Path):
+        started = time.perf_counter()
+        with open(index_dir / "manifest.json", encoding="utf-8") as f:
+            self.manifest = json.load(f)
+        if self.manifest.get("version") != INDEX_VERSION:
+            raise ValueError(f"Content index version {self.manifest.get('version')} needs a rebuild")
+
+        # Plain ndarray views of the mappings: slicing an np.memmap costs more than the arithmetic
+        self.indptr = np.load(index_dir / "indptr.npy")
+        self.rows = np.asarray(np.load(index_dir / "rows.npy", mmap_mode="r"))
+        self.weights = np.asarray(np.load(index_dir / "weights.npy", mmap_mode="r"))
+        self.idf = np.load(index_dir / "idf.npy")
+        with open(index_dir / "terms.json", encoding="utf-8") as f:
+            self.terms: List[str] = json.load(f)
+        self.columns = {term: column for column, term in enumerate(self.terms)}
+        self.book_count = int(self.manifest["books"])
+        self.book_offsets = np.asarray(np.load(index_dir / "book_offsets.npy", mmap_mode="r"))
+        self.book_records = np.asarray(np.memmap(index_dir / "books.jsonl", dtype=np.uint8, mode="r")) if self.book_count else None
+        self.genre_indptr = np.load(index_dir / "genre_indptr.npy")
+        self.genre_rows = np.asarray(np.load(index_dir / "genre_rows.npy", mmap_mode="r"))
+        with open(index_dir / "genres.json", encoding="utf-8") as f:
+            self.genre_columns = {genre: column for column, genre in enumerate(json.load(f))}
+        self.load_seconds = time.perf_counter() - started
+
+    @classmethod
+    def load(cls, index_dir: Path) -> Optional["ContentIndex"]:
+        """The index in index_dir, or None if it hasn't been built or is unreadable"""
+        if not (index_dir / "manifest.json").exists():
+            return None
+        try:
+            return cls(index_dir)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Content index at {index_dir} not loaded: {e}")
+            return None
+
+    def query_vector(self, text: str) -> Dict[int, float]:
+        """Unit TF-IDF vector of a text over the index vocabulary, as {column: weight}"""
+        counts = Counter(token for token in tokenize(text) if token in self.columns)
+        vector = {self.columns[term]: (1 + math.log(count)) * float(self.idf[self.columns[term]]) for term, count in counts.items()}
+        norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+        return {column: weight / norm for column, weight in vector.items()} if norm else {}
+
+    def scores(self, vector: Dict[int, float]) -> np.ndarray:
+        """Cosine similarity of every book to a query vector"""
+        scores = np.zeros(self.book_count, dtype=np.float32)
+        for column, weight in vector.items():
+            start, end = self.indptr[column], self.indptr[column + 1]
+            # A term's postings hold each book at most once, so fancy-index += is safe
+            scores[self.rows[start:end]] += weight * self.weights[start:end]
+        return scores
+
+    def book(self, row: int) -> Dict[str, Any]:
+        """Metadata of the book in a row, decoded from its line of books.jsonl"""
+        return json.loads(self.book_records[self.book_offsets[row]:self.book_offsets[row + 1]].tobytes())
+
+    def _genre_rows(self, genres: Iterable[str]) -> np.ndarray:
+        """Rows of the books tagged with any of the genres"""
+        columns = [self.genre_columns[genre] for genre in {normalize_text(genre) for genre in genres} if genre in self.genre_columns]
+        if not columns:
+            return np.empty(0, dtype=np.int32)
+        return np.concatenate([self.genre_rows[self.genre_indptr[column]:self.genre_indptr[column + 1]] for column in columns])
+
+    def _shared_terms(self, vector: Dict[int, float], row: int, limit: int = 3) -> List[str]:
+        contributions = []
+        for column, weight in vector.items():
+            start, end = self.indptr[column], self.indptr[column + 1]
+            position = start + np.searchsorted(self.rows[start:end], row)
+            if position < end and self.rows[position] == row:
+                contributions.append((weight * float(self.weights[position]), self.terms[column]))
+        return [term for _, term in sorted(contributions, reverse=True)[:limit]]
+
+    def recommend(
+        self,
+        movie_texts: Dict[str, str],
+        count: int = 3,
+        exclude_genres: Iterable[str] = (),
+        min_score: float = 0.0
+    ) -> List[ContentMatch]:
+        """
+        The books closest to a set of movies, each movie counting equally. Every
+        match names the movie it is closest to and the terms it shares with it.
+        """
+        vectors = {movie: vector for movie, text in movie_texts.items() if (vector := self.query_vector(text))}
+        if not vectors or not self.book_count:
+            return []
+
+        per_movie = np.stack([self.scores(vector) for vector in vectors.values()])
+        combined = per_movie.mean(axis=0)
+        combined[self._genre_rows(exclude_genres)] = -1.0
+
+        count = min(count, len(combined))
+        top = np.argpartition(combined, len(combined) - count)[len(combined) - count:]
+        top = top[np.argsort(combined[top])[::-1]]
+
+        movies = list(vectors)
+        matches = []
+        for row in top:
+            if combined[row] < min_score or combined[row] <= 0:
+                break
+            movie = movies[int(np.argmax(per_movie[:, row]))]
+            matches.append(ContentMatch(
+                score=float(combined[row]),
+                book=self.book(int(row)),
+                movie=movie,
+                terms=self._shared_terms(vectors[movie], int(row))
+            ))
+        return matches
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "books": self.manifest["books"],
+            "terms": self.manifest["terms"],
+            "postings": self.manifest["postings"],
+            "built_at": self.manifest["built_at"],
+            "load_ms": round(self.load_seconds * 1000, 1)
+        }
+
+async def harvest(catalog, queries: Iterable[str], per_query: int = 20) -> int:
+    """Search Hardcover for each query and add every book with a description or genres to the catalog"""
+    from app.services.hardcover_service import HardcoverService
+
+    hardcover_service = HardcoverService()
+    added = 0
+    for query in queries:
+        for metadata in await hardcover_service.search_books_by_themes([query], limit=per_query):
+            if (metadata.get("description") or metadata.get("genres")) and await catalog.add(metadata):
+                added += 1
+    return added
+
+def main():
+    from app.config import settings
+    from app.services.book_catalog import BookCatalog
+
+    parser = argparse.ArgumentParser(description="Build the content-based recommendation index")
+    parser.add_argument("--db", default=str(Path(settings.cache_dir) / settings.book_catalog_file))
+    parser.add_argument("--index", default=str(Path(settings.cache_dir) / settings.content_index_dir))
+    commands = parser.add_subparsers(dest="command", required=True)
+    harvest_parser = commands.add_parser("harvest", help="Add books found by Hardcover searches to the book catalog")
+    harvest_parser.add_argument("queries", nargs="*", help="Search queries (default: a list of common genres)")
+    harvest_parser.add_argument("--per-query", type=int, default=20)
+    commands.add_parser("build", help="Build the index from every book in the catalog")
+    commands.add_parser("stats", help="Show the size of the built index")
+    args = parser.parse_args()
+
+    Path(args.db).parent.mkdir(parents=True, exist_ok=True)
+    if args.command == "stats":
+        index = ContentIndex.load(Path(args.index))
+        print(json.dumps(index.stats() if index else None, indent=2))
+        return
+
+    catalog = BookCatalog(Path(args.db))
+    try:
+        if args.command == "harvest":
+            queries = args.queries or DEFAULT_HARVEST_QUERIES
+            print(f"Added {asyncio.run(harvest(catalog, queries, args.per_query))} books to {args.db}")
+        else:
+            try:
+                manifest = build_index(catalog.all_books(), Path(args.index))
+            except ValueError as e:
+                parser.exit(1, f"{e}; fill the catalog first with `harvest` or `book_catalog import`\n")
+            print(f"Indexed {manifest['books']} books over {manifest['terms']} terms into {args.index}")
+    finally:
+        catalog.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+import itertools
+import json
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, List, NamedTuple, Optional, Tuple
+from app.models.response_models import BookRecommendation
+
+# Shipped catalog; FALLBACK_CATALOG_FILE points at a larger one
+DEFAULT_CATALOG_PATH = Path(__file__).resolve().parent.parent / "data" / "fallback_catalog.json"
+
+# Books taken from each matched theme before moving on to the next
+BOOKS_PER_THEME = 2
+
+# Taste profile fields used when no theme rule matches
+DEFAULT_THEMES = ("character development", "emotional depth", "human experience")
+DEFAULT_STYLE = {
+    "narrative_style": "Engaging storytelling",
+    "emotional_tone": "Thoughtful and immersive",
+    "genre_fusion": "Literary fiction",
+    "character_preferences": "Complex characters",
+    "artistic_sensibilities": "Quality craftsmanship"
+}
+
+class FallbackBook(NamedTuple):
+    """An immutable catalog record; a fresh BookRecommendation is built from it per response"""
+    title: str
+    author: str
+    reason: str
+    taste_match_score: float
+    primary_appeal: str
+
+    def to_recommendation(self) -> BookRecommendation:
+        return BookRecommendation(**self._asdict())
+
+class ThemeRule(NamedTuple):
+    themes: Tuple[str, ...]
+    narrative_style: str
+    emotional_tone: str
+    genre_fusion: str
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick automaton over lowercase keywords. One pass over a text finds
+    every keyword occurring anywhere in it, as a substring, and returns the
+    payloads registered for them.
+    """
+
+    def __init__(self, keywords: Dict[str, int]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[FrozenSet[int]] = [frozenset()]
+
+        for keyword, payload in keywords.items():
+            node = 0
+            for char in keyword.lower():
+                if char not in self._goto[node]:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append(frozenset())
+                    self._goto[node][char] = len(self._goto) - 1
+                node = self._goto[node][char]
+            self._output[node] = self._output[node] | {payload}
+
+        # Breadth-first, so every failure link points at an already finished node
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                self._output[child] = self._output[child] | self._output[self._fail[child]]
+
+    def search(self, text: str) -> FrozenSet[int]:
+        found = set()
+        node = 0
+        for char in text:
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            if self._output[node]:
+                found.update(self._output[node])
+        return frozenset(found)
+
+class FallbackCatalog:
+    """
+    Books and keyword theme rules for recommendations without GPT, loaded once
+    from a JSON data file. Movie titles are mapped to themes in one automaton
+    pass, and each theme's books are indexed up front, so selection costs the
+    same however large the catalog grows.
+    """
+
+    def __init__(self, data: Dict[str, Any]):
+        self.rules = [
+            ThemeRule(tuple(rule["themes"]), rule["narrative_style"], rule["emotional_tone"], rule["genre_fusion"])
+            for rule in data["theme_rules"]
+        ]
+        keywords: Dict[str, int] = {}
+        for index, rule in enumerate(data["theme_rules"]):
+            for keyword in rule["keywords"]:
+                keywords.setdefault(keyword.lower(), index)
+        self.automaton = KeywordAutomaton(keywords)
+
+        books_by_theme: Dict[str, List[FallbackBook]] = {}
+        for record in data["books"]:
+            book = _book(record)
+            for theme in record["themes"]:
+                books_by_theme.setdefault(theme, []).append(book)
+        self.books_by_theme = {theme: tuple(books[:BOOKS_PER_THEME]) for theme, books in books_by_theme.items()}
+        self.default_books = tuple(_book(record) for record in data["default_books"])
+        self.book_count = len(data["books"])
+
+    @classmethod
+    def load(cls, path: Path) -> "FallbackCatalog":
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def analyze_movies(self, movies: List[str]) -> Dict[str, Any]:
+        """Themes and storytelling traits of the rules whose keywords appear in the titles; later rules set the traits"""
+        matched = sorted(self.automaton.search(" ".join(movies).lower()))
+        analysis = dict(DEFAULT_STYLE)
+        themes: List[str] = []
+        for index in matched:
+            rule = self.rules[index]
+            themes.extend(rule.themes)
+            analysis.update(
+                narrative_style=rule.narrative_style,
+                emotional_tone=rule.emotional_tone,
+                genre_fusion=rule.genre_fusion
+            )
+        analysis["themes"] = list(dict.fromkeys(themes)) or list(DEFAULT_THEMES)
+        return analysis
+
+    def books_for_themes(self, themes: List[str], count: int = 3) -> List[BookRecommendation]:
+        """Up to BOOKS_PER_THEME books per theme in theme order, topped up from the defaults"""
+        selected: Dict[Tuple[str, str], FallbackBook] = {}
+        themed = (book for theme in themes for book in self.books_by_theme.get(theme, ()))
+        for book in itertools.chain(themed, self.default_books):
+            if len(selected) >= count:
+                break
+            selected.setdefault((book.title, book.author), book)
+        return [book.to_recommendation() for book in selected.values()]
+
+def _book(record: Dict[str, Any]) -> FallbackBook:
+    return FallbackBook(
+        title=record["title"],
+        author=record["author"],
+        reason=record["reason"],
+        taste_match_score=record["taste_match_score"],
+        primary_appeal=record["primary_appeal"]
+    )
+
+def load_fallback_catalog(path: Optional[str] = None) -> FallbackCatalog:
+    return FallbackCatalog.load(Path(path) if path else DEFAULT_CATALOG_PATH)
@@ -1,14 +1,117 @@
 import openai
-from typing import List, Dict, Any
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 from app.config import settings
 from app.models.request_models import UserPreferences
 from app.models.response_models import RecommendationResponse, BookRecommendation, TasteProfile
+from app.services.circuit_breaker import CircuitOpenError, get_breaker
+from app.services.fallback_catalog import load_fallback_catalog
 import json
 import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Served by analyze_taste_profile when GPT is unavailable
+FALLBACK_TASTE_PROFILE = {
+    "themes": ["character-driven narratives", "emotional complexity"],
+    "narrative_style": "Layered, sophisticated storytelling",
+    "emotional_tone": "Thoughtful and emotionally resonant",
+    "genre_fusion": "Cross-genre sensibilities", 
+    "character_preferences": "Complex, well-developed characters",
+    "artistic_sensibilities": "Appreciation for narrative craftsmanship",
+    "confidence_score": 0.5
+}
+
+# Books and theme rules for fallback recommendations, indexed once at import
+FALLBACK_CATALOG = load_fallback_catalog(settings.fallback_catalog_file)
+
+class RecommendationStreamParser:
+    """
+    Incremental scanner over streamed GPT output in the unified response schema.
+
+    Tracks string, escape and nesting state across chunks, and emits the
+    taste_profile object and each unified_recommendations entry as soon as
+    its closing brace arrives. Each book is also announced as a "book_heading"
+    once its title and author strings are complete, usually well before the
+    model has finished writing its reason. Text around the JSON (e.g. code
+    fences) is ignored.
+    """
+
+    def __init__(self):
+        self.content = ""
+        self._pos = 0
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._last_string: Optional[str] = None
+        self._key: Optional[str] = None
+        self._capture: Optional[Tuple[str, int, int]] = None  # (kind, start, depth)
+        # String fields of the book currently being written
+        self._field_key: Optional[str] = None
+        self._book_fields: Dict[str, str] = {}
+
+    def feed(self, chunk: str) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Add a chunk; returns ("taste_profile" | "book_heading" | "book", data) for
+        everything it completed, where a heading holds just the title and author
+        """
+        self.content += chunk
+        events = []
+        content = self.content
+        for i in range(self._pos, len(content)):
+            ch = content[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    self._last_string = content[self._string_start + 1:i]
+                    if self._field_key and self._capture and len(self._stack) == self._capture[2]:
+                        self._book_field(json.loads(content[self._string_start:i + 1]), events)
+            elif ch == '"':
+                self._in_string = True
+                self._string_start = i
+            elif ch == ":" and len(self._stack) == 1:
+                # Top-level key, e.g. "taste_profile" or "unified_recommendations"
+                self._key = self._last_string
+            elif ch == ":" and self._capture and self._capture[0] == "book" and len(self._stack) == self._capture[2]:
+                self._field_key = self._last_string
+            elif ch == ",":
+                self._field_key = None
+            elif ch in "{[":
+                self._stack.append(ch)
+                if ch == "{" and self._capture is None:
+                    depth = len(self._stack)
+                    if depth == 2 and self._key == "taste_profile":
+                        self._capture = ("taste_profile", i, depth)
+                    elif depth == 3 and self._stack[1] == "[" and self._key == "unified_recommendations":
+                        self._capture = ("book", i, depth)
+                        self._book_fields = {}
+                self._field_key = None
+            elif ch in "}]" and self._stack:
+                self._stack.pop()
+                if self._capture and len(self._stack) == self._capture[2] - 1:
+                    kind, start, _ = self._capture
+                    self._capture = None
+                    self._field_key = None
+                    try:
+                        events.append((kind, json.loads(content[start:i + 1])))
+                    except json.JSONDecodeError as e:
+                        logger.warning(f"Skipping malformed {kind} object in GPT stream: {e}")
+        self._pos = len(content)
+        return events
+
+    def _book_field(self, value: str, events: List[Tuple[str, Dict[str, Any]]]):
+        key, self._field_key = self._field_key, None
+        if key not in ("title", "author") or key in self._book_fields:
+            return
+        self._book_fields[key] = value
+        if len(self._book_fields) == 2:
+            events.append(("book_heading", dict(self._book_fields)))
+
 class GPTService:
     def __init__(self):
         if not settings.openai_api_key:
@@ -20,27 +123,118 @@ class GPTService:
         Generate unified book recommendations based on user's overall taste profile
         derived from their movie preferences
         """
-        prompt = self._build_unified_prompt(movies, preferences)
-        
         try:
-            response = await self.client.chat.completions.create(  # Add await
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": self._get_system_prompt()},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=1500,  # Increased for better responses
-                temperature=0.7
-            )
+            async with get_breaker("openai").guard():
+                response = await self.client.chat.completions.create(  # Add await
+                    **self._unified_completion_args(movies, preferences)
+                )
             
             content = response.choices[0].message.content
             return self._parse_unified_response(content, movies)
             
+        except CircuitOpenError:
+            logger.warning("OpenAI circuit breaker is open; serving fallback recommendations")
+            return self._create_fallback_response(movies)
         except Exception as e:
             logger.error(f"GPT API error: {str(e)}")
             # Return fallback instead of raising
             return self._create_fallback_response(movies)
     
+    async def stream_recommendations(
+        self,
+        movies: List[str],
+        preferences: UserPreferences = None
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Stream unified recommendations as GPT writes them.
+        
+        Yields ("taste_profile", TasteProfile) once the profile is complete,
+        ("book_heading", (title, author)) as soon as a book's title and author
+        are known, ("book", BookRecommendation) as each book's object closes, and finally
+        ("complete", List[RecommendationResponse]) built from those same book
+        instances. If GPT fails before any book arrives, the fallback
+        recommendations are streamed the same way; if it fails later, the books
+        so far complete the stream but are marked _fallback so nobody caches them.
+        """
+        parser = RecommendationStreamParser()
+        taste_profile = None
+        books: List[BookRecommendation] = []
+        failed = False
+        
+        breaker = get_breaker("openai")
+        try:
+            # The breaker times the request up to its first chunk only: the rest of the
+            # completion arrives at the pace GPT writes and the consumer reads it
+            async with breaker.guard():
+                stream = await self.client.chat.completions.create(
+                    **self._unified_completion_args(movies, preferences),
+                    stream=True
+                )
+                chunks = stream.__aiter__()
+                chunk = await anext(chunks, None)
+            
+            while chunk is not None:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                for kind, data in parser.feed(delta) if delta else ():
+                    if kind == "taste_profile":
+                        taste_profile = self._build_taste_profile(data)
+                        yield kind, taste_profile
+                    elif kind == "book_heading":
+                        if data["title"] and data["author"]:
+                            yield kind, (data["title"], data["author"])
+                    else:
+                        book = self._build_book(data)
+                        if book:
+                            books.append(book)
+                            yield kind, book
+                try:
+                    chunk = await anext(chunks, None)
+                except Exception:
+                    # The upstream broke off mid-completion, which is still its failure
+                    breaker.record_failure()
+                    raise
+        except CircuitOpenError:
+            logger.warning("OpenAI circuit breaker is open; serving fallback recommendations")
+            failed = True
+        except Exception as e:
+            logger.error(f"GPT streaming error: {str(e)}")
+            failed = True
+        
+        if not books:
+            # Nothing usable streamed; same fallbacks as the non-streaming path
+            recommendations = (
+                self._parse_unified_response(parser.content, movies)
+                if parser.content else self._create_fallback_response(movies)
+            )
+            if taste_profile is None:
+                yield "taste_profile", recommendations[0].taste_profile
+            for book in recommendations[0].books:
+                yield "book", book
+            yield "complete", recommendations
+            return
+        
+        recommendation = RecommendationResponse(
+            movie=self._create_movie_summary(movies, {}),
+            books=books,
+            taste_profile=taste_profile or self._build_taste_profile({})
+        )
+        if failed:
+            logger.warning(f"GPT stream broke off after {len(books)} books; serving them uncached")
+            recommendation._fallback = True
+        yield "complete", [recommendation]
+    
+    def _unified_completion_args(self, movies: List[str], preferences: UserPreferences = None) -> Dict[str, Any]:
+        """Chat completion arguments shared by the plain and streaming recommendation calls"""
+        return {
+            "model": "gpt-4o-mini",
+            "messages": [
+                {"role": "system", "content": self._get_system_prompt()},
+                {"role": "user", "content": self._build_unified_prompt(movies, preferences)}
+            ],
+            "max_tokens": 1500,  # Increased for better responses
+            "temperature": 0.7
+        }
+    
     def _get_system_prompt(self) -> str:
         """Optimized system prompt for unified recommendations"""
         return """You are a literary taste analyst specializing in cross-media pattern recognition.
@@ -163,17 +357,9 @@ Select {books_count} books that share this aesthetic DNA. Prioritize:
             # Extract unified recommendations
             unified_books = []
             for book_data in data.get('unified_recommendations', []):
-                if not book_data.get('title') or not book_data.get('author'):
-                    continue
-                    
-                book = BookRecommendation(
-                    title=book_data['title'],
-                    author=book_data['author'],
-                    reason=book_data.get('reason', ''),
-                    taste_match_score=book_data.get('taste_match_score'),
-                    primary_appeal=book_data.get('primary_appeal')
-                )
-                unified_books.append(book)
+                book = self._build_book(book_data)
+                if book:
+                    unified_books.append(book)
             
             if not unified_books:
                 logger.error("No valid book recommendations found")
@@ -181,15 +367,7 @@ Select {books_count} books that share this aesthetic DNA. Prioritize:
             
             # Create taste profile
             taste_profile_data = data.get('taste_profile', {})
-            taste_profile = TasteProfile(
-                themes=taste_profile_data.get('themes', []),
-                narrative_style=taste_profile_data.get('narrative_style', ''),
-                emotional_tone=taste_profile_data.get('emotional_tone', ''),
-                genre_fusion=taste_profile_data.get('genre_fusion', ''),
-                character_preferences=taste_profile_data.get('character_preferences', ''),
-                artistic_sensibilities=taste_profile_data.get('artistic_sensibilities', ''),
-                confidence_score=taste_profile_data.get('confidence_score', 0.7)
-            )
+            taste_profile = self._build_taste_profile(taste_profile_data)
             
             # Return as a single recommendation response for the unified taste
             movie_summary = self._create_movie_summary(movies, taste_profile_data)
@@ -208,6 +386,30 @@ Select {books_count} books that share this aesthetic DNA. Prioritize:
             logger.error(f"Error parsing unified response: {e}")
             return self._create_fallback_response(movies)
     
+    def _build_book(self, book_data: Dict[str, Any]) -> Optional[BookRecommendation]:
+        """A BookRecommendation from one unified_recommendations entry, or None without title and author"""
+        if not book_data.get('title') or not book_data.get('author'):
+            return None
+        
+        return BookRecommendation(
+            title=book_data['title'],
+            author=book_data['author'],
+            reason=book_data.get('reason', ''),
+            taste_match_score=book_data.get('taste_match_score'),
+            primary_appeal=book_data.get('primary_appeal')
+        )
+    
+    def _build_taste_profile(self, taste_profile_data: Dict[str, Any]) -> TasteProfile:
+        return TasteProfile(
+            themes=taste_profile_data.get('themes', []),
+            narrative_style=taste_profile_data.get('narrative_style', ''),
+            emotional_tone=taste_profile_data.get('emotional_tone', ''),
+            genre_fusion=taste_profile_data.get('genre_fusion', ''),
+            character_preferences=taste_profile_data.get('character_preferences', ''),
+            artistic_sensibilities=taste_profile_data.get('artistic_sensibilities', ''),
+            confidence_score=taste_profile_data.get('confidence_score', 0.7)
+        )
+    
     def _create_movie_summary(self, movies: List[str], taste_profile: Dict) -> str:
         """Create a summary of the user's movie selection and taste profile"""
         if len(movies) == 1:
@@ -222,8 +424,8 @@ Select {books_count} books that share this aesthetic DNA. Prioritize:
         logger.warning("Using dynamic fallback response due to GPT API unavailability")
 
         # Create movie-based fallback recommendations
-        movie_themes = self._analyze_movie_themes(movies)
-        fallback_books = self._get_theme_based_books(movie_themes)
+        movie_themes = FALLBACK_CATALOG.analyze_movies(movies)
+        fallback_books = FALLBACK_CATALOG.books_for_themes(movie_themes['themes'])
 
         fallback_taste_profile = TasteProfile(
             themes=movie_themes.get('themes', ["character development", "emotional depth"]),
@@ -237,253 +439,13 @@ Select {books_count} books that share this aesthetic DNA. Prioritize:
 
         movie_summary = self._create_movie_summary(movies, movie_themes)
 
-        return [RecommendationResponse(
+        fallback = RecommendationResponse(
             movie=movie_summary,
             books=fallback_books,
             taste_profile=fallback_taste_profile
-        )]
-
-    def _analyze_movie_themes(self, movies: List[str]) -> Dict[str, Any]:
-        """Analyze movies to extract themes for fallback recommendations"""
-        # Simple keyword-based theme analysis
-        movie_text = " ".join(movies).lower()
-
-        themes = []
-        narrative_style = "Engaging storytelling"
-        emotional_tone = "Thoughtful and immersive"
-        genre_fusion = "Literary fiction"
-        character_preferences = "Complex characters"
-        artistic_sensibilities = "Quality craftsmanship"
-
-        # Action/Adventure themes
-        if any(word in movie_text for word in ['batman', 'superman', 'avengers', 'marvel', 'dc', 'hero', 'action', 'fight']):
-            themes.extend(["heroism", "justice", "moral complexity"])
-            narrative_style = "Epic storytelling with high stakes"
-            emotional_tone = "Intense and dramatic"
-            genre_fusion = "Adventure fiction with philosophical undertones"
-
-        # Sci-fi/Fantasy themes
-        if any(word in movie_text for word in ['star wars', 'jedi', 'force', 'space', 'alien', 'future', 'time', 'magic', 'dragon']):
-            themes.extend(["exploration", "wonder", "human potential"])
-            narrative_style = "Imaginative world-building"
-            emotional_tone = "Awe-inspiring and philosophical"
-            genre_fusion = "Speculative fiction with deep themes"
-
-        # Drama/Romance themes
-        if any(word in movie_text for word in ['love', 'romance', 'relationship', 'drama', 'heart', 'passion']):
-            themes.extend(["human connection", "emotional growth", "relationships"])
-            narrative_style = "Character-driven narratives"
-            emotional_tone = "Emotional and intimate"
-            genre_fusion = "Literary fiction with romantic elements"
-
-        # Mystery/Thriller themes
-        if any(word in movie_text for word in ['detective', 'mystery', 'thriller', 'crime', 'murder', 'investigation']):
-            themes.extend(["intrigue", "justice", "psychological depth"])
-            narrative_style = "Complex plotting with twists"
-            emotional_tone = "Suspenseful and intense"
-            genre_fusion = "Mystery and psychological fiction"
-
-        # Comedy themes
-        if any(word in movie_text for word in ['comedy', 'funny', 'laugh', 'humor', 'joke']):
-            themes.extend(["wit", "human folly", "social commentary"])
-            narrative_style = "Sharp and observant storytelling"
-            emotional_tone = "Witty and engaging"
-            genre_fusion = "Humorous literary fiction"
-
-        # Default themes if nothing matches
-        if not themes:
-            themes = ["character development", "emotional depth", "human experience"]
-
-        return {
-            'themes': themes,
-            'narrative_style': narrative_style,
-            'emotional_tone': emotional_tone,
-            'genre_fusion': genre_fusion,
-            'character_preferences': character_preferences,
-            'artistic_sensibilities': artistic_sensibilities
-        }
-
-    def _get_theme_based_books(self, movie_themes: Dict[str, Any]) -> List[BookRecommendation]:
-        """Get book recommendations based on analyzed movie themes"""
-
-        # Book database organized by themes
-        book_database = {
-            "heroism": [
-                BookRecommendation(
-                    title="The Name of the Wind",
-                    author="Patrick Rothfuss",
-                    reason="A hero's journey filled with wonder, danger, and personal growth, much like the epic adventures in superhero sagas.",
-                    taste_match_score=0.85,
-                    primary_appeal="Epic heroism and personal destiny"
-                ),
-                BookRecommendation(
-                    title="The Way of Kings",
-                    author="Brandon Sanderson",
-                    reason="Complex world-building with themes of honor, leadership, and moral dilemmas, appealing to fans of heroic narratives.",
-                    taste_match_score=0.82,
-                    primary_appeal="Epic fantasy with heroic themes"
-                )
-            ],
-            "justice": [
-                BookRecommendation(
-                    title="The City We Became",
-                    author="N.K. Jemisin",
-                    reason="Explores themes of community, justice, and urban life with a fantastical twist, perfect for those who enjoy moral complexity.",
-                    taste_match_score=0.88,
-                    primary_appeal="Social justice and community themes"
-                )
-            ],
-            "moral complexity": [
-                BookRecommendation(
-                    title="The Night Circus",
-                    author="Erin Morgenstern",
-                    reason="A magical competition that explores the gray areas of morality and human nature, much like anti-hero stories.",
-                    taste_match_score=0.80,
-                    primary_appeal="Moral ambiguity and complex characters"
-                )
-            ],
-            "exploration": [
-                BookRecommendation(
-                    title="Dune",
-                    author="Frank Herbert",
-                    reason="Epic exploration of alien worlds, politics, and human destiny, perfect for space opera enthusiasts.",
-                    taste_match_score=0.90,
-                    primary_appeal="Grand-scale exploration and world-building"
-                ),
-                BookRecommendation(
-                    title="The Left Hand of Darkness",
-                    author="Ursula K. Le Guin",
-                    reason="Thoughtful exploration of alien cultures and human nature, appealing to fans of deep speculative fiction.",
-                    taste_match_score=0.85,
-                    primary_appeal="Cultural exploration and philosophical depth"
-                )
-            ],
-            "wonder": [
-                BookRecommendation(
-                    title="American Gods",
-                    author="Neil Gaiman",
-                    reason="A modern fantasy filled with wonder, mythology, and magical realism that sparks imagination.",
-                    taste_match_score=0.83,
-                    primary_appeal="Mythological wonder and imagination"
-                )
-            ],
-            "human potential": [
-                BookRecommendation(
-                    title="Ender's Game",
-                    author="Orson Scott Card",
-                    reason="Explores human potential, strategy, and growth under pressure, much like coming-of-age hero stories.",
-                    taste_match_score=0.87,
-                    primary_appeal="Human potential and strategic thinking"
-                )
-            ],
-            "human connection": [
-                BookRecommendation(
-                    title="The Seven Husbands of Evelyn Hugo",
-                    author="Taylor Jenkins Reid",
-                    reason="Deep exploration of relationships, love, and human connection through a compelling life story.",
-                    taste_match_score=0.85,
-                    primary_appeal="Emotional relationships and human connection"
-                ),
-                BookRecommendation(
-                    title="Normal People",
-                    author="Sally Rooney",
-                    reason="Intimate portrayal of young love and emotional growth, perfect for romance and drama fans.",
-                    taste_match_score=0.82,
-                    primary_appeal="Intimate relationships and emotional depth"
-                )
-            ],
-            "emotional growth": [
-                BookRecommendation(
-                    title="Educated",
-                    author="Tara Westover",
-                    reason="A powerful story of personal growth, resilience, and self-discovery against all odds.",
-                    taste_match_score=0.88,
-                    primary_appeal="Personal growth and transformation"
-                )
-            ],
-            "intrigue": [
-                BookRecommendation(
-                    title="The Girl with the Dragon Tattoo",
-                    author="Stieg Larsson",
-                    reason="Complex mystery and investigation with psychological depth, appealing to thriller enthusiasts.",
-                    taste_match_score=0.86,
-                    primary_appeal="Intricate plotting and suspense"
-                )
-            ],
-            "psychological depth": [
-                BookRecommendation(
-                    title="Gone Girl",
-                    author="Gillian Flynn",
-                    reason="Psychological thriller exploring the dark sides of relationships and human nature.",
-                    taste_match_score=0.84,
-                    primary_appeal="Psychological complexity and tension"
-                )
-            ],
-            "wit": [
-                BookRecommendation(
-                    title="The Hitchhiker's Guide to the Galaxy",
-                    author="Douglas Adams",
-                    reason="Hilarious and witty exploration of the universe with clever humor and social commentary.",
-                    taste_match_score=0.89,
-                    primary_appeal="Intelligent humor and wit"
-                )
-            ],
-            "social commentary": [
-                BookRecommendation(
-                    title="Catch-22",
-                    author="Joseph Heller",
-                    reason="Satirical take on bureaucracy and human folly with sharp wit and social critique.",
-                    taste_match_score=0.87,
-                    primary_appeal="Satire and social commentary"
-                )
-            ]
-        }
-
-        # Default fallback books
-        default_books = [
-            BookRecommendation(
-                title="The Seven Husbands of Evelyn Hugo",
-                author="Taylor Jenkins Reid",
-                reason="A compelling narrative that combines character depth with emotional complexity, appealing to viewers who appreciate sophisticated storytelling.",
-                taste_match_score=0.8,
-                primary_appeal="Character-driven storytelling"
-            ),
-            BookRecommendation(
-                title="Klara and the Sun",
-                author="Kazuo Ishiguro",
-                reason="Masterful blend of speculative elements with profound human themes, perfect for those who enjoy thoughtful, emotionally resonant narratives.",
-                taste_match_score=0.85,
-                primary_appeal="Thoughtful speculative fiction"
-            ),
-            BookRecommendation(
-                title="The Midnight Library",
-                author="Matt Haig",
-                reason="Philosophical exploration of life choices and possibilities, combining accessibility with deeper existential themes.",
-                taste_match_score=0.75,
-                primary_appeal="Philosophical exploration"
-            )
-        ]
-
-        # Collect books based on themes
-        selected_books = []
-        themes = movie_themes.get('themes', [])
-
-        for theme in themes:
-            if theme in book_database:
-                # Add up to 2 books per theme
-                theme_books = book_database[theme][:2]
-                for book in theme_books:
-                    if book not in selected_books:  # Avoid duplicates
-                        selected_books.append(book)
-
-        # If we don't have enough books, fill with defaults
-        while len(selected_books) < 3:
-            for default_book in default_books:
-                if default_book not in selected_books:
-                    selected_books.append(default_book)
-                    break
-
-        return selected_books[:3]  # Return exactly 3 books
+        )
+        fallback._fallback = True
+        return [fallback]
 
     async def analyze_taste_profile(self, movies: List[str], preferences: UserPreferences = None) -> Dict[str, Any]:
         """
@@ -515,15 +477,16 @@ RESPONSE FORMAT:
 }}"""
         
         try:
-            response = await self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "You are an expert in cross-media aesthetic analysis. Extract unified patterns from film preferences. Always respond with valid JSON only."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=600,  # Reduced for efficiency
-                temperature=0.6  # Slightly lower for more consistent analysis
-            )
+            async with get_breaker("openai").guard():
+                response = await self.client.chat.completions.create(
+                    model="gpt-4o-mini",
+                    messages=[
+                        {"role": "system", "content": "You are an expert in cross-media aesthetic analysis. Extract unified patterns from film preferences. Always respond with valid JSON only."},
+                        {"role": "user", "content": prompt}
+                    ],
+                    max_tokens=600,  # Reduced for efficiency
+                    temperature=0.6  # Slightly lower for more consistent analysis
+                )
             
             content = response.choices[0].message.content
             json_start = content.find('{')
@@ -533,13 +496,8 @@ RESPONSE FORMAT:
             return json.loads(json_str)
             
         except Exception as e:
-            logger.error(f"Error analyzing taste profile: {e}")
-            return {
-                "themes": ["character-driven narratives", "emotional complexity"],
-                "narrative_style": "Layered, sophisticated storytelling",
-                "emotional_tone": "Thoughtful and emotionally resonant",
-                "genre_fusion": "Cross-genre sensibilities", 
-                "character_preferences": "Complex, well-developed characters",
-                "artistic_sensibilities": "Appreciation for narrative craftsmanship",
-                "confidence_score": 0.5
-            }
\ No newline at end of file
+            if isinstance(e, CircuitOpenError):
+                logger.warning("OpenAI circuit breaker is open; serving fallback taste profile")
+            else:
+                logger.error(f"Error analyzing taste profile: {e}")
+            return dict(FALLBACK_TASTE_PROFILE)
\ No newline at end of file
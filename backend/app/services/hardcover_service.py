@@ -1,23 +1,89 @@
 import httpx
 import asyncio
-from typing import Optional, Dict, Any, List
+import json
+from typing import Optional, Dict, Any, List, Tuple
 from app.config import settings
+from app.services import http_clients
+from app.services.rate_limiter import AsyncTokenBucket, parse_retry_after
+from app.services.circuit_breaker import CircuitOpenError, get_breaker
+from app.services.book_matching import ABSENT_FLOOR, MATCH_THRESHOLD, top_match
+from app.services.cache_service import CacheService, create_search_cache_key
+from app.utils.helpers import SingleFlight
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Outcomes of a metadata lookup. Only LOOKUP_NOT_FOUND is a definitive answer
+# that callers may cache; LOOKUP_FAILED covers auth, timeout, rate-limit and other errors.
+# LOOKUP_INCONCLUSIVE is only returned by lookup_books_batch and for single search
+# strategies: one strategy matched nothing but didn't rule the book out either.
+LOOKUP_FOUND = "found"
+LOOKUP_NOT_FOUND = "not_found"
+LOOKUP_FAILED = "failed"
+LOOKUP_INCONCLUSIVE = "inconclusive"
+
+# How lookup_book_metadata runs its search strategies: one after another, staggered
+# hedges that stop at the first acceptable match, or all at once
+SEARCH_MODES = ("sequential", "hedged", "parallel")
+
+# Every Hardcover call in the process draws from this one bucket
+hardcover_rate_limiter = AsyncTokenBucket(
+    settings.hardcover_rate_limit_per_minute,
+    settings.hardcover_rate_limit_burst
+)
+
 class HardcoverService:
-    def __init__(self):
+    def __init__(self, search_cache: Optional[CacheService] = None):
         self.api_url = "https://api.hardcover.app/v1/graphql"
         self.api_key = settings.hardcover_api_key
         self.timeout = settings.hardcover_timeout_seconds
         self.retry_attempts = settings.hardcover_retry_attempts
+        self.search_mode = settings.hardcover_search_mode
+        if self.search_mode not in SEARCH_MODES:
+            raise ValueError(f"Unknown Hardcover search mode: {self.search_mode}")
+        # Parsed search documents by normalized query, shared across titles and strategies
+        self.search_cache = search_cache if settings.search_cache_expire_seconds > 0 else None
+        self.search_flights = SingleFlight()
+        self.search_cache_hits = 0
 
     def _get_auth_header(self) -> str:
         """Get properly formatted authorization header"""
         # Hardcover API expects "Bearer" prefix with capital Authorization header
         return f"Bearer {self.api_key}"
 
+    async def _post_graphql(self, graphql_query: Dict[str, Any], timeout: Optional[float] = None) -> httpx.Response:
+        """
+        POST a GraphQL document through the shared, pooled Hardcover client, rate
+        limiter and circuit breaker. Raises CircuitOpenError while Hardcover is
+        considered down.
+        """
+        headers = {
+            "Authorization": self._get_auth_header(),
+            "Content-Type": "application/json",
+            "User-Agent": "BookRecommendationService/1.0"
+        }
+        client = http_clients.get_client("hardcover")
+        breaker = get_breaker("hardcover")
+        
+        # Don't spend a rate-limit token on a call the breaker would reject
+        if breaker.is_open:
+            breaker.rejected += 1
+            raise CircuitOpenError("hardcover")
+        await hardcover_rate_limiter.acquire()
+        async with breaker.guard() as call:
+            if timeout is None:
+                response = await client.post(self.api_url, headers=headers, json=graphql_query)
+            else:
+                response = await client.post(self.api_url, headers=headers, json=graphql_query, timeout=timeout)
+            call.failed = response.status_code >= 500
+        
+        # Let the shared limiter follow what Hardcover tells us about our budget
+        if response.status_code == 429:
+            hardcover_rate_limiter.record_throttled(parse_retry_after(response.headers.get("Retry-After")))
+        else:
+            hardcover_rate_limiter.record_success()
+        return response
+
     def _clean_search_query(self, query: str) -> str:
         """Clean up search query to improve results"""
         if not query:
@@ -41,50 +107,102 @@ class HardcoverService:
         """
         Get comprehensive book metadata from Hardcover API using GraphQL search
         """
+        metadata, _ = await self.lookup_book_metadata(title, author)
+        return metadata
+
+    def _search_strategies(self, title: str, author: str = "") -> List[str]:
+        """Search queries to try for a book, most specific first"""
+        search_strategies = []
+        
+        # Strategy 1: Title + Author
+        if author:
+            search_strategies.append(f"{title} {author}")
+        
+        # Strategy 2: Just title
+        search_strategies.append(title)
+        
+        # Strategy 3: Title without common words
+        title_cleaned = self._clean_search_query(title)
+        if title_cleaned and title_cleaned != title:
+            search_strategies.append(title_cleaned)
+            
+        # Strategy 4: Author + Title (sometimes works better)
+        if author:
+            search_strategies.append(f"{author} {title}")
+        
+        return search_strategies
+
+    async def lookup_book_metadata(
+        self,
+        title: str,
+        author: str = "",
+        skip_strategies: int = 0
+    ) -> Tuple[Optional[Dict[str, Any]], str]:
+        """
+        Like get_book_metadata, but also report the outcome (LOOKUP_FOUND,
+        LOOKUP_NOT_FOUND or LOOKUP_FAILED) so callers can tell a book Hardcover
+        doesn't know apart from a lookup that errored.
+        
+        skip_strategies drops the first N search strategies, for callers that
+        already tried them (e.g. in a batched lookup).
+        """
         if not settings.enable_hardcover_integration:
             logger.info("Hardcover integration is disabled")
-            return None
+            return None, LOOKUP_FAILED
             
         # Check if API key is properly configured
         if not self.api_key or self.api_key.endswith("..."):
             logger.warning("Hardcover API key is missing or truncated. Please check your .env file.")
-            return None
+            return None, LOOKUP_FAILED
+        
+        if get_breaker("hardcover").is_open:
+            # Hardcover is down; return the book without metadata right away
+            return None, LOOKUP_FAILED
             
         try:
             # Try multiple search strategies
-            search_strategies = []
-            
-            # Strategy 1: Title + Author
-            if author:
-                search_strategies.append(f"{title} {author}")
-            
-            # Strategy 2: Just title
-            search_strategies.append(title)
-            
-            # Strategy 3: Title without common words
-            title_cleaned = self._clean_search_query(title)
-            if title_cleaned and title_cleaned != title:
-                search_strategies.append(title_cleaned)
-                
-            # Strategy 4: Author + Title (sometimes works better)
-            if author:
-                search_strategies.append(f"{author} {title}")
+            search_strategies = self._search_strategies(title, author)[skip_strategies:]
             
             logger.info(f"Searching for book: '{title}' by '{author}' using {len(search_strategies)} strategies")
             
             for attempt in range(self.retry_attempts):
                 try:
-                    # Try each search strategy
-                    for i, search_query in enumerate(search_strategies):
-                        logger.info(f"Attempt {attempt + 1}, Strategy {i + 1}: Searching with query '{search_query}'")
-                        metadata = await self._search_books(search_query)
-                        if metadata:
-                            logger.info(f"Successfully found metadata for '{title}' using strategy {i + 1}")
-                            return metadata
+                    if self.search_mode == "sequential":
+                        # Try each search strategy
+                        status = LOOKUP_INCONCLUSIVE
+                        for i, search_query in enumerate(search_strategies):
+                            logger.info(f"Attempt {attempt + 1}, Strategy {i + 1}: Searching with query '{search_query}'")
+                            metadata, strategy_status = await self._search_books(search_query, title, author)
+                            if strategy_status == LOOKUP_FOUND:
+                                logger.info(f"Successfully found metadata for '{title}' using strategy {i + 1}")
+                                return metadata, LOOKUP_FOUND
+                            if strategy_status == LOOKUP_NOT_FOUND:
+                                logger.info(f"Nothing resembling '{title}' in strategy {i + 1}; skipping the rest")
+                                status = LOOKUP_NOT_FOUND
+                                break
+                            if strategy_status == LOOKUP_FAILED:
+                                status = LOOKUP_FAILED
+                    else:
+                        logger.info(f"Attempt {attempt + 1}: Racing {len(search_strategies)} strategies ({self.search_mode})")
+                        metadata, status = await self._race_search_strategies(search_strategies, title, author)
+                        if status == LOOKUP_FOUND:
+                            logger.info(f"Successfully found metadata for '{title}'")
+                            return metadata, LOOKUP_FOUND
                     
-                    # If no strategies worked on this attempt, log and continue
+                    if status == LOOKUP_FAILED:
+                        # A search answered with an error (bad token, schema change) rather than
+                        # results, so the misses say nothing about whether the book exists
+                        logger.warning(f"Search errors on attempt {attempt + 1} for '{title}'")
+                        return None, LOOKUP_FAILED
+                    
+                    # Every strategy completed without error and matched nothing; repeating
+                    # the same queries won't change that, so this is a definitive miss
                     logger.warning(f"No results found on attempt {attempt + 1} for '{title}'")
+                    return None, LOOKUP_NOT_FOUND
                     
+                except CircuitOpenError:
+                    logger.warning(f"Hardcover circuit breaker opened while looking up: {title}")
+                    break
                 except httpx.TimeoutException:
                     logger.warning(f"Timeout on attempt {attempt + 1} for book: {title}")
                     if attempt < self.retry_attempts - 1:
@@ -93,10 +211,10 @@ class HardcoverService:
                 except httpx.HTTPStatusError as e:
                     if e.response.status_code == 401:
                         logger.error("Hardcover API authentication failed. Please check your API key.")
-                        return None  # Don't retry on auth errors
+                        return None, LOOKUP_FAILED  # Don't retry on auth errors
                     elif e.response.status_code == 429:  # Rate limited
+                        # The shared limiter already holds every caller until Retry-After
                         logger.warning(f"Rate limited on attempt {attempt + 1}")
-                        await asyncio.sleep(5 * (attempt + 1))  # Longer wait for rate limits
                         continue
                     else:
                         logger.error(f"HTTP error {e.response.status_code} for book: {title}")
@@ -105,21 +223,115 @@ class HardcoverService:
                     logger.error(f"Unexpected error on attempt {attempt + 1} for book {title}: {e}")
                     break
             
-            logger.warning(f"No metadata found for book: {title} by {author}")
-            return None
+            logger.warning(f"Metadata lookup failed for book: {title} by {author}")
+            return None, LOOKUP_FAILED
             
         except Exception as e:
             logger.error(f"Hardcover API error for '{title}': {e}")
-            return None
+            return None, LOOKUP_FAILED
 
-    async def _search_books(self, query: str) -> Optional[Dict[str, Any]]:
-        """Search for books using Hardcover's search GraphQL query"""
-        headers = {
-            "Authorization": self._get_auth_header(),
-            "Content-Type": "application/json",
-            "User-Agent": "BookRecommendationService/1.0"
-        }
+    async def _race_search_strategies(
+        self,
+        search_strategies: List[str],
+        title: str,
+        author: str = ""
+    ) -> Tuple[Optional[Dict[str, Any]], str]:
+        """
+        Run search strategies concurrently and return the first acceptable match,
+        cancelling the rest. A strategy whose results show the book is absent
+        ends the race without a match. Returns (metadata, status) like
+        _search_books, with LOOKUP_FAILED if nothing matched and any search errored.
+        
+        In hedged mode each strategy starts only once the previous ones have missed
+        or haven't answered within the hedge delay, with at most
+        hardcover_hedge_max_in_flight searches open at a time, so a fast first hit
+        costs a single request. Parallel mode starts every strategy at once.
+        Raises the first HTTP error only if no strategy matched.
+        """
+        if self.search_mode == "parallel":
+            stagger = 0.0
+            max_in_flight = len(search_strategies)
+        else:
+            stagger = settings.hardcover_hedge_delay_ms / 1000
+            max_in_flight = max(1, settings.hardcover_hedge_max_in_flight)
+        
+        pending = set()
+        errors = []
+        status = LOOKUP_INCONCLUSIVE
+        next_index = 0
+        try:
+            while True:
+                if next_index < len(search_strategies) and len(pending) < max_in_flight:
+                    pending.add(asyncio.ensure_future(
+                        self._search_books(search_strategies[next_index], title, author)
+                    ))
+                    next_index += 1
+                if not pending:
+                    break
+                
+                # Wait for an answer, or just the hedge delay while more strategies can start
+                can_hedge = next_index < len(search_strategies) and len(pending) < max_in_flight
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=stagger if can_hedge else None,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is not None:
+                        errors.append(task.exception())
+                        continue
+                    metadata, strategy_status = task.result()
+                    if strategy_status in (LOOKUP_FOUND, LOOKUP_NOT_FOUND):
+                        return metadata, strategy_status
+                    if strategy_status == LOOKUP_FAILED:
+                        status = LOOKUP_FAILED
+        finally:
+            for task in pending:
+                task.cancel()
         
+        if errors:
+            raise errors[0]
+        return None, status
+
+    async def _search_books(self, query: str, title: str, author: str = "") -> Tuple[Optional[Dict[str, Any]], str]:
+        """
+        Search for books using Hardcover's search GraphQL query. Results are matched
+        against the wanted title and author, not the strategy's query string.
+        Returns (metadata, status): LOOKUP_FOUND, LOOKUP_NOT_FOUND when the results
+        show the book is absent, LOOKUP_INCONCLUSIVE when they matched nothing
+        without ruling it out, and LOOKUP_FAILED when the search itself errored.
+        """
+        results = await self._search_documents(query)
+        if results is None:
+            return None, LOOKUP_FAILED
+        if not results:
+            return None, LOOKUP_INCONCLUSIVE
+        metadata, absent = self._match_search_results(results, title, author)
+        if metadata:
+            return metadata, LOOKUP_FOUND
+        return None, LOOKUP_NOT_FOUND if absent else LOOKUP_INCONCLUSIVE
+
+    async def _search_documents(self, query: str) -> Optional[List[Dict]]:
+        """
+        Parsed search documents for a query, from the search cache when possible.
+        Concurrent searches for the same normalized query share one request.
+        """
+        if not self.search_cache:
+            return await self._fetch_search_documents(query)
+
+        cache_key = create_search_cache_key(query)
+        cached = await self.search_cache.get(cache_key, "searches")
+        if cached is not None:
+            self.search_cache_hits += 1
+            return cached["documents"]
+
+        results, _ = await self.search_flights.do(
+            cache_key, lambda: self._fetch_search_documents(query, cache_key)
+        )
+        return results
+
+    async def _fetch_search_documents(self, query: str, cache_key: Optional[str] = None) -> Optional[List[Dict]]:
+        """Run one search request; returns None on a search error and caches anything else"""
         # Updated search query - results is a jsonb scalar, not an object
         graphql_query = {
             "query": """
@@ -141,100 +353,225 @@ class HardcoverService:
         }
         
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(self.api_url, headers=headers, json=graphql_query)
-                response.raise_for_status()
-                data = response.json()
-                
-                # Debug: Log the full response for debugging
-                logger.debug(f"Full API response for query '{query}': {data}")
+            response = await self._post_graphql(graphql_query)
+            response.raise_for_status()
+            data = response.json()
 
-                if data and "data" in data and "search" in data["data"]:
-                    search_data = data["data"]["search"]
-                    
-                    # Check for errors first
-                    if search_data.get("error"):
-                        logger.error(f"Search API error: {search_data['error']}")
-                        return None
-                    
-                    # Results is a jsonb scalar containing search results structure
-                    results_json = search_data.get("results")
-                    if results_json:
-                        try:
-                            # Parse the JSON results if it's a string
-                            import json
-                            if isinstance(results_json, str):
-                                results_data = json.loads(results_json)
-                            else:
-                                results_data = results_json  # Already parsed
-                            
-                            # Extract hits from the search results structure
-                            if isinstance(results_data, dict) and "hits" in results_data:
-                                hits = results_data["hits"]
-                                if hits:
-                                    # Extract documents from hits
-                                    results = []
-                                    for hit in hits:
-                                        if "document" in hit:
-                                            results.append(hit["document"])
-                                    
-                                    logger.info(f"Search for '{query}' returned {len(results)} results")
-                                    
-                                    # Log the first few results for debugging
-                                    for i, book in enumerate(results[:3]):
-                                        title = book.get('title', 'Unknown Title')
-                                        author_names = book.get('author_names', [])
-                                        logger.info(f"Result {i+1}: '{title}' by {author_names}")
-                                    
-                                    # Find the best match from search results
-                                    best_match = self._find_best_search_match(results, query)
-                                    if best_match:
-                                        logger.info(f"Best match selected: '{best_match.get('title')}'")
-                                        # Extract metadata directly from search results
-                                        return self._extract_metadata_from_search_result(best_match)
-                                    else:
-                                        logger.warning(f"No suitable match found in {len(results)} results for query: '{query}'")
-                                else:
-                                    logger.warning(f"No hits in search results for '{query}'")
-                            else:
-                                logger.warning(f"Unexpected results structure for '{query}': {type(results_data)}")
-                                
-                        except json.JSONDecodeError as e:
-                            logger.error(f"Failed to parse search results JSON: {e}")
-                        except Exception as e:
-                            logger.error(f"Error processing search results: {e}")
-                    else:
-                        logger.warning(f"No results in search response for '{query}'")
-                else:
-                    logger.warning(f"No search data in API response for '{query}'. Response structure: {list(data.keys()) if data else 'None'}")
-                    if data and "errors" in data:
-                        logger.error(f"GraphQL errors: {data['errors']}")
-                        
+            # Debug: Log the full response for debugging
+            logger.debug(f"Full API response for query '{query}': {data}")
+
+            if data and "data" in data and "search" in data["data"]:
+                results = self._parse_search_hits(data["data"]["search"], query)
+                if results is not None and cache_key:
+                    await self._store_search_documents(cache_key, results)
+                return results
+            else:
+                logger.warning(f"No search data in API response for '{query}'. Response structure: {list(data.keys()) if data else 'None'}")
+                if data and "errors" in data:
+                    logger.error(f"GraphQL errors: {data['errors']}")
+
+        except (httpx.HTTPError, CircuitOpenError):
+            # Transport, status and breaker errors are handled (and retried) by the caller;
+            # swallowing them here would make them look like a definitive miss
+            raise
         except Exception as e:
             logger.error(f"Error in _search_books: {e}")
             
         return None
 
-    async def _get_book_details_by_id(self, book_id: str) -> Optional[Dict[str, Any]]:
+    async def _store_search_documents(self, cache_key: str, results: List[Dict]):
+        """Cache a query's parsed documents, including an empty result list"""
+        await self.search_cache.set(
+            cache_key,
+            {"documents": results},
+            expire=settings.search_cache_expire_seconds,
+            cache_type="searches"
+        )
+
+    def search_stats(self) -> Dict[str, Any]:
+        """Search cache hits plus request and coalescing counts for uncached queries"""
+        return {
+            'cache_enabled': self.search_cache is not None,
+            'cache_hits': self.search_cache_hits,
+            **self.search_flights.stats()
+        }
+
+    def _parse_search_hits(self, search_data: Optional[Dict[str, Any]], query: str) -> Optional[List[Dict]]:
         """
-        Get detailed book information using the book ID
-        This method is kept for potential future use or for getting additional details
-        not available in search results
+        Extract the book documents from one `search` field of a GraphQL response.
+        Returns None if the search itself errored and a (possibly empty) list otherwise.
         """
-        if not book_id:
+        if not search_data:
+            logger.warning(f"No search data in API response for '{query}'")
             return None
-            
-        headers = {
-            "Authorization": self._get_auth_header(),
-            "Content-Type": "application/json",
-            "User-Agent": "BookRecommendationService/1.0"
+
+        # Check for errors first
+        if search_data.get("error"):
+            logger.error(f"Search API error: {search_data['error']}")
+            return None
+
+        # Results is a jsonb scalar containing search results structure
+        results_json = search_data.get("results")
+        if not results_json:
+            logger.warning(f"No results in search response for '{query}'")
+            return []
+
+        try:
+            # Parse the JSON results if it's a string
+            if isinstance(results_json, str):
+                results_data = json.loads(results_json)
+            else:
+                results_data = results_json  # Already parsed
+        except json.JSONDecodeError as e:
+            logger.error(f"Failed to parse search results JSON: {e}")
+            return None
+
+        # Extract hits from the search results structure
+        if not isinstance(results_data, dict) or "hits" not in results_data:
+            logger.warning(f"Unexpected results structure for '{query}': {type(results_data)}")
+            return None
+
+        hits = results_data["hits"]
+        if not hits:
+            logger.warning(f"No hits in search results for '{query}'")
+            return []
+
+        # Extract documents from hits
+        results = [hit["document"] for hit in hits if "document" in hit]
+        logger.info(f"Search for '{query}' returned {len(results)} results")
+
+        # Log the first few results for debugging
+        for i, book in enumerate(results[:3]):
+            title = book.get('title', 'Unknown Title')
+            author_names = book.get('author_names', [])
+            logger.info(f"Result {i+1}: '{title}' by {author_names}")
+
+        return results
+
+    def _match_search_results(self, results: List[Dict], title: str, author: str = "") -> Tuple[Optional[Dict[str, Any]], bool]:
+        """
+        Pick the best match for a book from search documents and normalize it.
+        Also reports whether the documents show the book is absent: results came
+        back, but none scored even ABSENT_FLOOR.
+        """
+        try:
+            # Find the best match from search results
+            book, absent = self._find_best_search_match(results, title, author)
+            if book:
+                # Extract metadata directly from search results
+                return self._extract_metadata_from_search_result(book), False
+            return None, absent
+        except Exception as e:
+            logger.error(f"Error processing search results: {e}")
+        return None, False
+
+    async def lookup_books_batch(self, books: List[Tuple[str, str]]) -> List[Tuple[Optional[Dict[str, Any]], str]]:
+        """
+        Look up several books in one GraphQL round trip, sending each book's first
+        search strategy as an aliased `search` field of a single document.
+        
+        Returns (metadata, status) per book in input order. LOOKUP_INCONCLUSIVE means
+        the first strategy matched nothing, so callers should fall back to
+        lookup_book_metadata(..., skip_strategies=1); LOOKUP_NOT_FOUND means its
+        results already showed the book is absent; LOOKUP_FAILED means the book
+        wasn't answered at all and needs a full lookup.
+        """
+        failed = [(None, LOOKUP_FAILED)] * len(books)
+        if not books or not settings.enable_hardcover_integration:
+            return failed
+        if not self.api_key or self.api_key.endswith("..."):
+            logger.warning("Hardcover API key is missing or truncated. Please check your .env file.")
+            return failed
+        if get_breaker("hardcover").is_open:
+            return failed
+
+        queries = [self._search_strategies(title, author)[0] for title, author in books]
+        documents: List[Optional[List[Dict]]] = [None] * len(queries)
+        cache_keys = [create_search_cache_key(query) for query in queries] if self.search_cache else []
+        for i, cache_key in enumerate(cache_keys):
+            cached = await self.search_cache.get(cache_key, "searches")
+            if cached is not None:
+                self.search_cache_hits += 1
+                documents[i] = cached["documents"]
+
+        # Only the queries the cache couldn't answer go over the network
+        uncached = [i for i, results in enumerate(documents) if results is None]
+        if uncached:
+            search_fields = await self._batch_search(queries, uncached)
+            if search_fields is None:
+                return failed
+            for i in uncached:
+                documents[i] = self._parse_search_hits(search_fields.get(f"b{i}"), queries[i])
+                if documents[i] is not None and self.search_cache:
+                    await self._store_search_documents(cache_keys[i], documents[i])
+
+        outcomes = []
+        for results, (title, author) in zip(documents, books):
+            if results is None:
+                outcomes.append((None, LOOKUP_FAILED))
+                continue
+            metadata, absent = self._match_search_results(results, title, author) if results else (None, False)
+            if metadata:
+                outcomes.append((metadata, LOOKUP_FOUND))
+            else:
+                outcomes.append((None, LOOKUP_NOT_FOUND if absent else LOOKUP_INCONCLUSIVE))
+        return outcomes
+
+    async def _batch_search(self, queries: List[str], indexes: List[int]) -> Optional[Dict[str, Any]]:
+        """
+        Send the queries at the given indexes as aliased `search` fields (b<index>) of
+        one GraphQL document. Returns the response's data fields, or None on failure.
+        """
+        variables = {"perPage": 10}
+        fields = []
+        for i in indexes:
+            query = queries[i]
+            variables[f"q{i}"] = query
+            fields.append(
+                f'b{i}: search(query: $q{i}, query_type: "books", per_page: $perPage, page: 1, '
+                f'sort: "activities_count:desc") {{ results error }}'
+            )
+        declarations = ", ".join(["$perPage: Int!"] + [f"$q{i}: String!" for i in indexes])
+        graphql_query = {
+            "query": f"query BatchSearchBooks({declarations}) {{\n" + "\n".join(fields) + "\n}",
+            "variables": variables
         }
+
+        logger.info(f"Batch searching {len(indexes)} books in one request")
+        try:
+            response = await self._post_graphql(graphql_query)
+            response.raise_for_status()
+            data = response.json()
+        except Exception as e:
+            logger.warning(f"Batch book search failed, falling back to per-book lookups: {e}")
+            return None
+
+        if data and "errors" in data:
+            logger.error(f"GraphQL errors: {data['errors']}")
+        return (data or {}).get("data") or {}
+
+    async def _get_book_details_by_id(self, book_id: str) -> Optional[Dict[str, Any]]:
+        """Get detailed book information using the book ID"""
+        if not book_id:
+            return None
+        
+        books = await self.get_books_by_ids([int(book_id)])
+        return books.get(int(book_id))
+
+    async def get_books_by_ids(self, book_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        Hydrate metadata for books whose hardcover_id is already known, in one
+        request using an `_in` filter. Returns {hardcover_id: metadata} for the
+        books Hardcover returned; missing ids are simply absent.
+        """
+        book_ids = sorted({int(book_id) for book_id in book_ids if book_id})
+        if not book_ids or not settings.enable_hardcover_integration:
+            return {}
         
-        # Use exact match query by ID (this should work since we're not using ilike)
         graphql_query = {
             "query": """
-            query GetBookDetails($bookId: Int!) {
-                books(where: {id: {_eq: $bookId}}, limit: 1) {
+            query GetBooksByIds($bookIds: [Int!]!, $limit: Int!) {
+                books(where: {id: {_in: $bookIds}}, limit: $limit) {
                     id
                     title
                     subtitle
@@ -259,131 +596,41 @@ class HardcoverService:
                 }
             }
             """,
-            "variables": {"bookId": int(book_id)}
+            "variables": {"bookIds": book_ids, "limit": len(book_ids)}
         }
         
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(self.api_url, headers=headers, json=graphql_query)
-                response.raise_for_status()
-                data = response.json()
+            response = await self._post_graphql(graphql_query)
+            response.raise_for_status()
+            data = response.json()
+
+            if data and "data" in data and data["data"].get("books"):
+                return {
+                    book_data["id"]: self._extract_metadata_from_book(book_data)
+                    for book_data in data["data"]["books"]
+                    if book_data.get("id") is not None
+                }
 
-                if data and "data" in data and "books" in data["data"] and data["data"]["books"]:
-                    book_data = data["data"]["books"][0]
-                    return self._extract_metadata_from_book(book_data)
-                    
         except Exception as e:
-            logger.error(f"Error getting book details for ID {book_id}: {e}")
+            logger.error(f"Error getting book details for IDs {book_ids}: {e}")
         
-        return None
+        return {}
 
-    def _find_best_search_match(self, results: List[Dict], query: str) -> Optional[Dict]:
-        """Find the best matching book from search results"""
+    def _find_best_search_match(self, results: List[Dict], title: str, author: str = "") -> Tuple[Optional[Dict], bool]:
+        """
+        Find the best matching book from search results for the wanted title and
+        author. Also returns whether the best candidate scored below ABSENT_FLOOR.
+        """
         if not results:
-            return None
-            
-        query_lower = query.lower().strip()
-        logger.info(f"Matching query '{query_lower}' against {len(results)} results")
-        
-        # Extract title and author from query
-        title_part = query_lower
-        author_part = ""
-        
-        if " by " in query_lower:
-            parts = query_lower.split(" by ")
-            title_part = parts[0].strip()
-            author_part = parts[1].strip() if len(parts) > 1 else ""
-        elif len(query_lower.split()) > 3:  # Likely "title author" format
-            words = query_lower.split()
-            # Assume last 1-2 words are author
-            title_part = " ".join(words[:-2])
-            author_part = " ".join(words[-2:])
-        
-        logger.info(f"Extracted - Title: '{title_part}', Author: '{author_part}'")
-        
-        # Score each result
-        scored_results = []
-        
-        for book in results:
-            if not book or not book.get("title"):
-                continue
-                
-            book_title = book.get("title", "").lower().strip()
-            score = 0
-            
-            # Title matching with multiple strategies
-            if book_title == title_part:
-                score = 100
-            elif title_part in book_title:
-                score = 90
-            elif book_title in title_part:
-                score = 85
-            else:
-                # Word overlap scoring
-                title_words = set(title_part.split())
-                book_words = set(book_title.split())
-                
-                # Remove common words that don't help with matching
-                stop_words = {"the", "a", "an", "of", "in", "on", "at", "to", "for", "with", "by"}
-                title_words = title_words - stop_words
-                book_words = book_words - stop_words
-                
-                if title_words and book_words:
-                    overlap = len(title_words & book_words)
-                    union = len(title_words | book_words)
-                    if overlap > 0:
-                        # Jaccard similarity
-                        similarity = overlap / union
-                        score = similarity * 80
-            
-            # Author matching if we have author info
-            if author_part and score > 0:
-                book_authors = book.get("author_names", [])
-                
-                author_match = False
-                for book_author in book_authors:
-                    book_author_lower = book_author.lower()
-                    # Check if author matches
-                    if author_part in book_author_lower or book_author_lower in author_part:
-                        author_match = True
-                        break
-                    
-                    # Check word overlap for author
-                    author_words = set(author_part.split())
-                    book_author_words = set(book_author_lower.split())
-                    if len(author_words & book_author_words) > 0:
-                        author_match = True
-                        break
-                
-                if author_match:
-                    score += 20  # Bonus for author match
-                else:
-                    score *= 0.7  # Penalty for author mismatch
-            
-            # Popularity bonuses (smaller impact)
-            if book.get("rating") and book["rating"] > 0:
-                score += min(5, book["rating"])
-            if book.get("users_count") and book["users_count"] > 100:
-                score += min(3, book["users_count"] / 1000)
-            
-            if score > 0:
-                scored_results.append((score, book))
-                logger.debug(f"  - '{book_title}' scored {score:.1f}")
-        
-        # Sort by score and return best match
-        if scored_results:
-            scored_results.sort(key=lambda x: x[0], reverse=True)
-            best_score, best_book = scored_results[0]
-            
-            # Much lower threshold since search endpoint should return relevant results
-            if best_score > 10:  # Reduced from 20
-                logger.info(f"Selected best match: '{best_book.get('title')}' (score: {best_score:.1f})")
-                return best_book
-            else:
-                logger.warning(f"Best match has too low score: {best_score:.1f}")
+            return None, False
         
-        logger.warning(f"No suitable match found for query: '{query_lower}'")
-        return None
+        book, score = top_match(title, author, results)
+        if book is not None and score >= MATCH_THRESHOLD:
+            logger.info(f"Selected best match: '{book.get('title')}' (score: {score:.2f})")
+            return book, False
+        
+        logger.warning(f"No suitable match found for '{title}' by '{author}' in {len(results)} results")
+        return None, book is not None and score < ABSENT_FLOOR
 
     def _extract_metadata_from_search_result(self, book_data: Dict) -> Dict[str, Any]:
         """Extract and normalize metadata from Hardcover search result document"""
@@ -423,8 +670,16 @@ class HardcoverService:
 
     def _extract_metadata_from_book(self, book_data: Dict) -> Dict[str, Any]:
         """Extract and normalize metadata from Hardcover book response (for direct book queries)"""
-        # This method is kept for compatibility and potential future use
-        return self._extract_metadata_from_search_result(book_data)
+        # Book rows list authors under contributions rather than the search
+        # documents' author_names; translators, illustrators etc. carry a
+        # contribution_type and are left out
+        author_names = [
+            contribution["author"]["name"]
+            for contribution in book_data.get("contributions") or []
+            if (contribution.get("author") or {}).get("name")
+            and contribution.get("contribution_type") in (None, "Author")
+        ]
+        return self._extract_metadata_from_search_result({**book_data, "author_names": author_names})
 
     async def get_multiple_books_metadata(self, books: List[tuple]) -> List[Optional[Dict[str, Any]]]:
         """
@@ -436,13 +691,11 @@ class HardcoverService:
         if not settings.enable_hardcover_integration:
             return [None] * len(books)
         
-        # Limit concurrent requests to respect rate limits (60/min according to docs)
+        # Limit concurrent lookups; pacing to the 60/min quota is done by the shared rate limiter
         semaphore = asyncio.Semaphore(min(5, settings.max_concurrent_book_requests))
         
         async def fetch_with_semaphore(title: str, author: str = ""):
             async with semaphore:
-                # Add delay between requests to respect rate limits
-                await asyncio.sleep(1.1)  # ~55 requests per minute to be safe
                 return await self.get_book_metadata(title, author)
         
         # Create tasks for all books
@@ -465,12 +718,6 @@ class HardcoverService:
     async def health_check(self) -> Dict[str, Any]:
         """Check if the Hardcover API is accessible"""
         try:
-            headers = {
-                "Authorization": self._get_auth_header(),
-                "Content-Type": "application/json",
-                "User-Agent": "BookRecommendationService/1.0"
-            }
-            
             # Simple GraphQL query to test connection using search
             # This avoids potential issues with the me query
             test_query = {
@@ -486,24 +733,23 @@ class HardcoverService:
                 """
             }
             
-            async with httpx.AsyncClient(timeout=5) as client:
-                response = await client.post(self.api_url, headers=headers, json=test_query)
-                response.raise_for_status()
-                data = response.json()
-                
-                if data and "data" in data and "search" in data["data"]:
-                    return {
-                        "status": "healthy",
-                        "api_accessible": True,
-                        "response_time": response.elapsed.total_seconds()
-                    }
-                else:
-                    return {
-                        "status": "unhealthy",
-                        "api_accessible": False,
-                        "error": "Invalid response format"
-                    }
-                    
+            response = await self._post_graphql(test_query, timeout=5)
+            response.raise_for_status()
+            data = response.json()
+
+            if data and "data" in data and "search" in data["data"]:
+                return {
+                    "status": "healthy",
+                    "api_accessible": True,
+                    "response_time": response.elapsed.total_seconds()
+                }
+            else:
+                return {
+                    "status": "unhealthy",
+                    "api_accessible": False,
+                    "error": "Invalid response format"
+                }
+
         except httpx.HTTPStatusError as e:
             return {
                 "status": "unhealthy",
@@ -528,12 +774,6 @@ class HardcoverService:
             # Create search query from themes
             search_query = " ".join(themes)
             
-            headers = {
-                "Authorization": self._get_auth_header(),
-                "Content-Type": "application/json",
-                "User-Agent": "BookRecommendationService/1.0"
-            }
-            
             graphql_query = {
                 "query": """
                 query SearchBooksByThemes($searchQuery: String!, $perPage: Int!) {
@@ -549,43 +789,42 @@ class HardcoverService:
                 }
             }
             
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(self.api_url, headers=headers, json=graphql_query)
-                response.raise_for_status()
-                data = response.json()
+            response = await self._post_graphql(graphql_query)
+            response.raise_for_status()
+            data = response.json()
+
+            if data and "data" in data and "search" in data["data"]:
+                search_data = data["data"]["search"]
+
+                # Check for errors first
+                if search_data.get("error"):
+                    logger.error(f"Search API error: {search_data['error']}")
+                    return []
+
+                # Parse results similar to _search_books method
+                results_json = search_data.get("results")
+                if results_json:
+                    try:
+                        import json
+                        if isinstance(results_json, str):
+                            results_data = json.loads(results_json)
+                        else:
+                            results_data = results_json
+
+                        if isinstance(results_data, dict) and "hits" in results_data:
+                            hits = results_data["hits"]
+                            results = []
+                            for hit in hits:
+                                if "document" in hit:
+                                    book_details = self._extract_metadata_from_search_result(hit["document"])
+                                    if book_details:
+                                        results.append(book_details)
+                                        if len(results) >= limit:
+                                            break
+                            return results
+                    except Exception as e:
+                        logger.error(f"Error processing theme search results: {e}")
 
-                if data and "data" in data and "search" in data["data"]:
-                    search_data = data["data"]["search"]
-                    
-                    # Check for errors first
-                    if search_data.get("error"):
-                        logger.error(f"Search API error: {search_data['error']}")
-                        return []
-                    
-                    # Parse results similar to _search_books method
-                    results_json = search_data.get("results")
-                    if results_json:
-                        try:
-                            import json
-                            if isinstance(results_json, str):
-                                results_data = json.loads(results_json)
-                            else:
-                                results_data = results_json
-                            
-                            if isinstance(results_data, dict) and "hits" in results_data:
-                                hits = results_data["hits"]
-                                results = []
-                                for hit in hits:
-                                    if "document" in hit:
-                                        book_details = self._extract_metadata_from_search_result(hit["document"])
-                                        if book_details:
-                                            results.append(book_details)
-                                            if len(results) >= limit:
-                                                break
-                                return results
-                        except Exception as e:
-                            logger.error(f"Error processing theme search results: {e}")
-                    
         except Exception as e:
             logger.error(f"Error searching books by themes {themes}: {e}")
         
@@ -0,0 +1,87 @@
+import httpx
+import asyncio
+import importlib.util
+from typing import Dict, Optional
+from app.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+# One long-lived client per upstream so lookups reuse pooled TCP/TLS connections.
+# prewarm_url is hit once at startup to open the first connection ahead of traffic.
+UPSTREAMS = {
+    "hardcover": {
+        "timeout": settings.hardcover_timeout_seconds,
+        "prewarm_url": "https://api.hardcover.app/v1/graphql"
+    },
+    "tmdb": {
+        "timeout": 10.0,
+        "prewarm_url": "https://api.themoviedb.org/3/configuration"
+    },
+    "keep_alive": {
+        "timeout": 30.0,
+        "prewarm_url": None
+    }
+}
+
+_clients: Dict[str, httpx.AsyncClient] = {}
+
+def _http2_available() -> bool:
+    """HTTP/2 needs the optional h2 package (pip install httpx[http2])"""
+    return importlib.util.find_spec("h2") is not None
+
+def _build_client(name: str) -> httpx.AsyncClient:
+    upstream = UPSTREAMS[name]
+
+    http2 = settings.http2_enabled
+    if http2 and not _http2_available():
+        logger.warning("HTTP/2 requested but the h2 package is not installed; using HTTP/1.1")
+        http2 = False
+
+    return httpx.AsyncClient(
+        timeout=upstream["timeout"],
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+            keepalive_expiry=settings.http_keepalive_expiry_seconds
+        )
+    )
+
+def get_client(name: str) -> httpx.AsyncClient:
+    """
+    Get the shared client for an upstream. Clients are normally created in the
+    app lifespan; standalone scripts get one lazily on first use.
+    """
+    client = _clients.get(name)
+    if client is None or client.is_closed:
+        client = _build_client(name)
+        _clients[name] = client
+    return client
+
+async def start_clients():
+    """Create every upstream client"""
+    for name in UPSTREAMS:
+        get_client(name)
+
+async def prewarm_clients(timeout: float = 5.0):
+    """Open one pooled connection per upstream so the first real lookup skips the handshake"""
+    async def _prewarm(name: str, url: Optional[str]):
+        try:
+            await get_client(name).head(url, timeout=timeout)
+            logger.info(f"Pre-warmed {name} HTTP client")
+        except httpx.HTTPError as e:
+            logger.warning(f"Pre-warming {name} HTTP client failed: {e}")
+
+    await asyncio.gather(*[
+        _prewarm(name, upstream["prewarm_url"])
+        for name, upstream in UPSTREAMS.items()
+        if upstream["prewarm_url"]
+    ])
+
+async def close_clients():
+    """Close every client and its pooled connections"""
+    clients = list(_clients.values())
+    _clients.clear()
+    for client in clients:
+        await client.aclose()
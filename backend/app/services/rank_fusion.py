@@ -0,0 +1,78 @@
+from typing import Any, Dict, List, Optional, Tuple
+from app.services.book_matching import AuthorSignature, TitleSignature
+
+# Reciprocal rank fusion damping constant; the usual choice, so rank differences
+# only matter a little next to how many lists agree on a book
+RRF_K = 60
+
+# taste_match_score assumed for books GPT didn't score
+DEFAULT_MATCH_SCORE = 0.7
+
+def book_key(book: Dict[str, Any]) -> str:
+    """
+    Identity of a book across lists, insensitive to case, punctuation, leading
+    articles, subtitles, series markers and authors' first names
+    """
+    title = TitleSignature.build(book.get("title"))
+    author = AuthorSignature.build([book.get("author") or ""])
+    return f"{' '.join(sorted(title.tokens))}|{' '.join(sorted(author.surnames))}"
+
+def _match_score(book: Dict[str, Any]) -> float:
+    score = book.get("taste_match_score")
+    return score if isinstance(score, (int, float)) else DEFAULT_MATCH_SCORE
+
+def fuse_ranked_lists(ranked_lists: List[List[Dict[str, Any]]], k: int = RRF_K) -> List[Tuple[float, Dict[str, Any]]]:
+    """
+    Score-weighted reciprocal rank fusion: each list contributes
+    taste_match_score / (k + rank) for every book it contains. Returns
+    (score, book) best first, keeping the copy of each book from the list
+    that ranked it highest.
+    """
+    scores: Dict[str, float] = {}
+    best: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+    for ranked in ranked_lists:
+        seen = set()
+        for rank, book in enumerate(ranked, start=1):
+            key = book_key(book)
+            if key in seen:
+                continue
+            seen.add(key)
+            scores[key] = scores.get(key, 0.0) + _match_score(book) / (k + rank)
+            if key not in best or rank < best[key][0]:
+                best[key] = (rank, book)
+
+    fused = [(score, best[key][1]) for key, score in scores.items()]
+    fused.sort(key=lambda item: item[0], reverse=True)
+    return fused
+
+def fusion_confidence(fused: List[Tuple[float, Dict[str, Any]]], list_count: int, k: int = RRF_K) -> float:
+    """
+    Mean fused score of the given books relative to a book every list ranks
+    first with a perfect match score. Roughly the share of lists that agree on
+    each book, weighted by how well they say it matches; books that only one
+    of several movies supports pull it down.
+    """
+    if not fused or list_count <= 0:
+        return 0.0
+    ceiling = list_count / (k + 1)
+    return sum(score for score, _ in fused) / len(fused) / ceiling
+
+def merge_taste_profiles(profiles: List[Dict[str, Any]], max_themes: int = 5) -> Optional[Dict[str, Any]]:
+    """
+    One profile for several movies: themes interleaved from every profile, the
+    descriptive fields from the most confident one
+    """
+    profiles = [profile for profile in profiles if profile]
+    if not profiles:
+        return None
+
+    themes: List[str] = []
+    for position in range(max(len(profile.get("themes") or []) for profile in profiles)):
+        for profile in profiles:
+            profile_themes = profile.get("themes") or []
+            if position < len(profile_themes) and profile_themes[position] not in themes:
+                themes.append(profile_themes[position])
+
+    merged = dict(max(profiles, key=lambda profile: profile.get("confidence_score") or 0.0))
+    merged["themes"] = themes[:max_themes]
+    return merged
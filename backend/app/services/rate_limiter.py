@@ -0,0 +1,108 @@
+import asyncio
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Used when an upstream answers 429 without a usable Retry-After header
+DEFAULT_RETRY_AFTER_SECONDS = 5.0
+
+class AsyncTokenBucket:
+    """
+    Process-wide token bucket shared by every call to one upstream.
+
+    Callers queue on a FIFO lock, so they are served in arrival order. A 429
+    blocks the bucket until its Retry-After has passed and halves the refill
+    rate; each successful call then recovers the rate a step at a time
+    (additive increase, multiplicative decrease).
+    """
+
+    def __init__(self, rate_per_minute: float, burst: int, min_rate_fraction: float = 0.1):
+        self.base_rate = rate_per_minute / 60
+        self.rate = self.base_rate
+        self.min_rate = self.base_rate * min_rate_fraction
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated_at = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = asyncio.Lock()
+        self._waiting = 0
+        self.acquired = 0
+        self.throttled = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated_at
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated_at = now
+
+    async def acquire(self):
+        """Wait for a token; callers are served first come, first served"""
+        start = time.monotonic()
+        self._waiting += 1
+        try:
+            async with self._lock:
+                while True:
+                    now = time.monotonic()
+                    if now < self._blocked_until:
+                        await asyncio.sleep(self._blocked_until - now)
+                        continue
+
+                    self._refill(now)
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        break
+                    await asyncio.sleep((1 - self._tokens) / self.rate)
+        finally:
+            self._waiting -= 1
+
+        waited = time.monotonic() - start
+        self.acquired += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+
+    def record_success(self):
+        """Step the refill rate back towards the configured quota"""
+        if self.rate < self.base_rate:
+            self._refill(time.monotonic())
+            self.rate = min(self.base_rate, self.rate + self.base_rate * 0.05)
+
+    def record_throttled(self, retry_after: Optional[float] = None):
+        """Back off after a 429: hold every caller until Retry-After and halve the rate"""
+        now = time.monotonic()
+        delay = retry_after if retry_after is not None else DEFAULT_RETRY_AFTER_SECONDS
+        self._refill(now)
+        self._tokens = 0.0
+        self._blocked_until = max(self._blocked_until, now + delay)
+        self.rate = max(self.min_rate, self.rate / 2)
+        self.throttled += 1
+        logger.warning(f"Rate limited upstream; pausing {delay:.1f}s, rate now {self.rate * 60:.1f}/min")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'queue_depth': self._waiting,
+            'tokens': round(min(self.capacity, self._tokens), 2),
+            'rate_per_minute': round(self.rate * 60, 2),
+            'base_rate_per_minute': round(self.base_rate * 60, 2),
+            'blocked_for_seconds': round(max(0.0, self._blocked_until - time.monotonic()), 2),
+            'acquired': self.acquired,
+            'throttled': self.throttled,
+            'avg_wait_seconds': self.total_wait / self.acquired if self.acquired else 0.0,
+            'max_wait_seconds': self.max_wait
+        }
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given either as seconds or as an HTTP date"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
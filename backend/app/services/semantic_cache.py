@@ -0,0 +1,244 @@
+import hashlib
+import heapq
+import logging
+import os
+import zipfile
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from app.services.book_matching import STOP_WORDS, normalize_text, strip_series_markers
+
+logger = logging.getLogger(__name__)
+
+# Hashed buckets for each block of a request vector
+MOVIE_DIMENSIONS = 192
+PREFERENCE_DIMENSIONS = 32
+THEME_DIMENSIONS = 32
+DIMENSIONS = MOVIE_DIMENSIONS + PREFERENCE_DIMENSIONS + THEME_DIMENSIONS
+
+# Share of the similarity each block carries when both requests have it
+MOVIE_WEIGHT = 0.55
+PREFERENCE_WEIGHT = 0.3
+THEME_WEIGHT = 0.15
+
+# A whole title counts for more than the words in it, so "The Dark Knight" is
+# close to "The Dark Knight Rises" but closer still to itself
+TITLE_TOKEN_WEIGHT = 1.0
+WORD_TOKEN_WEIGHT = 0.5
+
+SEARCH_MODES = ("vectorized", "brute_force")
+
+def _bucket(token: str, dimensions: int) -> Tuple[int, float]:
+    # blake2b rather than hash(): the same token must land in the same bucket in every process
+    digest = int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), "little")
+    return digest % dimensions, 1.0 if digest >> 63 else -1.0
+
+def _hashed(weighted_tokens: Iterable[Tuple[str, float]], dimensions: int) -> np.ndarray:
+    vector = np.zeros(dimensions, dtype=np.float32)
+    for token, weight in weighted_tokens:
+        index, sign = _bucket(token, dimensions)
+        vector[index] += sign * weight
+    return vector
+
+def _unit(vector: np.ndarray) -> np.ndarray:
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm > 0 else vector
+
+def _movie_tokens(movie: str) -> List[Tuple[str, float]]:
+    title = normalize_text(strip_series_markers(movie))
+    words = [word for word in title.split() if word not in STOP_WORDS]
+    return [(f"title:{title}", TITLE_TOKEN_WEIGHT)] + [(f"word:{word}", WORD_TOKEN_WEIGHT) for word in words]
+
+def featurize(
+    movies: List[str],
+    preferences: Optional[Dict[str, Any]] = None,
+    themes: Optional[List[str]] = None
+) -> np.ndarray:
+    """
+    Unit vector for a request: hashed movie titles and their words, preference
+    values and taste profile theme words, one block each. Every movie counts
+    equally however long its title; a block that is empty drops out and the
+    others share its weight.
+    """
+    movie_block = np.zeros(MOVIE_DIMENSIONS, dtype=np.float32)
+    for movie in dict.fromkeys(movies):
+        movie_block += _unit(_hashed(_movie_tokens(movie), MOVIE_DIMENSIONS))
+
+    preferences = preferences or {}
+    preference_tokens = [
+        (f"{field}:{normalize_text(preferences[field])}", 1.0)
+        for field in ("mood", "pace") if preferences.get(field)
+    ]
+    preference_tokens += [
+        (f"genre:{normalize_text(genre)}", 1.0) for genre in preferences.get("genre_preferences") or []
+    ]
+    preference_block = _hashed(preference_tokens, PREFERENCE_DIMENSIONS)
+
+    theme_block = _hashed(
+        [(f"theme:{word}", 1.0) for theme in themes or [] for word in normalize_text(theme).split()],
+        THEME_DIMENSIONS
+    )
+
+    return _unit(np.concatenate([
+        _unit(movie_block) * np.sqrt(MOVIE_WEIGHT),
+        _unit(preference_block) * np.sqrt(PREFERENCE_WEIGHT),
+        _unit(theme_block) * np.sqrt(THEME_WEIGHT)
+    ])).astype(np.float32)
+
+def partition_key(preferences: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Requests are only compared with others that block the same genres; an
+    answer recommending a genre the user excluded is never close enough
+    """
+    blocklist = (preferences or {}).get("genre_blocklist") or []
+    return "|".join(sorted({normalize_text(genre) for genre in blocklist}))
+
+class _Partition:
+    """Unit row vectors in one growable float32 matrix, with the cache key of each row"""
+
+    def __init__(self):
+        self.matrix = np.zeros((16, DIMENSIONS), dtype=np.float32)
+        self.keys: List[str] = []
+        self.rows: Dict[str, int] = {}
+
+    def add(self, key: str, vector: np.ndarray):
+        row = self.rows.get(key)
+        if row is None:
+            row = len(self.keys)
+            if row == len(self.matrix):
+                self.matrix = np.concatenate([self.matrix, np.zeros_like(self.matrix)])
+            self.keys.append(key)
+            self.rows[key] = row
+        self.matrix[row] = vector
+
+    def remove(self, key: str):
+        # Move the last row into the gap so the live rows stay contiguous
+        row = self.rows.pop(key)
+        last = len(self.keys) - 1
+        if row != last:
+            moved = self.keys[last]
+            self.matrix[row] = self.matrix[last]
+            self.keys[row] = moved
+            self.rows[moved] = row
+        self.keys.pop()
+
+    def vector(self, key: str) -> np.ndarray:
+        return self.matrix[self.rows[key]]
+
+    def nearest_vectorized(self, vector: np.ndarray, k: int) -> List[Tuple[float, str]]:
+        count = len(self.keys)
+        scores = self.matrix[:count] @ vector
+        if k < count:
+            top = np.argpartition(scores, count - k)[count - k:]
+        else:
+            top = np.arange(count)
+        top = top[np.argsort(scores[top])[::-1]]
+        return [(float(scores[row]), self.keys[row]) for row in top]
+
+    def nearest_brute_force(self, vector: np.ndarray, k: int) -> List[Tuple[float, str]]:
+        scored = ((float(np.dot(self.matrix[row], vector)), self.keys[row]) for row in range(len(self.keys)))
+        return heapq.nlargest(k, scored, key=lambda item: item[0])
+
+class SemanticIndex:
+    """
+    In-memory nearest-neighbour index from request vectors to recommendation
+    cache keys. Vectors are unit length, so a dot product is their cosine
+    similarity. Entries are evicted oldest first past max_entries; the cache
+    itself stays the source of truth, and callers remove keys whose cache
+    entry has gone. save and load carry the index across restarts.
+    """
+
+    def __init__(self, max_entries: int = 5000, mode: str = "vectorized"):
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Unknown semantic cache search mode: {mode}")
+        self.max_entries = max_entries
+        self.mode = mode
+        self._partitions: Dict[str, _Partition] = {}
+        self._order: "OrderedDict[str, str]" = OrderedDict()
+        self.searches = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def add(self, key: str, vector: np.ndarray, partition: str = ""):
+        if key in self._order and self._order[key] != partition:
+            self.remove(key)
+        self._partitions.setdefault(partition, _Partition()).add(key, vector)
+        self._order[key] = partition
+        self._order.move_to_end(key)
+
+        while len(self._order) > self.max_entries:
+            oldest = next(iter(self._order))
+            self.remove(oldest)
+            self.evictions += 1
+
+    def remove(self, key: str):
+        partition = self._order.pop(key, None)
+        if partition is None:
+            return
+        self._partitions[partition].remove(key)
+        if not self._partitions[partition].keys:
+            del self._partitions[partition]
+
+    def nearest(
+        self,
+        vector: np.ndarray,
+        partition: str = "",
+        k: int = 1,
+        mode: Optional[str] = None
+    ) -> List[Tuple[float, str]]:
+        """Up to k (similarity, key) pairs from the partition, most similar first"""
+        self.searches += 1
+        entries = self._partitions.get(partition)
+        if entries is None:
+            return []
+        if (mode or self.mode) == "brute_force":
+            return entries.nearest_brute_force(vector, k)
+        return entries.nearest_vectorized(vector, k)
+
+    def save(self, path: Path):
+        """Write every key, partition and vector to path, oldest first, replacing it atomically"""
+        keys = list(self._order)
+        vectors = [self._partitions[self._order[key]].vector(key) for key in keys]
+        staging = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(staging, "wb") as f:
+            np.savez(
+                f,
+                keys=np.array(keys, dtype=str),
+                partitions=np.array([self._order[key] for key in keys], dtype=str),
+                vectors=np.array(vectors, dtype=np.float32).reshape(len(keys), DIMENSIONS)
+            )
+        os.replace(staging, path)
+
+    @classmethod
+    def load(cls, path: Path, max_entries: int = 5000, mode: str = "vectorized") -> "SemanticIndex":
+        """The index saved at path, or an empty one if there is none or it is unreadable"""
+        index = cls(max_entries, mode)
+        if not path.exists():
+            return index
+        try:
+            with np.load(path, allow_pickle=False) as saved:
+                keys, partitions, vectors = saved["keys"], saved["partitions"], saved["vectors"]
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile) as e:
+            logger.warning(f"Semantic index at {path} not loaded: {e}")
+            return index
+        if vectors.shape[1:] != (DIMENSIONS,):
+            logger.warning(f"Semantic index at {path} not loaded: vectors have shape {vectors.shape}")
+            return index
+
+        for key, partition, vector in zip(keys, partitions, vectors):
+            index.add(str(key), vector, str(partition))
+        return index
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._order),
+            "partitions": len(self._partitions),
+            "mode": self.mode,
+            "searches": self.searches,
+            "evictions": self.evictions
+        }
@@ -1,7 +1,8 @@
-import httpx
 import asyncio
 from typing import Optional, Dict, Any, List
 from app.config import settings
+from app.services import http_clients
+from app.services.circuit_breaker import CircuitOpenError, get_breaker
 import logging
 
 logger = logging.getLogger(__name__)
@@ -20,6 +21,36 @@ class TMDBService:
         if not query or len(query.strip()) < 2:
             return self._get_fallback_movies()
 
+        results = await self._search(query)
+
+        # Transform to match frontend expectations
+        movies = []
+        for movie in results[:10]:  # Limit to 10 results
+            movies.append({
+                "id": movie.get("id"),
+                "title": movie.get("title", ""),
+                "poster_path": movie.get("poster_path"),
+                "release_date": movie.get("release_date", ""),
+                "vote_average": movie.get("vote_average", 0),
+                "overview": movie.get("overview", ""),
+                "popularity": movie.get("popularity", 0)
+            })
+
+        if movies:
+            return movies
+
+        # Return fallback movies if API fails
+        return self._get_fallback_movies()
+
+    async def get_movie_overview(self, title: str) -> Optional[str]:
+        """Plot overview of the best TMDB match for a movie title, or None"""
+        for movie in await self._search(title):
+            if movie.get("overview"):
+                return movie["overview"]
+        return None
+
+    async def _search(self, query: str) -> List[Dict[str, Any]]:
+        """Raw TMDB search results by popularity; empty if TMDB is unavailable"""
         try:
             url = f"{self.base_url}/search/movie"
             params = {
@@ -36,34 +67,20 @@ class TMDBService:
                 "Authorization": f"Bearer {self.read_access_token}"
             }
 
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(url, params=params, headers=headers)
-
-                if response.status_code == 200:
-                    data = response.json()
-                    results = data.get("results", [])
-
-                    # Transform to match frontend expectations
-                    movies = []
-                    for movie in results[:10]:  # Limit to 10 results
-                        movies.append({
-                            "id": movie.get("id"),
-                            "title": movie.get("title", ""),
-                            "poster_path": movie.get("poster_path"),
-                            "release_date": movie.get("release_date", ""),
-                            "vote_average": movie.get("vote_average", 0),
-                            "overview": movie.get("overview", ""),
-                            "popularity": movie.get("popularity", 0)
-                        })
+            client = http_clients.get_client("tmdb")
+            async with get_breaker("tmdb").guard() as call:
+                response = await client.get(url, params=params, headers=headers, timeout=self.timeout)
+                call.failed = response.status_code >= 500
 
-                    if movies:
-                        return movies
+            if response.status_code == 200:
+                return response.json().get("results", [])
 
+        except CircuitOpenError:
+            logger.warning("TMDB circuit breaker is open; skipping search")
         except Exception as e:
             logger.error(f"Error searching TMDB: {e}")
 
-        # Return fallback movies if API fails
-        return self._get_fallback_movies()
+        return []
 
     def _get_fallback_movies(self) -> List[Dict[str, Any]]:
         """
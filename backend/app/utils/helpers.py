@@ -1 +1,107 @@
-# Add helper functions here
\ No newline at end of file
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Coroutine, Dict, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Strong references to fire-and-forget tasks so they aren't garbage collected mid-flight
+_background_tasks: Set[asyncio.Task] = set()
+
+def spawn_background(coro: Coroutine) -> asyncio.Task:
+    """Run a coroutine in the background, logging rather than raising its errors"""
+    task = asyncio.ensure_future(coro)
+    _background_tasks.add(task)
+
+    def _done(finished: asyncio.Task):
+        _background_tasks.discard(finished)
+        if not finished.cancelled() and finished.exception() is not None:
+            logger.error(f"Background task failed: {finished.exception()}")
+
+    task.add_done_callback(_done)
+    return task
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls that share a key into one in-flight execution.
+
+    The work runs in its own task, so a caller that disconnects doesn't cancel
+    it for the others still waiting on the same key.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """Run fn once per key; returns (result, coalesced)"""
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            return await asyncio.shield(task), True
+
+        self.executions += 1
+        task = asyncio.ensure_future(fn())
+        self._inflight[key] = task
+        task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task), False
+
+    def is_in_flight(self, key: str) -> bool:
+        return key in self._inflight
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._inflight)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'executions': self.executions,
+            'coalesced': self.coalesced,
+            'in_flight': self.in_flight
+        }
+
+class KeyedLock:
+    """
+    Serialize async read-modify-write sections that share a key. Unlike
+    SingleFlight every caller runs; a lock is dropped once nobody holds or waits on it.
+    """
+
+    def __init__(self):
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._waiters: Dict[str, int] = {}
+
+    @asynccontextmanager
+    async def hold(self, key: str):
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        try:
+            async with lock:
+                yield
+        finally:
+            self._waiters[key] -= 1
+            if not self._waiters[key]:
+                del self._waiters[key]
+                del self._locks[key]
+
+class Deadline:
+    """
+    A time budget shared by every step of one request. Waiting on work through
+    the deadline never cancels it, so whatever overruns can finish in the background.
+    """
+
+    def __init__(self, seconds: float):
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() == 0.0
+
+    async def wait(self, task: asyncio.Future) -> bool:
+        """Wait for task until the deadline; True if it finished in time"""
+        done, _ = await asyncio.wait({task}, timeout=self.remaining())
+        return bool(done)
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Compare the legacy _find_best_search_match (guesses title/author from the query
+string, ad-hoc Jaccard) with app.services.book_matching on a labelled fixture of
+Hardcover search results.
+
+Reports accuracy, wrong books accepted, CPU time per match (with the signature
+cache cold and warm), and Hardcover round trips: each search strategy is simulated
+as returning the fixture's candidates, and a lookup stops at the first strategy
+whose results the matcher accepts or, for the new matcher, whose best candidate
+scores below ABSENT_FLOOR.
+
+Run from the backend directory:
+    python benchmarks/book_matching.py
+"""
+
+import json
+import os
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+os.environ.setdefault("HARDCOVER_API_KEY", "benchmark")
+
+from app.services.book_matching import ABSENT_FLOOR, MATCH_THRESHOLD, clear_signature_cache, top_match
+from app.services.hardcover_service import HardcoverService
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "book_matching.json")
+TIMING_ROUNDS = 200
+
+def legacy_find_best_search_match(results: List[Dict], query: str) -> Optional[Dict]:
+    """_find_best_search_match before the book_matching module, minus logging"""
+    if not results:
+        return None
+        
+    query_lower = query.lower().strip()
+    
+    # Extract title and author from query
+    title_part = query_lower
+    author_part = ""
+    
+    if " by " in query_lower:
+        parts = query_lower.split(" by ")
+        title_part = parts[0].strip()
+        author_part = parts[1].strip() if len(parts) > 1 else ""
+    elif len(query_lower.split()) > 3:  # Likely "title author" format
+        words = query_lower.split()
+        # Assume last 1-2 words are author
+        title_part = " ".join(words[:-2])
+        author_part = " ".join(words[-2:])
+    
+    
+    # Score each result
+    scored_results = []
+    
+    for book in results:
+        if not book or not book.get("title"):
+            continue
+            
+        book_title = book.get("title", "").lower().strip()
+        score = 0
+        
+        # Title matching with multiple strategies
+        if book_title == title_part:
+            score = 100
+        elif title_part in book_title:
+            score = 90
+        elif book_title in title_part:
+            score = 85
+        else:
+            # Word overlap scoring
+            title_words = set(title_part.split())
+            book_words = set(book_title.split())
+            
+            # Remove common words that don't help with matching
+            stop_words = {"the", "a", "an", "of", "in", "on", "at", "to", "for", "with", "by"}
+            title_words = title_words - stop_words
+            book_words = book_words - stop_words
+            
+            if title_words and book_words:
+                overlap = len(title_words & book_words)
+                union = len(title_words | book_words)
+                if overlap > 0:
+                    # Jaccard similarity
+                    similarity = overlap / union
+                    score = similarity * 80
+        
+        # Author matching if we have author info
+        if author_part and score > 0:
+            book_authors = book.get("author_names", [])
+            
+            author_match = False
+            for book_author in book_authors:
+                book_author_lower = book_author.lower()
+                # Check if author matches
+                if author_part in book_author_lower or book_author_lower in author_part:
+                    author_match = True
+                    break
+                
+                # Check word overlap for author
+                author_words = set(author_part.split())
+                book_author_words = set(book_author_lower.split())
+                if len(author_words & book_author_words) > 0:
+                    author_match = True
+                    break
+            
+            if author_match:
+                score += 20  # Bonus for author match
+            else:
+                score *= 0.7  # Penalty for author mismatch
+        
+        # Popularity bonuses (smaller impact)
+        if book.get("rating") and book["rating"] > 0:
+            score += min(5, book["rating"])
+        if book.get("users_count") and book["users_count"] > 100:
+            score += min(3, book["users_count"] / 1000)
+        
+        if score > 0:
+            scored_results.append((score, book))
+    
+    # Sort by score and return best match
+    if scored_results:
+        scored_results.sort(key=lambda x: x[0], reverse=True)
+        best_score, best_book = scored_results[0]
+        
+        # Much lower threshold since search endpoint should return relevant results
+        if best_score > 10:  # Reduced from 20
+            return best_book
+    
+    return None
+def new_find_best_search_match(results: List[Dict], title: str, author: str) -> Tuple[Optional[Dict], bool]:
+    """HardcoverService._find_best_search_match minus logging: (match, whether the book is clearly absent)"""
+    book, score = top_match(title, author, results)
+    if book is not None and score >= MATCH_THRESHOLD:
+        return book, False
+    return None, book is not None and score < ABSENT_FLOOR
+
+def evaluate(name: str, cases: list, strategies: list, match, reset=None) -> None:
+    correct = wrong = missed = 0
+    trips_present = trips_absent = 0
+    for case, case_strategies in zip(cases, strategies):
+        chosen = None
+        for trips, query in enumerate(case_strategies, start=1):
+            chosen, absent = match(case, query)
+            if chosen or absent:
+                break
+        if case["expected_id"] is None:
+            trips_absent += trips
+        else:
+            trips_present += trips
+
+        chosen_id = chosen["id"] if chosen else None
+        if chosen_id == case["expected_id"]:
+            correct += 1
+        elif chosen_id is None:
+            missed += 1
+        else:
+            wrong += 1
+
+    # CPU time of one match call over the first strategy's results, with cold and warm caches
+    def time_calls(cold: bool) -> float:
+        start = time.perf_counter()
+        for _ in range(TIMING_ROUNDS):
+            for case, case_strategies in zip(cases, strategies):
+                if cold and reset:
+                    reset()
+                match(case, case_strategies[0])
+        return (time.perf_counter() - start) / (TIMING_ROUNDS * len(cases)) * 1e6
+
+    print(
+        f"{name:<10}{correct:>5}/{len(cases):<4}{wrong:>8}{missed:>8}"
+        f"{trips_present:>10}{trips_absent:>10}{time_calls(True):>10.1f}{time_calls(False):>10.1f}"
+    )
+
+def main():
+    with open(FIXTURE, "r", encoding="utf-8") as f:
+        cases = json.load(f)["cases"]
+
+    service = HardcoverService()
+    strategies = [service._search_strategies(case["title"], case["author"]) for case in cases]
+    present = sum(1 for case in cases if case["expected_id"] is not None)
+
+    print(f"{len(cases)} labelled cases ({present} present in results, {len(cases) - present} absent), "
+          f"{sum(len(s) for s in strategies)} strategies in total")
+    print("Round trips: searches until the matcher accepts a result (a wrong book also stops the search)")
+    print(f"{'matcher':<10}{'correct':>10}{'wrong':>8}{'missed':>8}{'trips+':>10}{'trips-':>10}{'cold us':>10}{'warm us':>10}")
+    evaluate("legacy", cases, strategies, lambda case, query: (legacy_find_best_search_match(case["candidates"], query), False))
+    evaluate(
+        "new",
+        cases,
+        strategies,
+        lambda case, query: new_find_best_search_match(case["candidates"], case["title"], case["author"]),
+        reset=clear_signature_cache
+    )
+
+if __name__ == "__main__":
+    main()
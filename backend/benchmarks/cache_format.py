@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Benchmark cache format v2 (pretty-printed JSON envelope) against v3 (binary header +
+compact JSON), with and without zlib, on a recommendation-sized payload.
+
+Run from the backend directory:
+    python benchmarks/cache_format.py
+"""
+
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.models.response_models import (
+    BookRecommendation,
+    EnhancedRecommendationResponse,
+    RecommendationInsights,
+    RecommendationResponse,
+    TasteProfile
+)
+from app.services.cache_backends import decode_entry, encode_entry
+
+ITERATIONS = 2000
+
+VOCABULARY = (
+    "desert empire prophecy ecology politics sandworm spice betrayal dynasty heir memory identity "
+    "android replicant language alien contact grief time loop city rain neon detective conspiracy "
+    "ocean station colony rebellion faith machine dream archive exile frontier winter war crown"
+).split()
+
+def prose(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(VOCABULARY) for _ in range(words)).capitalize() + "."
+
+def build_payload() -> dict:
+    """A unified recommendation with five fully enriched books"""
+    rng = random.Random(42)
+    books = [
+        BookRecommendation(
+            title=f"Recommended Book {i}",
+            author=f"Author Name {i}",
+            reason=prose(rng, 90),
+            rating=4.2,
+            cover_url=f"https://assets.hardcover.app/editions/{1000 + i}/cover.jpg",
+            hardcover_url=f"https://hardcover.app/books/recommended-book-{i}",
+            taste_match_score=0.9,
+            primary_appeal="Complex world-building with moral ambiguity",
+            genre_tags=["Science Fiction", "Fantasy", "Classics", "Adventure"],
+            isbn="9780441172719",
+            publication_year=1965,
+            page_count=612,
+            publisher="Ace",
+            hardcover_id=312460 + i,
+            users_count=52000,
+            description=prose(rng, 160)
+        )
+        for i in range(5)
+    ]
+    response = EnhancedRecommendationResponse(
+        recommendations=[RecommendationResponse(
+            movie="Based on your taste profile from Dune, Blade Runner 2049, and Arrival",
+            books=books,
+            taste_profile=TasteProfile(
+                themes=["identity", "isolation", "human potential"],
+                narrative_style="Deliberate, atmospheric and idea-driven",
+                emotional_tone="Melancholic awe",
+                genre_fusion="Cerebral science fiction with literary ambitions",
+                character_preferences="Introspective protagonists facing vast forces",
+                artistic_sensibilities="Striking visual worlds and restrained dialogue",
+                confidence_score=0.88
+            )
+        )],
+        insights=RecommendationInsights(
+            total_movies_analyzed=3,
+            dominant_themes=["identity", "isolation", "human potential"],
+            genre_diversity_score=0.4,
+            recommendation_confidence=0.88
+        ),
+        processing_time=6.2
+    )
+    return json.loads(response.model_dump_json())
+
+def encode_v2(value: dict) -> str:
+    now = datetime.now()
+    return json.dumps({
+        'value': value,
+        'created_at': now.isoformat(),
+        'expired_at': (now + timedelta(hours=1)).isoformat(),
+        'key': 'movies_v2:0123456789abcdef0123456789abcdef',
+        'cache_type': 'recommendations',
+        'version': '2.0'
+    }, indent=2)
+
+def decode_v2(content: str) -> dict:
+    cache_data = json.loads(content)
+    datetime.fromisoformat(cache_data['expired_at'])
+    return cache_data['value']
+
+def time_per_op(fn) -> float:
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        fn()
+    return (time.perf_counter() - start) / ITERATIONS * 1e6
+
+async def main():
+    value = build_payload()
+    created_at = time.time()
+    expired_at = created_at + 3600
+
+    with tempfile.TemporaryDirectory() as tmp:
+        v2_path = Path(tmp) / "entry.json"
+        v3_path = Path(tmp) / "entry.bin"
+
+        def set_v2():
+            v2_path.write_text(encode_v2(value))
+
+        def get_v2():
+            decode_v2(v2_path.read_text())
+
+        def v3_ops(compress_min_bytes: int):
+            def set_v3():
+                v3_path.write_bytes(encode_entry(value, created_at, expired_at, compress_min_bytes))
+
+            def get_v3():
+                decode_entry(v3_path.read_bytes())
+
+            set_us = time_per_op(set_v3)
+            return set_us, time_per_op(get_v3), v3_path.stat().st_size
+
+        results = {
+            'v2': (time_per_op(set_v2), time_per_op(get_v2), v2_path.stat().st_size),
+            'v3': v3_ops(0),
+            'v3+zlib': v3_ops(1),
+        }
+
+    print(f"Recommendation payload, {ITERATIONS} iterations")
+    print(f"{'format':<10}{'bytes':>10}{'set µs':>12}{'get µs':>12}")
+    for name, (set_us, get_us, size) in results.items():
+        print(f"{name:<10}{size:>10}{set_us:>12.1f}{get_us:>12.1f}")
+
+    v2 = results['v2']
+    for name in ('v3', 'v3+zlib'):
+        other = results[name]
+        print(f"{name}: {v2[2] / other[2]:.1f}x smaller on disk, "
+              f"set {v2[0] / other[0]:.2f}x, get {v2[1] / other[1]:.2f}x relative to v2")
+
+if __name__ == "__main__":
+    asyncio.run(main())
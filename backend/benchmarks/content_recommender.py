@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark the content-based recommender on synthetic catalogs: offline index
+build time and size, startup (memory-mapped load) time, and query latency for
+a three-movie request. Descriptions are drawn from a Zipf-distributed
+vocabulary, roughly like real prose.
+
+Run from the backend directory:
+    python benchmarks/content_recommender.py
+"""
+
+import itertools
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.services.content_recommender import ContentIndex, build_index
+
+CATALOG_SIZES = (10_000, 50_000)
+VOCABULARY_SIZE = 20_000
+DESCRIPTION_WORDS = 80
+OVERVIEW_WORDS = 40
+QUERIES = 200
+GENRES = ["Science Fiction", "Fantasy", "Mystery", "Thriller", "Crime", "Horror", "Romance", "History"]
+
+SYLLABLES = ["ka", "lo", "mi", "ren", "tor", "sa", "vel", "dun", "ar", "is", "gho", "nat", "pri", "zel", "um", "bra"]
+
+def make_vocabulary(rng: random.Random):
+    words = set()
+    while len(words) < VOCABULARY_SIZE:
+        words.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    words = sorted(words)
+    rng.shuffle(words)
+    return words, list(itertools.accumulate(1 / rank for rank in range(1, len(words) + 1)))
+
+def text(rng: random.Random, vocabulary, weights, length: int) -> str:
+    return " ".join(rng.choices(vocabulary, cum_weights=weights, k=length))
+
+def benchmark(size: int):
+    rng = random.Random(size)
+    vocabulary, weights = make_vocabulary(rng)
+    books = [
+        {
+            "title": f"Book {i}",
+            "author": f"Author {i % 5000}",
+            "description": text(rng, vocabulary, weights, DESCRIPTION_WORDS),
+            "genres": rng.sample(GENRES, 2),
+            "hardcover_id": i
+        }
+        for i in range(size)
+    ]
+
+    with tempfile.TemporaryDirectory() as directory:
+        index_dir = Path(directory) / "content_index"
+        start = time.perf_counter()
+        manifest = build_index(books, index_dir)
+        build = time.perf_counter() - start
+        disk = sum(f.stat().st_size for f in index_dir.iterdir()) / 1e6
+
+        start = time.perf_counter()
+        index = ContentIndex(index_dir)
+        load = time.perf_counter() - start
+
+        latencies = []
+        for _ in range(QUERIES):
+            movies = {f"Movie {i}": text(rng, vocabulary, weights, OVERVIEW_WORDS) for i in range(3)}
+            start = time.perf_counter()
+            index.recommend(movies, count=5)
+            latencies.append(time.perf_counter() - start)
+
+    latencies.sort()
+    print(
+        f"{size:>7,} {manifest['terms']:>7,} {manifest['postings']:>10,} {disk:>8.1f} {build:>8.1f} "
+        f"{load * 1000:>8.1f} {statistics.median(latencies) * 1000:>8.2f} {latencies[int(len(latencies) * 0.95)] * 1000:>8.2f}"
+    )
+
+if __name__ == "__main__":
+    print(f"{'books':>7} {'terms':>7} {'postings':>10} {'disk MB':>8} {'build s':>8} {'load ms':>8} {'p50 ms':>8} {'p95 ms':>8}")
+    for size in CATALOG_SIZES:
+        benchmark(size)
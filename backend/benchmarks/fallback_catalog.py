@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Compare fallback recommendation selection before and after the precompiled
+catalog: the legacy path built a BookRecommendation for every catalog book and
+scanned the movie titles once per keyword on each call; FallbackCatalog
+indexes books by theme and matches every keyword in one automaton pass.
+
+Runs on the bundled catalog and on synthetic catalogs of thousands of books.
+
+Run from the backend directory:
+    python benchmarks/fallback_catalog.py
+"""
+
+import json
+import os
+import random
+import sys
+import time
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.models.response_models import BookRecommendation
+from app.services.fallback_catalog import DEFAULT_CATALOG_PATH, FallbackCatalog
+
+SYNTHETIC_SIZES = ((1_000, 50), (5_000, 200))  # (books, theme rules)
+KEYWORDS_PER_RULE = 10
+REQUESTS = 500
+LEGACY_REQUESTS = 50  # The legacy path takes ~0.2 s a request on the largest catalog
+
+MOVIES = [
+    "The Dark Knight", "Star Wars", "Love Actually", "Murder on the Orient Express", "Superbad",
+    "Amelie", "Interstellar", "Gone Girl", "Arrival", "Zodiac", "Paddington 2", "Heat"
+]
+
+def legacy_select(data: Dict[str, Any], movies: List[str]) -> List[BookRecommendation]:
+    """_analyze_movie_themes and _get_theme_based_books before the catalog, driven by the same data"""
+    movie_text = " ".join(movies).lower()
+    themes = []
+    for rule in data["theme_rules"]:
+        if any(word in movie_text for word in rule["keywords"]):
+            themes.extend(rule["themes"])
+    if not themes:
+        themes = ["character development", "emotional depth", "human experience"]
+
+    book_database: Dict[str, List[BookRecommendation]] = {}
+    for record in data["books"]:
+        book = BookRecommendation(**{k: v for k, v in record.items() if k != "themes"})
+        for theme in record["themes"]:
+            book_database.setdefault(theme, []).append(book)
+    default_books = [BookRecommendation(**record) for record in data["default_books"]]
+
+    selected_books = []
+    for theme in themes:
+        for book in book_database.get(theme, [])[:2]:
+            if book not in selected_books:
+                selected_books.append(book)
+    while len(selected_books) < 3:
+        for default_book in default_books:
+            if default_book not in selected_books:
+                selected_books.append(default_book)
+                break
+    return selected_books[:3]
+
+def synthetic_catalog(books: int, rules: int) -> Dict[str, Any]:
+    rng = random.Random(books)
+    with open(DEFAULT_CATALOG_PATH, encoding="utf-8") as f:
+        bundled = json.load(f)
+    themes = [f"theme {i}" for i in range(rules * 3)]
+    words = {word.lower() for movie in MOVIES for word in movie.split()}
+    theme_rules = [
+        {
+            "keywords": [f"kw{i}x{j}" for j in range(KEYWORDS_PER_RULE - 1)] + [rng.choice(sorted(words))],
+            "themes": themes[i * 3:i * 3 + 3],
+            "narrative_style": f"Style {i}",
+            "emotional_tone": f"Tone {i}",
+            "genre_fusion": f"Genres {i}"
+        }
+        for i in range(rules)
+    ]
+    return {
+        "theme_rules": theme_rules,
+        "books": [
+            {
+                "title": f"Book {i}",
+                "author": f"Author {i % 700}",
+                "reason": "A synthetic reason of roughly the usual length, long enough to cost what a real one does.",
+                "taste_match_score": round(rng.uniform(0.7, 0.95), 2),
+                "primary_appeal": "Synthetic appeal",
+                "themes": rng.sample(themes, 2)
+            }
+            for i in range(books)
+        ],
+        "default_books": bundled["default_books"]
+    }
+
+def benchmark(label: str, data: Dict[str, Any]):
+    rng = random.Random(0)
+    requests = [rng.sample(MOVIES, rng.randint(1, 4)) for _ in range(REQUESTS)]
+
+    start = time.perf_counter()
+    catalog = FallbackCatalog(data)
+    load = time.perf_counter() - start
+
+    start = time.perf_counter()
+    legacy_results = [legacy_select(data, movies) for movies in requests[:LEGACY_REQUESTS]]
+    legacy = (time.perf_counter() - start) / LEGACY_REQUESTS
+
+    start = time.perf_counter()
+    for movies in requests:
+        catalog.books_for_themes(catalog.analyze_movies(movies)["themes"])
+    indexed = (time.perf_counter() - start) / REQUESTS
+
+    agree = sum(
+        [b.title for b in books] ==
+        [b.title for b in catalog.books_for_themes(catalog.analyze_movies(movies)["themes"])]
+        for movies, books in zip(requests, legacy_results)
+    )
+    print(
+        f"{label:<22} {len(data['books']):>6} {legacy * 1000:>10.3f} {indexed * 1000:>9.3f} "
+        f"{legacy / indexed:>7.0f}x {load * 1000:>8.1f} {agree:>4}/{LEGACY_REQUESTS}"
+    )
+
+if __name__ == "__main__":
+    with open(DEFAULT_CATALOG_PATH, encoding="utf-8") as f:
+        bundled = json.load(f)
+    print("ms per request (build: one-off catalog indexing, ms)")
+    print(f"{'catalog':<22} {'books':>6} {'legacy':>10} {'indexed':>9} {'speedup':>8} {'build':>8} {'same':>7}")
+    benchmark("bundled", bundled)
+    for books, rules in SYNTHETIC_SIZES:
+        benchmark(f"synthetic, {rules} rules", synthetic_catalog(books, rules))
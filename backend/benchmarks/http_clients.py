@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Compare per-lookup latency of a fresh httpx.AsyncClient per call (the old pattern)
+with the shared pooled client from app.services.http_clients, against a local
+stand-in GraphQL server. The stand-in is plain HTTP, so only the TCP handshake is
+saved here; against the real HTTPS upstreams the TLS handshake is saved as well.
+
+Run from the backend directory:
+    python benchmarks/http_clients.py
+"""
+
+import asyncio
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+os.environ.setdefault("HARDCOVER_API_KEY", "benchmark")
+
+import httpx
+from app.services import http_clients
+
+LOOKUPS = 300
+RESPONSE = json.dumps({"data": {"search": {"results": {"hits": []}, "error": None}}}).encode()
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real upstreams
+    disable_nagle_algorithm = True  # headers and body go out in separate writes
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(RESPONSE)))
+        self.end_headers()
+        self.wfile.write(RESPONSE)
+
+    def log_message(self, *args):
+        pass
+
+async def per_call_client(url: str) -> float:
+    start = time.perf_counter()
+    async with httpx.AsyncClient(timeout=10) as client:
+        (await client.post(url, json={"query": "{ search }"})).raise_for_status()
+    return time.perf_counter() - start
+
+async def pooled_client(url: str) -> float:
+    start = time.perf_counter()
+    response = await http_clients.get_client("hardcover").post(url, json={"query": "{ search }"})
+    response.raise_for_status()
+    return time.perf_counter() - start
+
+def summarize(name: str, samples: list):
+    samples_ms = sorted(s * 1000 for s in samples)
+    p95 = samples_ms[int(len(samples_ms) * 0.95) - 1]
+    print(f"{name:<18}{statistics.mean(samples_ms):>10.3f}{statistics.median(samples_ms):>10.3f}{p95:>10.3f}")
+
+async def main():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/v1/graphql"
+
+    await http_clients.start_clients()
+    await pooled_client(url)  # pre-warm, as the app lifespan does
+
+    per_call = [await per_call_client(url) for _ in range(LOOKUPS)]
+    pooled = [await pooled_client(url) for _ in range(LOOKUPS)]
+
+    print(f"{LOOKUPS} sequential lookups against a local stand-in server")
+    print(f"{'client':<18}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}")
+    summarize("per-call client", per_call)
+    summarize("pooled client", pooled)
+    print(f"\nPooled client is {statistics.mean(per_call) / statistics.mean(pooled):.1f}x faster per lookup")
+
+    await http_clients.close_clients()
+    server.shutdown()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Benchmark the semantic recommendation cache index: brute-force (one dot
+product per entry) against vectorized (one matrix product and argpartition)
+top-k search, at index sizes up to 100k cached requests. Also reports the hit
+rate of exact-key and semantic lookups on a synthetic stream of overlapping
+movie sets.
+
+Run from the backend directory:
+    python benchmarks/semantic_cache.py
+"""
+
+import os
+import itertools
+import random
+import sys
+import time
+from typing import List, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.services.semantic_cache import SemanticIndex, featurize, partition_key
+
+INDEX_SIZES = (1_000, 10_000, 100_000)
+QUERIES = 200
+BRUTE_FORCE_QUERIES = 20
+TOP_K = 3
+MIN_SIMILARITY = 0.85
+HIT_RATE_REQUESTS = 20_000
+
+CATALOG_SIZE = 2_000
+MOODS = [None, "dark", "uplifting", "tense", "melancholy"]
+PACES = [None, "slow", "fast"]
+GENRES = ["science fiction", "crime", "fantasy", "horror", "romance", "history"]
+
+SYLLABLES = ["ka", "lo", "mi", "ren", "tor", "sa", "vel", "dun", "ar", "is", "gho", "nat", "pri", "zel", "um", "bra"]
+COMMON_WORDS = ["The", "Night", "Last", "Dark", "City", "Of", "Man", "Star"]
+
+def movie_title(index: int) -> str:
+    """Made-up titles of one to three words, some of them words many titles share"""
+    rng = random.Random(index)
+    words = [
+        rng.choice(COMMON_WORDS) if rng.random() < 0.3 else "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3))).capitalize()
+        for _ in range(rng.randint(1, 3))
+    ]
+    return " ".join(words)
+
+# Zipf popularity: the n-th most popular movie is picked with weight 1/n
+TITLES = [movie_title(i) for i in range(CATALOG_SIZE)]
+POPULARITY = list(itertools.accumulate(1 / rank for rank in range(1, CATALOG_SIZE + 1)))
+
+def random_request(rng: random.Random, base: Optional[List[str]] = None):
+    """
+    A set of two to five movies biased towards popular titles, or with a base
+    set, half the time that set with one movie swapped. Most requests leave
+    the preferences unset.
+    """
+    if base and rng.random() < 0.5:
+        movies = list(base)
+        movies[rng.randrange(len(movies))] = rng.choices(TITLES, cum_weights=POPULARITY)[0]
+    else:
+        movies = rng.choices(TITLES, cum_weights=POPULARITY, k=rng.randint(2, 5))
+    preferences = None
+    if rng.random() < 0.3:
+        preferences = {
+            "mood": rng.choice(MOODS),
+            "pace": rng.choice(PACES),
+            "genre_preferences": rng.sample(GENRES, rng.randint(0, 2)) or None,
+            "genre_blocklist": None
+        }
+    return list(dict.fromkeys(movies)), preferences
+
+def build_index(size: int, mode: str, rng: random.Random) -> SemanticIndex:
+    index = SemanticIndex(max_entries=size, mode=mode)
+    for i in range(size):
+        movies, preferences = random_request(rng)
+        index.add(f"key{i}", featurize(movies, preferences), partition_key(preferences))
+    return index
+
+def time_queries(index: SemanticIndex, vectors, mode: str) -> float:
+    start = time.perf_counter()
+    for vector in vectors:
+        index.nearest(vector, "", k=TOP_K, mode=mode)
+    return (time.perf_counter() - start) / len(vectors)
+
+def benchmark_search():
+    print(f"Top-{TOP_K} search, ms per query")
+    print(f"{'entries':>9} {'brute_force':>12} {'vectorized':>11} {'speedup':>8} {'agree':>6}")
+    for size in INDEX_SIZES:
+        rng = random.Random(size)
+        index = build_index(size, "vectorized", rng)
+        vectors = [featurize(*random_request(rng)) for _ in range(QUERIES)]
+
+        brute = time_queries(index, vectors[:BRUTE_FORCE_QUERIES], "brute_force")
+        vectorized = time_queries(index, vectors, "vectorized")
+        # Compared by similarity: duplicate requests tie, and either mode may pick either key
+        agree = sum(
+            abs(index.nearest(v, "", k=1, mode="brute_force")[0][0] - index.nearest(v, "", k=1, mode="vectorized")[0][0]) < 1e-5
+            for v in vectors[:BRUTE_FORCE_QUERIES]
+        )
+        print(
+            f"{size:>9,} {brute * 1000:>12.2f} {vectorized * 1000:>11.3f} "
+            f"{brute / vectorized:>7.0f}x {agree:>3}/{BRUTE_FORCE_QUERIES}"
+        )
+
+    rng = random.Random(0)
+    requests = [random_request(rng) for _ in range(QUERIES)]
+    start = time.perf_counter()
+    for movies, preferences in requests:
+        featurize(movies, preferences)
+    print(f"\nfeaturize: {(time.perf_counter() - start) / QUERIES * 1000:.3f} ms per request")
+
+def benchmark_hit_rate():
+    """Replay overlapping requests; every miss is 'generated' and cached under its exact key"""
+    rng = random.Random(7)
+    index = SemanticIndex(max_entries=HIT_RATE_REQUESTS)
+    exact_keys = set()
+    exact_hits = semantic_hits = 0
+    history: List[List[str]] = []
+
+    for i in range(HIT_RATE_REQUESTS):
+        base = rng.choice(history) if history else None
+        movies, preferences = random_request(rng, base)
+        history.append(movies)
+        exact_key = (tuple(sorted(movies)), str(preferences))
+        if exact_key in exact_keys:
+            exact_hits += 1
+            continue
+
+        vector = featurize(movies, preferences)
+        nearest = index.nearest(vector, partition_key(preferences), k=1)
+        if nearest and nearest[0][0] >= MIN_SIMILARITY:
+            semantic_hits += 1
+            continue
+
+        exact_keys.add(exact_key)
+        index.add(f"key{i}", vector, partition_key(preferences))
+
+    print(f"\nHit rate over {HIT_RATE_REQUESTS:,} overlapping requests (radius {MIN_SIMILARITY})")
+    print(f"  exact key only:  {exact_hits / HIT_RATE_REQUESTS:.1%}")
+    print(f"  plus semantic:   {(exact_hits + semantic_hits) / HIT_RATE_REQUESTS:.1%}")
+
+if __name__ == "__main__":
+    benchmark_search()
+    benchmark_hit_rate()
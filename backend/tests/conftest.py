@@ -0,0 +1,7 @@
+import os
+import tempfile
+
+# Settings are read at import time, so the app needs these before any test imports it
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("HARDCOVER_API_KEY", "test")
+os.environ.setdefault("CACHE_DIR", tempfile.mkdtemp())
@@ -0,0 +1,63 @@
+import asyncio
+import json
+import os
+import time
+from datetime import datetime
+
+from app.services.cache_backends import FileCacheBackend
+
+def _write_v2(backend: FileCacheBackend, key: str, value, cache_type: str = "books"):
+    now = time.time()
+    path = backend._entry_path(cache_type, backend._generate_cache_key(key), "2.0")
+    path.write_text(json.dumps({
+        "key": key,
+        "value": value,
+        "cache_type": cache_type,
+        "created_at": datetime.fromtimestamp(now).isoformat(),
+        "expired_at": datetime.fromtimestamp(now + 3600).isoformat(),
+        "version": "2.0"
+    }))
+    return path
+
+def test_failed_migration_keeps_the_v2_entry(tmp_path, monkeypatch):
+    v2_file = _write_v2(FileCacheBackend(tmp_path), "dune", {"title": "Dune"})
+    backend = FileCacheBackend(tmp_path)
+
+    async def disk_full(*args, **kwargs):
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(backend, "write", disk_full)
+    entry = asyncio.run(backend.read("dune", "books"))
+
+    assert entry.value == {"title": "Dune"}
+    assert v2_file.exists()
+    monkeypatch.undo()
+    assert asyncio.run(backend.read("dune", "books")).value == {"title": "Dune"}
+    assert not v2_file.exists()
+
+def test_shared_backend_sees_other_processes_writes(tmp_path):
+    ours = FileCacheBackend(tmp_path, shared=True)
+    ours.shared_check_seconds = 0
+    theirs = FileCacheBackend(tmp_path)
+    now = time.time()
+
+    asyncio.run(theirs.write("dune", {"title": "Dune"}, now, now + 3600, "books"))
+    assert asyncio.run(ours.read("dune", "books")).value == {"title": "Dune"}
+
+    asyncio.run(theirs.delete("dune", "books"))
+    assert asyncio.run(ours.read("dune", "books")) is None
+    assert asyncio.run(ours.metadata("dune", "books")) is None
+
+def test_misses_are_answered_from_memory(tmp_path, monkeypatch):
+    shared = FileCacheBackend(tmp_path, shared=True)
+    private = FileCacheBackend(tmp_path)
+    asyncio.run(shared.read("warm", "books"))  # the one directory check for this window
+
+    stats = []
+    stat = os.stat
+    monkeypatch.setattr(os, "stat", lambda *args, **kwargs: stats.append(args[0]) or stat(*args, **kwargs))
+    for backend in (shared, private):
+        for i in range(10):
+            assert asyncio.run(backend.read(f"missing-{i}", "books")) is None
+
+    assert stats == []
@@ -0,0 +1,48 @@
+import asyncio
+
+from app.models.response_models import BookRecommendation, RecommendationResponse
+from app.routers import recommendations
+from app.routers.recommendations import _record_movie_books, cache_service
+from app.services.cache_service import create_movie_books_cache_key
+
+def _run(title: str, score: float) -> list:
+    return [RecommendationResponse(
+        movie="Heat",
+        books=[BookRecommendation(title=title, author="Author", reason="reason", taste_match_score=score)]
+    )]
+
+def _titles(movie: str) -> list:
+    entry = asyncio.run(cache_service.get(create_movie_books_cache_key(movie, None), "recommendations"))
+    return [book['title'] for book in entry['books']]
+
+def test_concurrent_runs_for_the_same_movie_keep_both_books(monkeypatch):
+    get = cache_service.get
+
+    async def slow_get(*args, **kwargs):
+        # Let the other run read the same entry before this one writes
+        value = await get(*args, **kwargs)
+        await asyncio.sleep(0.01)
+        return value
+
+    monkeypatch.setattr(cache_service, "get", slow_get)
+
+    async def both():
+        await asyncio.gather(
+            _record_movie_books(["Heat"], None, _run("First", 0.9)),
+            _record_movie_books(["Heat"], None, _run("Second", 0.8))
+        )
+
+    asyncio.run(both())
+    monkeypatch.setattr(cache_service, "get", get)
+    assert sorted(_titles("Heat")) == ["First", "Second"]
+    assert not recommendations.movie_book_locks._locks
+
+def test_recording_does_not_mutate_the_cached_entry():
+    asyncio.run(_record_movie_books(["Alien"], None, _run("First", 0.9)))
+    cached = asyncio.run(cache_service.get(create_movie_books_cache_key("Alien", None), "recommendations"))
+    snapshot = [dict(book) for book in cached['books']]
+
+    asyncio.run(_record_movie_books(["Alien", "Up"], None, _run("Second", 0.8)))
+
+    assert cached['books'] == snapshot
+    assert _titles("Alien") == ["First", "Second"]
@@ -0,0 +1,30 @@
+import numpy as np
+
+from app.services.semantic_cache import SemanticIndex, featurize, partition_key
+
+def test_saved_index_loads_with_the_same_neighbours(tmp_path):
+    index = SemanticIndex(max_entries=10)
+    index.add("heat", featurize(["Heat", "Thief"]))
+    index.add("alien", featurize(["Alien", "Aliens"]))
+    index.add("horror", featurize(["Alien"]), partition_key({"genre_blocklist": ["Horror"]}))
+    index.remove("alien")
+    index.add("alien", featurize(["Alien", "Aliens"]))
+    index.save(tmp_path / "semantic_index.npz")
+
+    loaded = SemanticIndex.load(tmp_path / "semantic_index.npz", max_entries=10)
+
+    assert list(loaded._order.items()) == list(index._order.items())
+    query = featurize(["Heat"])
+    assert loaded.nearest(query, k=2) == index.nearest(query, k=2)
+    assert [key for _, key in loaded.nearest(query, "horror", k=1)] == ["horror"]
+
+def test_missing_or_unreadable_index_loads_empty(tmp_path):
+    assert not len(SemanticIndex.load(tmp_path / "missing.npz"))
+    (tmp_path / "broken.npz").write_bytes(b"not an index")
+    assert not len(SemanticIndex.load(tmp_path / "broken.npz"))
+    np.savez(tmp_path / "old.npz", keys=np.array(["a"]), partitions=np.array([""]), vectors=np.zeros((1, 8)))
+    assert not len(SemanticIndex.load(tmp_path / "old.npz"))
+
+def test_empty_index_round_trips(tmp_path):
+    SemanticIndex().save(tmp_path / "semantic_index.npz")
+    assert not len(SemanticIndex.load(tmp_path / "semantic_index.npz"))
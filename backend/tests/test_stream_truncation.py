@@ -0,0 +1,64 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+from fastapi import BackgroundTasks
+
+from app.models.request_models import RecommendationRequest
+from app.routers import recommendations
+from app.routers.recommendations import cache_service
+from app.services.cache_service import (
+    create_movie_books_cache_key,
+    create_movie_recommendation_cache_key,
+    create_recommendation_cache_key
+)
+
+def _truncated_completion(cut_after: str):
+    """A GPT client whose stream breaks off once the text up to cut_after is sent"""
+    document = json.dumps({
+        "taste_profile": {"themes": ["heists"]},
+        "unified_recommendations": [
+            {"title": "Book One", "author": "Author", "reason": "reason"},
+            {"title": "Book Two", "author": "Author", "reason": "reason"}
+        ]
+    })
+    sent = document[:document.index(cut_after) + len(cut_after)]
+
+    async def create(**kwargs):
+        async def chunks():
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=sent))])
+            raise ConnectionError("stream reset")
+        return chunks()
+
+    return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+def test_truncated_stream_is_served_but_not_cached(monkeypatch):
+    monkeypatch.setattr(recommendations.gpt_service, "client", _truncated_completion('"reason"}'))
+    monkeypatch.setattr(recommendations.settings, "enable_hardcover_integration", False)
+    request = RecommendationRequest(movies=["Heist Movie"])
+
+    async def run():
+        events, pipeline = recommendations._start_recommendation_pipeline(request)
+        while await events.get() is not None:
+            pass
+        return await pipeline
+
+    result = asyncio.run(run())
+
+    assert [book.title for book in result[0].books] == ["Book One"]
+    assert result[0]._fallback
+    assert asyncio.run(cache_service.get(create_movie_recommendation_cache_key("Heist Movie", None), "recommendations")) is None
+    assert asyncio.run(cache_service.get(create_movie_books_cache_key("Heist Movie", None), "recommendations")) is None
+
+def test_truncated_stream_response_is_not_cached(monkeypatch):
+    monkeypatch.setattr(recommendations.gpt_service, "client", _truncated_completion('"reason"}'))
+    monkeypatch.setattr(recommendations.settings, "enable_hardcover_integration", False)
+    monkeypatch.setattr(recommendations.settings, "overlap_book_enrichment", True)
+    request = RecommendationRequest(movies=["Heist Movie", "Other Movie"])
+
+    response = asyncio.run(recommendations.get_recommendations(request, BackgroundTasks(), True, "unified"))
+
+    assert [book.title for book in response.recommendations[0].books] == ["Book One"]
+    cache_key = create_recommendation_cache_key(request.movies, None, "unified")
+    assert asyncio.run(cache_service.get(cache_key, "recommendations")) is None
+    assert asyncio.run(cache_service.get(create_movie_books_cache_key("Other Movie", None), "recommendations")) is None